@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Persistent conversation index for the conversation-historian agent.
+Keeps one SQLite index per Claude Code project directory and refreshes only
+the transcripts whose mtime/size fingerprint changed, so listing is a query.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# line_index.py and content_store.py ship with the JSONL converter, synced next to agents/ by install.sh
+sys.path.append(os.path.join(SCRIPT_DIR, "..", "..", "scripts", "conversation-jsonl-to-csv"))
+try:
+    import line_index
+except ImportError:
+    line_index = None
+try:
+    import content_store
+except ImportError:
+    content_store = None
+
+INDEX_FILE = ".conversation-index.sqlite"
+PREVIEW_SCAN_LINES = 20
+PREVIEW_SKIP_PREFIXES = ("Caveat:", "<", "[", "{")
+TAG_ONLY_LINE = re.compile(r"^\s*<.*>.*</.*>$")
+NO_PREVIEW = "No content preview available"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    started TEXT,
+    ended TEXT,
+    message_count INTEGER NOT NULL,
+    preview TEXT
+);
+CREATE INDEX IF NOT EXISTS conversations_mtime ON conversations (mtime_ns);
+"""
+
+def project_dir_for(cwd):
+    """~/.claude/projects/<cwd with slashes replaced by dashes>"""
+    return os.path.join(os.path.expanduser("~/.claude/projects"), cwd.replace("/", "-"))
+
+def open_index(project_dir):
+    conn = sqlite3.connect(os.path.join(project_dir, INDEX_FILE))
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(conversations)")]
+    if columns and "ended" not in columns:
+        # Index from before last-activity times: it is only a cache, so rebuild it
+        conn.execute("DROP TABLE conversations")
+    conn.executescript(SCHEMA)
+    return conn
+
+def user_texts(msg):
+    """Text of a user message: string content, or the text items of array content"""
+    message = msg.get("message")
+    if not isinstance(message, dict) or message.get("role") != "user":
+        return []
+    content = message.get("content")
+    if isinstance(content, str):
+        return [content]
+    if isinstance(content, list):
+        return [item["text"] for item in content
+                if isinstance(item, dict) and item.get("type") == "text" and isinstance(item.get("text"), str)]
+    return []
+
+def preview_from_lines(lines):
+    """First meaningful user line, skipping caveats, command tags and JSON-looking text"""
+    for raw in lines:
+        try:
+            msg = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(msg, dict):
+            continue
+        for text in user_texts(msg):
+            for line in text.split("\n"):
+                if (not line.strip() or line.startswith(PREVIEW_SKIP_PREFIXES) or
+                        TAG_ONLY_LINE.match(line)):
+                    continue
+                if line.endswith("\\"):
+                    line = line[:-1]
+                return line.strip() or NO_PREVIEW
+    return NO_PREVIEW
+
+def count_newlines(f, chunk_size=1024 * 1024):
+    count = 0
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return count
+        count += chunk.count(b"\n")
+
+def iso_timestamp(ms):
+    if ms is None:
+        return None
+    return datetime.datetime.fromtimestamp(ms / 1000, datetime.timezone.utc).isoformat()
+
+def scan_conversation(path):
+    """(started, ended, message_count, preview) of a transcript
+
+    With line_index.py the message count and first/latest timestamps come
+    from the transcript's seek index, whose sidecar only scans bytes appended
+    since the last call, and the preview lines are sliced from a memory map.
+    Without it the whole file's newlines are counted and ended is unknown.
+    """
+    if line_index is not None:
+        try:
+            with line_index.open_index(path) as index:
+                head = [bytes(line) for line in index.lines(0, PREVIEW_SCAN_LINES)]
+                if content_store is not None:
+                    # Long pasted prompts may have been moved to the store by jsonl-to-csv.py archive
+                    head = list(content_store.rehydrate_lines(head, path))
+                return (iso_timestamp(index.first_timestamp), iso_timestamp(index.last_timestamp),
+                        len(index), preview_from_lines(head))
+        except (OSError, ValueError):
+            pass
+
+    with open(path, "rb") as f:
+        head = []
+        for line in f:
+            head.append(line)
+            if len(head) >= PREVIEW_SCAN_LINES:
+                break
+        f.seek(0)
+        message_count = count_newlines(f)
+
+    started = None
+    if head:
+        try:
+            first = json.loads(head[0])
+            started = first.get("timestamp") if isinstance(first, dict) else None
+        except ValueError:
+            pass
+    return started, None, message_count, preview_from_lines(head)
+
+def refresh(conn, project_dir):
+    """Bring the index up to date, scanning only new or changed transcripts
+
+    Transcripts are append-only while a session runs, so a file that only
+    grew just has its new bytes counted; anything else is rescanned.
+    """
+    known = {row[0]: row[1:] for row in conn.execute(
+        "SELECT id, mtime_ns, size, message_count FROM conversations")}
+    seen = set()
+    updated = 0
+
+    with conn, os.scandir(project_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".jsonl") or not entry.is_file():
+                continue
+            conversation_id = entry.name[:-len(".jsonl")]
+            seen.add(conversation_id)
+            st = entry.stat()
+            old = known.get(conversation_id)
+            if old and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                continue
+
+            updated += 1
+            if line_index is None and old and st.st_size > old[1] and old[2] >= PREVIEW_SCAN_LINES:
+                # Appended to: the head (start time, preview) is unchanged
+                with open(entry.path, "rb") as f:
+                    f.seek(old[1])
+                    message_count = old[2] + count_newlines(f)
+                conn.execute("UPDATE conversations SET mtime_ns = ?, size = ?, message_count = ? WHERE id = ?",
+                             (st.st_mtime_ns, st.st_size, message_count, conversation_id))
+                continue
+
+            started, ended, message_count, preview = scan_conversation(entry.path)
+            conn.execute("INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (conversation_id, st.st_mtime_ns, st.st_size, started, ended, message_count, preview))
+
+        removed = [(cid,) for cid in known if cid not in seen]
+        conn.executemany("DELETE FROM conversations WHERE id = ?", removed)
+    return updated + len(removed)
+
+def query(conn, limit, since_ns=None):
+    """Most recently modified conversations first"""
+    sql = "SELECT id, started, ended, message_count, preview FROM conversations"
+    params = []
+    if since_ns is not None:
+        sql += " WHERE mtime_ns >= ?"
+        params.append(since_ns)
+    sql += " ORDER BY mtime_ns DESC LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+def readable_date(timestamp):
+    """ISO timestamp → local 'YYYY-MM-DD HH:MM', or the raw value if unparseable"""
+    if not timestamp:
+        return "Unknown time"
+    try:
+        parsed = datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return timestamp
+    return parsed.astimezone().strftime("%Y-%m-%d %H:%M")
+
+def parse_since(value):
+    """YYYY-MM-DD[THH:MM[:SS]] (local time) → epoch nanoseconds"""
+    try:
+        return int(datetime.datetime.fromisoformat(value).timestamp() * 1e9)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD[THH:MM]")
+
+def list_main(args):
+    project_dir = args.project_dir or project_dir_for(args.cwd)
+    if not os.path.isdir(project_dir):
+        print("No Claude Code sessions found for this project")
+        return 1
+
+    print(f"Recent Claude Code Conversations for: {args.cwd}")
+    print("================================================")
+    print("")
+
+    conn = open_index(project_dir)
+    refresh(conn, project_dir)
+    rows = query(conn, args.limit, args.since)
+    if not rows:
+        print("No conversations found")
+        return 1
+
+    for count, (conversation_id, started, ended, message_count, preview) in enumerate(rows, 1):
+        print(f"{count}. Conversation: {conversation_id}")
+        print(f"   Started: {readable_date(started)}")
+        if ended:
+            print(f"   Last active: {readable_date(ended)}")
+        print(f"   Messages: {message_count}")
+        print(f"   Preview: {preview}")
+        print("")
+
+    print("================================================")
+    print("To resume a conversation, run: claude --resume <conversation-id>")
+    return 0
+
+def refresh_main(args):
+    project_dir = args.project_dir or project_dir_for(args.cwd)
+    if not os.path.isdir(project_dir):
+        print(f"Error: {project_dir} not found")
+        return 1
+    changed = refresh(open_index(project_dir), project_dir)
+    print(f"Index refreshed: {changed} conversations updated")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and list Claude Code conversations for a project")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, func, help_text in (("list", list_main, "Refresh the index and list recent conversations"),
+                                  ("refresh", refresh_main, "Only refresh the index")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--cwd", default=os.getcwd(), help="Project working directory (default: current directory)")
+        sub.add_argument("--project-dir", help="Claude project directory (default: derived from --cwd)")
+        sub.set_defaults(func=func)
+        if name == "list":
+            sub.add_argument("--limit", type=int, default=10, help="Number of conversations (default: 10)")
+            sub.add_argument("--since", type=parse_since,
+                             help="Only conversations active since this local date/time (YYYY-MM-DD[THH:MM])")
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the doc-reviewer evaluator's own overhead
+(everything except the reviewer call itself)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from eval import (DOC_REVIEWER_DIR, FixtureStore, ReplayReviewer, SemanticPreservationEvaluator,
+                  parse_unified_diff, file_content)
+from markdown_check import DEFAULT_CONFIG, RULES, check as check_markdown, load_config as load_lint_config
+from review_parser import parse_review
+
+EXAMPLE_REVIEW = DOC_REVIEWER_DIR / "examples" / "doc-pr-evaluator-refactor.md"
+# markdownlint's documented examples with the errors markdown_check.py must report
+LINT_EXAMPLES = Path(__file__).resolve().parent / "markdownlint-examples.json"
+
+
+def legacy_setup(diff_content: str) -> tempfile.TemporaryDirectory:
+    """The previous per-case setup: git init, two configs, add, commit, add"""
+    tmpdir = tempfile.TemporaryDirectory()
+    repo_path = Path(tmpdir.name)
+    git = lambda *args: subprocess.run(["git", *args], cwd=repo_path, check=True, capture_output=True)
+    git("init")
+    git("config", "user.email", "test@test.com")
+    git("config", "user.name", "Test User")
+    files = parse_unified_diff(diff_content)
+    for file in files:
+        if file['old_path']:
+            path = repo_path / file['old_path']
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(file_content(file['old_lines'], file['old_newline_at_eof']))
+    git("add", ".")
+    git("commit", "-m", "Initial commit")
+    for file in files:
+        if file['new_path']:
+            (repo_path / file['new_path']).write_bytes(file_content(file['new_lines'], file['new_newline_at_eof']))
+    git("add", ".")
+    return tmpdir
+
+
+def time_setup(setup, diffs, rounds):
+    """Mean milliseconds per case for setup + cleanup"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for diff in diffs:
+            setup(diff).cleanup()
+    return (time.perf_counter() - start) * 1000 / (rounds * len(diffs))
+
+
+def bench_setup(args):
+    """Per-case temp repo setup time: legacy git init path vs template fast path"""
+    with open(args.test_cases) as f:
+        diffs = [case['git_diff'] for case in json.load(f)]
+    evaluator = SemanticPreservationEvaluator(args.test_cases)
+
+    # Build the template outside the timed region, as a real run amortizes it
+    evaluator.create_temp_git_repo(diffs[0]).cleanup()
+    legacy_ms = time_setup(legacy_setup, diffs, args.rounds)
+    fast_ms = time_setup(evaluator.create_temp_git_repo, diffs, args.rounds)
+    evaluator.cleanup_template()
+
+    print(f"Cases: {len(diffs)} x {args.rounds} rounds")
+    print(f"Legacy (git init/config/add/commit/add): {legacy_ms:.1f} ms/case")
+    print(f"Template + direct objects + update-index: {fast_ms:.1f} ms/case")
+    print(f"Speedup: {legacy_ms / fast_ms:.1f}x")
+
+
+def bench_throughput(args):
+    """End-to-end evaluator cases/sec with the reviewer replayed from fixtures
+
+    The test cases are repeated up to --cases, each copy replaying the
+    recorded fixture of its original (or the example review if none exists).
+    """
+    with open(args.test_cases) as f:
+        base_cases = json.load(f)
+    recorded = FixtureStore(Path(args.fixtures))
+    example = EXAMPLE_REVIEW.read_text()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FixtureStore(Path(tmp) / "fixtures")
+        cases = []
+        for i in range(args.cases):
+            base = base_cases[i % len(base_cases)]
+            case = dict(base, test_id=f"{base['test_id']}-{i}")
+            store.save(case['test_id'], recorded.load(base['test_id']) or example)
+            cases.append(case)
+        cases_file = Path(tmp) / "test-cases.json"
+        cases_file.write_text(json.dumps(cases))
+
+        print(f"Cases: {args.cases}, replay latency {args.latency}s +/- {args.jitter}s")
+        print(f"{'workers':>7} {'wall (s)':>9} {'cases/s':>9}")
+        for workers in args.workers:
+            evaluator = SemanticPreservationEvaluator(str(cases_file), workers=workers,
+                                                      reviewer=ReplayReviewer(store, args.latency, args.jitter, seed=0))
+            evaluator.results_dir = Path(tmp) / "results"
+            evaluator.results_dir.mkdir(exist_ok=True)
+            # The evaluator's per-case progress and debug output would dominate the terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                metrics = evaluator.run_evaluation()
+            print(f"{workers:>7} {metrics['wall_time_seconds']:>9.2f} {metrics['throughput_cases_per_sec']:>9.1f}")
+
+
+def legacy_extract(doc_reviewer_output):
+    """The previous line scan: upper() per check, only Finding # header strings kept"""
+    findings = {"critical": [], "warnings": [], "suggestions": []}
+    current_section = None
+    for line in doc_reviewer_output.split('\n'):
+        if 'CRITICAL ISSUES' in line.upper() or ('CRITICAL' in line.upper() and 'MUST FIX' in line.upper()):
+            current_section = 'critical'
+        elif 'WARNING' in line.upper() and ('SHOULD FIX' in line.upper() or 'MEANING CHANGED' in line.upper()):
+            current_section = 'warnings'
+        elif 'SUGGESTION' in line.upper() and 'CONSIDER' in line.upper():
+            current_section = 'suggestions'
+        elif current_section and line.strip().startswith('Finding #'):
+            findings[current_section].append(line.strip())
+    return findings
+
+
+def synthetic_review(findings_per_severity):
+    """A template-shaped review with the given number of findings in each section"""
+    example = EXAMPLE_REVIEW.read_text()
+    head = example[:example.index("### CRITICAL ISSUES")]
+    tail = example[example.index("## 🔍 SEMANTIC INTEGRITY ANALYSIS"):]
+    parts = [head]
+    for header, prefix, body in (
+            ("### CRITICAL ISSUES (Content Lost/Broken - MUST FIX)", "C",
+             "Issue: Removed the setup section\nImpact: Users cannot install\n\nBEFORE:\n```markdown\n"
+             "## Setup\nRun `make install` first.\n```\n\nAFTER:\n```markdown\n```\n\n"
+             "RESTORE WITH:\n```markdown\n## Setup\nRun `make install` first.\n```\n"),
+            ("### ⚠️ WARNINGS (Meaning Changed - SHOULD FIX)", "W",
+             "Issue: Softened a requirement\nImpact: Readers may skip it\n\nSEMANTIC COMPARISON:\n"
+             "Original meaning: \"must\"\nCurrent meaning: \"should\"\nDifference: optional now\n"),
+            ("### 💡 SUGGESTIONS (Clarity Improvements - CONSIDER)", "S",
+             "Current: terse\nEnhancement: add an example\nRationale: easier to follow\n")):
+        parts.append(f"{header}\n\n````text\n")
+        for n in range(1, findings_per_severity + 1):
+            parts.append(f"Finding #{prefix}{n}: Synthetic finding {n}\nFile: docs/page_{n}.md\n"
+                         f"Lines: {n}-{n + 5}\n{body}---\n\n")
+        parts.append("````\n\n")
+    parts.append(tail)
+    return "".join(parts)
+
+
+def best_times(funcs, text, rounds):
+    """Fastest of rounds calls of each func(text) in seconds, rounds interleaved so
+    the funcs see the same background load"""
+    best = [float("inf")] * len(funcs)
+    for _ in range(rounds):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func(text)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+def parse_with_fields(text):
+    """parse_review plus reading every finding's fields, as eval.py does"""
+    review = parse_review(text)
+    for finding in review.findings:
+        finding.to_dict()
+    return review
+
+
+def bench_parse(args):
+    """Parse MB/s vs the legacy scan; correctness is covered by test_review_parser.py"""
+    reviews = [(EXAMPLE_REVIEW.name, EXAMPLE_REVIEW.read_text())]
+    for count in args.findings:
+        reviews.append((f"{3 * count} findings", synthetic_review(count)))
+    print(f"Best of {args.rounds} rounds")
+    print(f"{'review':>36} {'size (MB)':>10} {'legacy MB/s':>12} {'parser MB/s':>12} {'+fields MB/s':>13}")
+    for label, text in reviews:
+        size_mb = len(text.encode()) / 1024 / 1024
+        legacy_s, parser_s, fields_s = best_times((legacy_extract, parse_review, parse_with_fields), text, args.rounds)
+        print(f"{label:>36} {size_mb:>10.2f} {size_mb / legacy_s:>12.1f} {size_mb / parser_s:>12.1f} "
+              f"{size_mb / fields_s:>13.1f}")
+    return 0
+
+
+CLI2_ERROR = re.compile(r"^(.+?):(\d+)(?::\d+)? ([^/\s]+)")
+
+
+def run_markdownlint_cli2(paths):
+    """(line, rule) pairs per file from markdownlint-cli2, and the wall time of one run"""
+    start = time.perf_counter()
+    proc = subprocess.run(["markdownlint-cli2", *map(str, paths), "--config", str(DEFAULT_CONFIG)],
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    found = {str(path): set() for path in paths}
+    for line in (proc.stdout + proc.stderr).splitlines():
+        match = CLI2_ERROR.match(line)
+        if match and match.group(1) in found:
+            found[match.group(1)].add((int(match.group(2)), match.group(3)))
+    return found, elapsed
+
+
+def check_examples():
+    """Mismatches between markdown_check.py and the expected errors in LINT_EXAMPLES"""
+    mismatches = []
+    for case in json.loads(LINT_EXAMPLES.read_text()):
+        got = [[v.line, v.rule] for v in check_markdown(case["markdown"], case["config"])]
+        if got != case["errors"]:
+            mismatches.append((case["source"], case["errors"], got))
+    return mismatches
+
+
+def bench_lint(args):
+    """Parity with the documented markdownlint examples, then in-process latency vs a
+    Python CLI and, when installed, a markdownlint-cli2 run"""
+    mismatches = check_examples()
+    for source, expected, got in mismatches:
+        print(f"  MISMATCH {source}: expected {expected}, got {got}")
+    print(f"Parity ({LINT_EXAMPLES.name}): {'ok' if not mismatches else f'{len(mismatches)} differing examples'}")
+
+    paths = [EXAMPLE_REVIEW] + sorted(Path(args.fixtures).glob("*.md"))
+    config = load_lint_config(DEFAULT_CONFIG)
+    texts = [path.read_text() for path in paths]
+    checker = str(DEFAULT_CONFIG.parent / "markdown_check.py")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        results = [check_markdown(text, config) for text in texts]
+    in_process_ms = (time.perf_counter() - start) * 1000 / args.rounds / len(paths)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, checker, *map(str, paths)], capture_output=True)
+    cli_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Files: {len(paths)} ({sum(len(t) for t in texts) / 1024:.0f} KB), "
+          f"{sum(len(r) for r in results)} errors")
+    print(f"In-process check:       {in_process_ms:8.2f} ms/file")
+    print(f"markdown_check.py run:  {cli_ms:8.1f} ms (all files, incl. interpreter start)")
+    if not shutil.which("markdownlint-cli2"):
+        print("markdownlint-cli2 not found on PATH; no live comparison")
+        return 1 if mismatches else 0
+
+    reference, cli2_s = run_markdownlint_cli2(paths)
+    print(f"markdownlint-cli2 run:  {cli2_s * 1000:8.1f} ms (all files)")
+    differing = 0
+    for path, violations in zip(paths, results):
+        ours = {(v.line, v.rule) for v in violations}
+        # Rules markdown_check.py leaves to markdownlint-cli2 are not compared
+        theirs = {(line, rule) for line, rule in reference[str(path)] if rule in RULES}
+        for line, rule in sorted(theirs - ours):
+            print(f"  only markdownlint-cli2: {path.name}:{line} {rule}")
+        for line, rule in sorted(ours - theirs):
+            print(f"  only markdown_check:    {path.name}:{line} {rule}")
+        differing += len(ours ^ theirs)
+    print(f"Live parity: {'identical' if not differing else f'{differing} differing errors'}")
+    return 1 if mismatches or differing else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark doc-reviewer evaluator overhead")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    setup = subparsers.add_parser("setup", help="Per-case temp git repo setup time")
+    setup.add_argument("--test-cases", default="test-cases.json", help="Test cases file (default: test-cases.json)")
+    setup.add_argument("--rounds", type=int, default=10, help="Times to set up every case (default: 10)")
+    setup.set_defaults(func=bench_setup)
+
+    throughput = subparsers.add_parser("throughput", help="Evaluator cases/sec against a replayed reviewer")
+    throughput.add_argument("--test-cases", default="test-cases.json", help="Test cases file (default: test-cases.json)")
+    throughput.add_argument("--fixtures", default="fixtures", help="Recorded fixtures directory (default: fixtures)")
+    throughput.add_argument("--cases", type=int, default=200, help="Number of cases to run (default: 200)")
+    throughput.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16],
+                            help="Worker counts to compare (default: 1 4 16)")
+    throughput.add_argument("--latency", type=float, default=0.0, help="Replayed review latency in seconds (default: 0)")
+    throughput.add_argument("--jitter", type=float, default=0.0, help="Replay latency jitter in seconds (default: 0)")
+    throughput.set_defaults(func=bench_throughput)
+
+    parse = subparsers.add_parser("parse", help="MB/s of the review parser on large synthetic reviews")
+    parse.add_argument("--findings", type=int, nargs="+", default=[100, 1000, 10000],
+                       help="Findings per severity in each synthetic review (default: 100 1000 10000)")
+    parse.add_argument("--rounds", type=int, default=20, help="Timed runs per review, best kept (default: 20)")
+    parse.set_defaults(func=bench_parse)
+
+    lint = subparsers.add_parser("lint", help="markdown_check.py parity with the documented examples, and latency")
+    lint.add_argument("--fixtures", default="fixtures", help="Recorded fixtures to check as well (default: fixtures)")
+    lint.add_argument("--rounds", type=int, default=100, help="In-process checks of every file (default: 100)")
+    lint.set_defaults(func=bench_lint)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,167 +4,532 @@ Semantic Preservation Evaluator for doc-reviewer subagent
 Tests whether doc-reviewer correctly identifies semantic losses in documentation changes
 """
 
+import argparse
+import cProfile
+import hashlib
 import json
+import logging
+import pstats
+import random
+import signal
 import subprocess
 import sys
 import os
+import shutil
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 import tempfile
 import re
 
+from review_parser import Review, parse_review
+from run_history import HISTORY_FILE, RunHistory, report_main
+from tracing import Tracer
+from trial_stats import bootstrap_intervals, is_settled, wilson_interval
+
+# markdown_check.py lives next to markdownlint.jsonc so it installs with the agent
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from markdown_check import check as check_markdown, load_config as load_lint_config
+
+logger = logging.getLogger("doc-reviewer-eval")
+
+EVAL_DIR = Path(__file__).resolve().parent
+DOC_REVIEWER_DIR = EVAL_DIR.parent
+INSTALLED_DOC_REVIEWER_DIR = Path.home() / ".claude" / "agents" / "doc-reviewer"
+
+# Everything that shapes reviewer output besides the diff: the agent prompt,
+# its template and lint config, both in this repo and as installed for the CLI
+AGENT_DEFINITION_FILES = [
+    DOC_REVIEWER_DIR.parent / "doc-reviewer.md",
+    DOC_REVIEWER_DIR / "output-template.md",
+    DOC_REVIEWER_DIR / "markdownlint.jsonc",
+    DOC_REVIEWER_DIR / "rules" / "action-items-structure.js",
+    DOC_REVIEWER_DIR / "markdown_check.py",
+    INSTALLED_DOC_REVIEWER_DIR.parent / "doc-reviewer.md",
+    INSTALLED_DOC_REVIEWER_DIR / "output-template.md",
+    INSTALLED_DOC_REVIEWER_DIR / "markdownlint.jsonc",
+    INSTALLED_DOC_REVIEWER_DIR / "markdown_check.py",
+]
+
+REVIEWER_COMMAND = [
+    "claude",
+    "--print",
+    "--dangerously-skip-permissions",
+    "Use doc-reviewer subagent to review the staged documentation changes. Return the output file only. If not output file is given, it failed"
+]
+
+
+DIFF_GIT_HEADER = re.compile(r'^diff --git a/(.*) b/(.*)$')
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+GIT_IDENTITY = "Test User <test@test.com>"
+
+
+def parse_unified_diff(diff_content: str) -> List[Dict]:
+    """Parse a (possibly multi-file) unified git diff into per-file contents
+
+    Each file dict holds old_path/new_path (None for /dev/null), the hunk
+    headers and the old/new side lines of all hunks. Hunk line counts are
+    not trusted (hand-written test diffs often get them wrong): a hunk runs
+    until the next hunk or file header, and an unprefixed line is context.
+    """
+    files = []
+    current = None
+    in_hunk = False
+    last_side = None
+
+    def start_file(old_path, new_path):
+        file = {'old_path': old_path, 'new_path': new_path, 'hunks': [],
+                'old_lines': [], 'new_lines': [],
+                'old_newline_at_eof': True, 'new_newline_at_eof': True}
+        files.append(file)
+        return file
+
+    lines = diff_content.split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    for line in lines:
+        header = DIFF_GIT_HEADER.match(line)
+        if header:
+            current = start_file(header.group(1), header.group(2))
+            in_hunk = False
+            continue
+        if not in_hunk:
+            if line.startswith('--- '):
+                path = line[4:].split('\t')[0]
+                if current is None:
+                    current = start_file(None, None)
+                current['old_path'] = None if path == '/dev/null' else path[2:] if path.startswith('a/') else path
+            elif line.startswith('+++ ') and current is not None:
+                path = line[4:].split('\t')[0]
+                current['new_path'] = None if path == '/dev/null' else path[2:] if path.startswith('b/') else path
+            elif line.startswith(('new file mode', 'deleted file mode')) and current is not None:
+                key = 'old_path' if line.startswith('new') else 'new_path'
+                current[key] = None
+        hunk = HUNK_HEADER.match(line)
+        if hunk and current is not None:
+            current['hunks'].append(tuple(int(g) if g is not None else 1 for g in hunk.groups()))
+            in_hunk = True
+            continue
+        if not in_hunk:
+            continue
+
+        if line.startswith('\\'):
+            # "\ No newline at end of file" applies to the side(s) of the previous line
+            if last_side in ('-', ' '):
+                current['old_newline_at_eof'] = False
+            if last_side in ('+', ' '):
+                current['new_newline_at_eof'] = False
+            continue
+        prefix, text = (line[0], line[1:]) if line[:1] in ('-', '+', ' ') else (' ', line)
+        if prefix != '+':
+            current['old_lines'].append(text)
+        if prefix != '-':
+            current['new_lines'].append(text)
+        last_side = prefix
+
+    for file in files:
+        for side in ('old', 'new'):
+            if file[f'{side}_path'] is None:
+                file[f'{side}_lines'] = []
+    return files
+
+
+def file_content(lines: List[str], newline_at_eof: bool) -> bytes:
+    if not lines:
+        return b''
+    return ('\n'.join(lines) + ('\n' if newline_at_eof else '')).encode()
+
+
+def write_git_object(git_dir: Path, obj_type: str, data: bytes) -> str:
+    """Write a loose object the way `git hash-object -w` would, returning its id"""
+    raw = f"{obj_type} {len(data)}\0".encode() + data
+    sha = hashlib.sha1(raw).hexdigest()
+    path = git_dir / "objects" / sha[:2] / sha[2:]
+    if not path.exists():
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(zlib.compress(raw, 1))
+    return sha
+
+
+def write_git_tree(git_dir: Path, blobs: Dict[str, str]) -> str:
+    """Write (nested) tree objects for {path: blob_id}, returning the root tree id"""
+    entries = {}
+    subdirs: Dict[str, Dict[str, str]] = {}
+    for path, sha in blobs.items():
+        head, _, rest = path.partition('/')
+        if rest:
+            subdirs.setdefault(head, {})[rest] = sha
+        else:
+            entries[head] = (b'100644', sha)
+    for name, children in subdirs.items():
+        entries[name] = (b'40000', write_git_tree(git_dir, children))
+    # Git orders tree entries by name, comparing directories as if they ended in '/'
+    ordered = sorted(entries.items(), key=lambda e: e[0] + '/' if e[1][0] == b'40000' else e[0])
+    data = b''.join(mode + b' ' + name.encode() + b'\0' + bytes.fromhex(sha) for name, (mode, sha) in ordered)
+    return write_git_object(git_dir, 'tree', data)
+
+
+class ResultCache:
+    """Content-addressed store of raw reviewer outputs under results/cache/"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 500 * 1024 * 1024, max_age_days: float = 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(git_diff: str, command: List[str], definition_files: List[Path], trial: int = 0) -> str:
+        """Hash of the diff, the CLI command line and the agent definition files
+
+        Repeated trials of a case get one entry each (trial 0 shares the
+        single-run key), so rerunning with --trials reuses earlier samples.
+        """
+        h = hashlib.sha256(b"doc-reviewer-cache-v1\0")
+        h.update("\0".join(command).encode() + b"\0")
+        for path in definition_files:
+            h.update(str(path).encode() + b"\0")
+            h.update(path.read_bytes() if path.exists() else b"<missing>")
+            h.update(b"\0")
+        h.update(git_diff.encode())
+        if trial:
+            h.update(f"\0trial {trial}".encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('created', 0) > self.max_age_seconds:
+            return None
+        # Touch on hit so size-based eviction drops least recently used entries first
+        os.utime(path)
+        return entry['output']
+
+    def put(self, key: str, output: str, test_id: str):
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({'test_id': test_id, 'created': time.time(), 'output': output}))
+        os.replace(tmp, path)
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            st = path.stat()
+            if now - st.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+class FixtureStore:
+    """Recorded reviewer outputs, one <test_id>.md file per test case"""
+
+    def __init__(self, fixtures_dir: Path):
+        self.fixtures_dir = Path(fixtures_dir)
+
+    def path(self, test_id: str) -> Path:
+        return self.fixtures_dir / (re.sub(r'[^\w.-]', '_', test_id) + ".md")
+
+    def load(self, test_id: str) -> Optional[str]:
+        try:
+            return self.path(test_id).read_text()
+        except OSError:
+            return None
+
+    def save(self, test_id: str, output: str):
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(test_id)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(output)
+        os.replace(tmp, path)
+
+
+class ReplayReviewer:
+    """Offline stand-in for the claude CLI: replays recorded outputs in-process
+
+    Each call sleeps latency ± jitter seconds (uniform, never negative) to
+    mimic the real reviewer. A test case without a fixture behaves like a
+    failed CLI call and yields None.
+    """
+
+    name = "replay"
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 seed: Optional[int] = None):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def __call__(self, test_case: Dict, repo_path: str) -> Optional[str]:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        output = self.store.load(test_case['test_id'])
+        if output is None:
+            logger.warning("No fixture for %s in %s", test_case['test_id'], self.store.fixtures_dir)
+        return output
+
+
+
 class SemanticPreservationEvaluator:
-    def __init__(self, test_cases_file: str = "test-cases.json"):
+    def __init__(self, test_cases_file: str = "test-cases.json", workers: int = 1,
+                 cache: Optional[ResultCache] = None, refresh_ids: Optional[set] = None,
+                 refresh_all: bool = False,
+                 reviewer: Optional[Callable[[Dict, str], Optional[str]]] = None,
+                 record_to: Optional[FixtureStore] = None, profile: bool = False,
+                 trials: int = 1, confidence: float = 0.95):
         self.test_cases_file = test_cases_file
+        self.workers = max(1, workers)
         self.results_dir = Path("results")
         self.results_dir.mkdir(exist_ok=True)
+        # Cached reviewer outputs are reused unless refreshed for a test_id or for all
+        self.cache = cache
+        self.refresh_ids = refresh_ids or set()
+        self.refresh_all = refresh_all
+        # Reviewer backend: called with (test_case, repo_path), returns the review
+        # or None. Defaults to the real CLI; outputs can be recorded as fixtures.
+        self.reviewer = reviewer or (lambda test_case, repo_path: self.run_doc_reviewer(repo_path))
+        self.reviewer_name = getattr(reviewer, 'name', 'cli') if reviewer else 'cli'
+        self.record_to = record_to
+        # Per-stage spans for the results JSON and --trace; --profile adds cProfile per thread
+        self.tracer = Tracer()
+        self.profile = profile
+        self._profiles: List[cProfile.Profile] = []
+        # Up to `trials` runs per case, stopping early once the outcome is settled
+        self.trials = max(1, trials)
+        self.confidence = confidence
+        # Parsed reviews by output hash: identical outputs (cache hits, replays,
+        # deterministic trials) are parsed once
+        self._reviews: Dict[bytes, Review] = {}
+        # Reviewer outputs are also pre-checked against the agent's markdownlint config;
+        # markdown_check.py covers a subset of markdownlint-cli2's rules, so results are advisory
+        self.lint_config = load_lint_config(DOC_REVIEWER_DIR / "markdownlint.jsonc")
+        self._markdown_checks: Dict[bytes, Dict] = {}
         # doc_reviewer_output_dir will be set dynamically based on repo_path
+        # Running CLI processes, so Ctrl-C can kill them from the main thread
+        self._active_processes = set()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._template: Optional[tempfile.TemporaryDirectory] = None
         
     def load_test_cases(self) -> List[Dict]:
         """Load test cases from JSON file"""
         with open(self.test_cases_file, 'r') as f:
             return json.load(f)
     
+    def _template_repo(self) -> Path:
+        """Empty, configured git repo that per-case repos are copied from (built once)"""
+        with self._lock:
+            if self._template is None:
+                template = tempfile.TemporaryDirectory(prefix="doc-reviewer-template-")
+                path = Path(template.name)
+                subprocess.run(["git", "init", "-q", "--template=", str(path)], check=True, capture_output=True)
+                with open(path / ".git" / "config", "a") as f:
+                    f.write("[user]\n\temail = test@test.com\n\tname = Test User\n")
+                self._template = template
+            return Path(self._template.name)
+
+    def cleanup_template(self):
+        with self._lock:
+            if self._template is not None:
+                self._template.cleanup()
+                self._template = None
+
     def create_temp_git_repo(self, diff_content: str) -> tempfile.TemporaryDirectory:
-        """Create a temporary git repository with the provided diff staged"""
+        """Create a temporary git repository with the provided diff staged
+
+        The repo is hardlink-copied from a prebuilt template instead of
+        running git init. Blobs, trees and the initial commit are written as
+        loose objects directly, and the modified files are staged with a
+        single `git update-index --index-info` call.
+        """
+        template = self._template_repo()
         tmpdir = tempfile.TemporaryDirectory()
         repo_path = Path(tmpdir.name)
-        
-        # Initialize git repo
-        subprocess.run(["git", "init"], cwd=repo_path, check=True, capture_output=True)
-        subprocess.run(["git", "config", "user.email", "test@test.com"], cwd=repo_path, check=True, capture_output=True)
-        subprocess.run(["git", "config", "user.name", "Test User"], cwd=repo_path, check=True, capture_output=True)
-        
-        # Parse the diff to create files
-        # This is a simplified version - in production, use a proper diff parser
-        lines = diff_content.split('\n')
-        current_file = None
-        original_content = []
-        modified_content = []
-        
-        for line in lines:
-            if line.startswith('diff --git'):
-                # Extract filename
-                match = re.search(r'a/(.*?) b/', line)
-                if match:
-                    current_file = match.group(1)
-            elif line.startswith('@@'):
-                continue
-            elif current_file and not line.startswith('---') and not line.startswith('+++') and not line.startswith('index'):
-                if line.startswith('-'):
-                    original_content.append(line[1:])
-                elif line.startswith('+'):
-                    modified_content.append(line[1:])
-                elif line.startswith(' '):
-                    # Context line - add to both
-                    original_content.append(line[1:])
-                    modified_content.append(line[1:])
-                elif not line.startswith('\\'):
-                    # Empty line
-                    original_content.append('')
-                    modified_content.append('')
-        
-        if current_file:
-            # Create the original file and commit
-            file_path = repo_path / current_file
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text('\n'.join(original_content))
-            subprocess.run(["git", "add", "."], cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=repo_path, check=True, capture_output=True)
-            
-            # Modify the file and stage changes
-            file_path.write_text('\n'.join(modified_content))
-            subprocess.run(["git", "add", "."], cwd=repo_path, check=True, capture_output=True)
-        
+        git_dir = repo_path / ".git"
+
+        def link_or_copy(src, dst):
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+        # Git replaces (never rewrites) config, HEAD and index, so hardlinks are safe
+        shutil.copytree(template / ".git", git_dir, copy_function=link_or_copy)
+
+        original = {}
+        modified = {}
+        for file in parse_unified_diff(diff_content):
+            if file['old_path']:
+                data = file_content(file['old_lines'], file['old_newline_at_eof'])
+                original[file['old_path']] = write_git_object(git_dir, 'blob', data)
+            if file['new_path']:
+                data = file_content(file['new_lines'], file['new_newline_at_eof'])
+                modified[file['new_path']] = write_git_object(git_dir, 'blob', data)
+                file_path = repo_path / file['new_path']
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_bytes(data)
+
+        if not original and not modified:
+            return tmpdir
+
+        # Initial commit with the original files
+        timestamp = f"{int(time.time())} +0000"
+        commit = (f"tree {write_git_tree(git_dir, original)}\n"
+                  f"author {GIT_IDENTITY} {timestamp}\n"
+                  f"committer {GIT_IDENTITY} {timestamp}\n\nInitial commit\n")
+        head_ref = (git_dir / "HEAD").read_text().strip().split("ref: ", 1)[1]
+        ref_path = git_dir / head_ref
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        ref_path.write_text(write_git_object(git_dir, 'commit', commit.encode()) + "\n")
+
+        # Stage the modified files (deleted files are simply absent from the index)
+        index_info = "".join(f"100644 {sha}\t{path}\n" for path, sha in modified.items())
+        subprocess.run(["git", "update-index", "--add", "--index-info"], cwd=repo_path,
+                       input=index_info, text=True, check=True, capture_output=True)
+
         return tmpdir
-    
+
+    def _run_cli(self, cmd: List[str], cwd: str, timeout: int) -> subprocess.CompletedProcess:
+        """Run a command like subprocess.run, but registered so cancel() can kill it"""
+        if self._cancelled.is_set():
+            raise RuntimeError("evaluation cancelled")
+        # New session: the CLI and anything it spawns form one killable process group
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, start_new_session=True)
+        with self._lock:
+            self._active_processes.add(proc)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(proc)
+            proc.communicate()
+            raise
+        finally:
+            with self._lock:
+                self._active_processes.discard(proc)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def cancel(self):
+        """Stop starting new CLI calls and kill the running ones"""
+        self._cancelled.set()
+        with self._lock:
+            processes = list(self._active_processes)
+        for proc in processes:
+            self._kill(proc)
+
     def run_doc_reviewer(self, repo_path: str) -> Optional[str]:
         """Run the doc-reviewer subagent and capture its output"""
         try:
             # Use real Claude Code CLI with doc-reviewer subagent
-            cmd = [
-                "claude",
-                "--print",
-                "--dangerously-skip-permissions",
-                "Use doc-reviewer subagent to review the staged documentation changes. Return the output file only. If not output file is given, it failed"
-            ]
-
-            result = subprocess.run(
-                cmd,
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                timeout=420
-            )
-            
-            # Debug: Print Claude's output
-            print(f"\nDEBUG - Claude stdout (first 500 chars):\n{result.stdout[:500]}")
-            print(f"\nDEBUG - Claude stderr (first 500 chars):\n{result.stderr[:500]}")
+            with self.tracer.span("claude_cli"):
+                result = self._run_cli(REVIEWER_COMMAND, repo_path, timeout=420)
+            logger.debug("Claude stdout (first 500 chars):\n%s", result.stdout[:500])
+            logger.debug("Claude stderr (first 500 chars):\n%s", result.stderr[:500])
             
             # Look for the output file in tmp/doc-reviewer/ inside the repo
-            doc_reviewer_output_dir = Path(repo_path) / "tmp/doc-reviewer"
-            output_files = list(doc_reviewer_output_dir.glob("doc-reviewer-*.md")) if doc_reviewer_output_dir.exists() else []
-            print(f"\nDEBUG - Looking in: {doc_reviewer_output_dir}")
-            print(f"DEBUG - Found {len(output_files)} files in {doc_reviewer_output_dir}")
-            
-            if output_files:
-                # Get the most recent file
-                latest_file = max(output_files, key=lambda f: f.stat().st_mtime)
-                print(f"DEBUG - Reading file: {latest_file}")
-                content = latest_file.read_text()
-                print(f"DEBUG - File content (first 500 chars):\n{content[:500]}")
-                return content
+            with self.tracer.span("scan_output"):
+                doc_reviewer_output_dir = Path(repo_path) / "tmp/doc-reviewer"
+                output_files = list(doc_reviewer_output_dir.glob("doc-reviewer-*.md")) if doc_reviewer_output_dir.exists() else []
+                logger.debug("Found %d files in %s", len(output_files), doc_reviewer_output_dir)
+
+                if output_files:
+                    # Get the most recent file
+                    latest_file = max(output_files, key=lambda f: f.stat().st_mtime)
+                    content = latest_file.read_text()
+                    logger.debug("Read %s (first 500 chars):\n%s", latest_file, content[:500])
+                    return content
             
             # If no files found, use Claude's stdout directly
-            print("DEBUG - Using Claude's stdout for analysis")
+            logger.debug("No output file, using Claude's stdout for analysis")
             return result.stdout
             
         except subprocess.TimeoutExpired:
-            print(f"Warning: doc-reviewer timed out")
+            logger.warning("doc-reviewer timed out in %s", repo_path)
             return None
         except Exception as e:
-            print(f"Error running doc-reviewer: {e}")
+            logger.error("Error running doc-reviewer: %s", e)
             return None
     
-    def extract_semantic_units(self, doc_reviewer_output: str) -> Dict:
-        """Extract semantic findings from doc-reviewer output"""
-        findings = {
-            "critical": [],
-            "warnings": [],
-            "suggestions": []
-        }
-        
+    def extract_semantic_units(self, doc_reviewer_output: str) -> Review:
+        """Parse doc-reviewer output into typed findings and action items"""
         if not doc_reviewer_output:
-            print("DEBUG - No output to parse")
-            return findings
-        
-        # Parse the doc-reviewer output for findings
-        lines = doc_reviewer_output.split('\n')
-        current_section = None
-        
-        for line in lines:
-            # Look for section headers
-            if 'CRITICAL ISSUES' in line.upper() or ('CRITICAL' in line.upper() and 'MUST FIX' in line.upper()):
-                current_section = 'critical'
-                print(f"DEBUG - Found critical section")
-            elif 'WARNING' in line.upper() and ('SHOULD FIX' in line.upper() or 'MEANING CHANGED' in line.upper()):
-                current_section = 'warnings'
-                print(f"DEBUG - Found warnings section")
-            elif 'SUGGESTION' in line.upper() and 'CONSIDER' in line.upper():
-                current_section = 'suggestions'
-                print(f"DEBUG - Found suggestions section")
-            # Look for finding markers - only count the finding header, not the details
-            elif current_section and line.strip().startswith('Finding #'):
-                findings[current_section].append(line.strip())
-                print(f"DEBUG - Found {current_section} finding: {line.strip()[:50]}")
-        
-        print(f"DEBUG - Extracted findings: {len(findings['critical'])} critical, {len(findings['warnings'])} warnings, {len(findings['suggestions'])} suggestions")
-        return findings
+            logger.debug("No output to parse")
+            return Review()
+
+        key = hashlib.sha256(doc_reviewer_output.encode()).digest()
+        with self._lock:
+            review = self._reviews.get(key)
+        if review is None:
+            with self.tracer.span("extract_semantic_units", bytes=len(doc_reviewer_output)):
+                review = parse_review(doc_reviewer_output)
+            with self._lock:
+                self._reviews[key] = review
+        findings = review.by_severity()
+        logger.debug("Extracted findings: %d critical, %d warnings, %d suggestions, %d action items",
+                     len(findings['critical']), len(findings['warnings']), len(findings['suggestions']),
+                     len(review.action_items))
+        return review
     
+    def check_markdown_output(self, doc_reviewer_output: str) -> Dict:
+        """Pre-check output with markdown_check.py: error count and counts per rule
+
+        Advisory only: markdownlint-cli2 also checks rules markdown_check.py leaves out.
+        """
+        key = hashlib.sha256(doc_reviewer_output.encode()).digest()
+        with self._lock:
+            lint = self._markdown_checks.get(key)
+        if lint is None:
+            with self.tracer.span("markdown_check", bytes=len(doc_reviewer_output)):
+                violations = check_markdown(doc_reviewer_output, self.lint_config)
+            rules: Dict[str, int] = {}
+            for violation in violations:
+                rules[violation.rule] = rules.get(violation.rule, 0) + 1
+            lint = {'errors': len(violations), 'rules': rules}
+            with self._lock:
+                self._markdown_checks[key] = lint
+        if lint['errors']:
+            logger.debug("markdown_check reports %d errors: %s", lint['errors'], lint['rules'])
+        return lint
+
     def evaluate_semantic_detection(self, test_case: Dict, doc_reviewer_output: str) -> Dict:
         """Evaluate if doc-reviewer correctly identified semantic losses"""
-        findings = self.extract_semantic_units(doc_reviewer_output)
+        review = self.extract_semantic_units(doc_reviewer_output)
+        findings = review.by_severity()
         expected_semantic_loss = test_case.get('semantic_check', {}).get('semantic_loss', False)
         expected_severity = test_case.get('semantic_check', {}).get('severity', 'warning')
         
@@ -182,7 +547,9 @@ class SemanticPreservationEvaluator:
             'expected_semantic_loss': expected_semantic_loss,
             'expected_severity': expected_severity,
             'detected_semantic_loss': detected_semantic_loss,
-            'findings': findings,
+            'findings': {key: [finding.to_dict() for finding in items] for key, items in findings.items()},
+            'action_items': [asdict(item) for item in review.action_items],
+            'markdown_check': self.check_markdown_output(doc_reviewer_output) if doc_reviewer_output else None,
             'success': success,
             'timestamp': datetime.now().isoformat()
         }
@@ -199,53 +566,211 @@ class SemanticPreservationEvaluator:
             
         return result
     
+    def run_test_case(self, test_case: Dict, trial: int = 0) -> Dict:
+        """Run one test case in its own temp repo and record its wall time and reviewer time
+
+        A cached reviewer output for the same diff, command and agent
+        definition is reused without creating a repo or calling the CLI.
+        The seconds spent in each stage are stored under 'timings'.
+        """
+        with self.tracer.collect() as timings, self._profiled():
+            with self.tracer.span("test_case", test_id=test_case['test_id']) as span:
+                result = self._run_test_case(test_case, trial)
+        result['trial'] = trial
+        result['duration_seconds'] = round(span.duration, 3)
+        if 'run_doc_reviewer' in timings:
+            # The reviewer call alone, without repo setup, lint and evaluation
+            result['reviewer_seconds'] = round(timings['run_doc_reviewer'], 3)
+        result['timings'] = timings
+        return result
+
+    def _run_test_case(self, test_case: Dict, trial: int) -> Dict:
+        cache_key = None
+        doc_reviewer_output = None
+        if self.cache:
+            with self.tracer.span("cache_lookup"):
+                cache_key = ResultCache.make_key(test_case['git_diff'], REVIEWER_COMMAND, AGENT_DEFINITION_FILES, trial)
+                if not self.refresh_all and test_case['test_id'] not in self.refresh_ids:
+                    doc_reviewer_output = self.cache.get(cache_key)
+        cache_hit = doc_reviewer_output is not None
+
+        if not cache_hit:
+            # Create temp repo with the diff
+            with self.tracer.span("create_temp_git_repo"):
+                tmpdir = self.create_temp_git_repo(test_case['git_diff'])
+            try:
+                # Run doc-reviewer
+                with self.tracer.span("run_doc_reviewer", reviewer=self.reviewer_name):
+                    doc_reviewer_output = self.reviewer(test_case, tmpdir.name)
+            finally:
+                # Clean up temp directory
+                with self.tracer.span("cleanup"):
+                    tmpdir.cleanup()
+            # Timeouts and failures (None) are retried next run instead of cached
+            if self.cache and doc_reviewer_output is not None:
+                self.cache.put(cache_key, doc_reviewer_output, test_case['test_id'])
+        if self.record_to and doc_reviewer_output is not None:
+            self.record_to.save(test_case['test_id'], doc_reviewer_output)
+
+        # Evaluate results
+        result = self.evaluate_semantic_detection(test_case, doc_reviewer_output or "")
+        result['cache_hit'] = cache_hit
+        return result
+
+    @contextmanager
+    def _profiled(self):
+        """cProfile the current thread while active when profiling is on"""
+        if not self.profile:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.append(profile)
+
+    def write_profile(self, path: str, top: int = 25):
+        """Merge the per-thread profiles into one pstats file and print the top entries"""
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(path)
+        print(f"\nProfile saved to {path} (view with: python3 -m pstats {path})")
+        stats.sort_stats("cumulative").print_stats(top)
+
     def run_evaluation(self) -> Dict:
-        """Run full evaluation suite"""
+        """Run full evaluation suite, up to self.workers trials at a time
+
+        Each case runs once, or with trials > 1 repeatedly until its outcome is
+        settled (the Wilson interval of its pass rate excludes 50%) or it has
+        run self.trials times. The case with the fewest trials so far is
+        scheduled next, so every case makes progress and workers stay busy.
+        """
         test_cases = self.load_test_cases()
-        results = []
-        
-        print(f"Running {len(test_cases)} test cases...")
-        
-        for i, test_case in enumerate(test_cases, 1):
-            print(f"\n[{i}/{len(test_cases)}] Running test: {test_case['test_id']}")
-            print(f"Description: {test_case['description']}")
-            
-            # Create temp repo with the diff
-            tmpdir = self.create_temp_git_repo(test_case['git_diff'])
-            repo_path = tmpdir.name
-            
-            # Run doc-reviewer
-            doc_reviewer_output = self.run_doc_reviewer(repo_path)
-            
-            # Evaluate results
-            result = self.evaluate_semantic_detection(test_case, doc_reviewer_output or "")
-            results.append(result)
-            
-            # Print immediate feedback
-            status = "✓" if result['success'] else "✗"
-            print(f"Result: {status} ({result['classification']})")
-            
-            # Clean up temp directory
-            tmpdir.cleanup()
-        
+        case_results: List[List[Dict]] = [[] for _ in test_cases]
+        submitted = [0] * len(test_cases)
+        settled = [False] * len(test_cases)
+        start = time.perf_counter()
+
+        trials_note = f", up to {self.trials} trials each," if self.trials > 1 else ""
+        print(f"Running {len(test_cases)} test cases{trials_note} with {self.workers} worker(s)...")
+        if self.cache:
+            evicted = self.cache.evict()
+            if evicted:
+                print(f"Evicted {evicted} stale cache entries")
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="case")
+        pending = {}
+
+        def schedule():
+            while len(pending) < self.workers:
+                open_cases = [i for i in range(len(test_cases)) if not settled[i] and submitted[i] < self.trials]
+                if not open_cases:
+                    return
+                i = min(open_cases, key=lambda i: submitted[i])
+                pending[pool.submit(self.run_test_case, test_cases[i], submitted[i])] = i
+                submitted[i] += 1
+
+        done = 0
+        try:
+            schedule()
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = pending.pop(future)
+                    test_case = test_cases[i]
+                    result = future.result()
+                    case_results[i].append(result)
+                    done += 1
+
+                    # Print immediate feedback
+                    status = "✓" if result['success'] else "✗"
+                    cached = ", cached" if result['cache_hit'] else ""
+                    if self.trials == 1:
+                        print(f"\n[{done}/{len(test_cases)}] {test_case['test_id']}: {status} "
+                              f"({result['classification']}, {result['duration_seconds']:.1f}s{cached})")
+                        print(f"Description: {test_case['description']}")
+                        continue
+                    passes = sum(r['success'] for r in case_results[i])
+                    runs = len(case_results[i])
+                    settled[i] = settled[i] or is_settled(passes, runs, self.confidence)
+                    state = "settled" if settled[i] else "done" if runs >= self.trials else "open"
+                    print(f"[{done}] {test_case['test_id']} trial {result['trial'] + 1}: {status} "
+                          f"({result['classification']}, {result['duration_seconds']:.1f}s{cached}) "
+                          f"- passed {passes}/{runs}, {state}")
+                schedule()
+        except KeyboardInterrupt:
+            print("\nCancelling: killing running reviewers and cleaning up temp repos...")
+            for future in pending:
+                future.cancel()
+            self.cancel()
+            raise
+        finally:
+            # Running workers finish quickly once their CLI process is killed,
+            # and their finally blocks remove the temp repos
+            pool.shutdown(wait=True)
+            self.cleanup_template()
+
+        # One result per trial, in test case then trial order
+        results = [r for trials in case_results for r in sorted(trials, key=lambda r: r['trial'])]
+
         # Calculate aggregate metrics
         metrics = self.calculate_metrics(results)
-        
+        metrics['wall_time_seconds'] = round(time.perf_counter() - start, 3)
+        metrics['workers'] = self.workers
+        metrics['reviewer'] = self.reviewer_name
+        metrics['throughput_cases_per_sec'] = (
+            round(len(results) / metrics['wall_time_seconds'], 3) if metrics['wall_time_seconds'] else 0)
+        metrics['timings'] = self.tracer.summary()
+        linted = [r['markdown_check'] for r in results if r.get('markdown_check') is not None]
+        metrics['markdown_check'] = {
+            'checked': len(linted),
+            'clean': sum(1 for lint in linted if not lint['errors']),
+            'errors': sum(lint['errors'] for lint in linted),
+        }
+        if self.trials > 1:
+            metrics['trials'] = self.trial_statistics(test_cases, case_results, settled)
+        if self.cache:
+            hits = sum(1 for r in results if r['cache_hit'])
+            metrics['cache'] = {
+                'hits': hits,
+                'misses': len(results) - hits,
+                'hit_rate': hits / len(results) if results else 0
+            }
+
         # Save results
-        self.save_results(results, metrics)
-        
+        with self.tracer.span("save_results") as span, self._profiled():
+            self.save_results(results, metrics)
+        logger.info("save_results took %.3fs", span.duration)
+
         return metrics
-    
+
     def calculate_metrics(self, results: List[Dict]) -> Dict:
-        """Calculate evaluation metrics"""
-        classifications = [r['classification'] for r in results]
+        """Calculate evaluation metrics, counting each test case once
+
+        A case run for several trials contributes its pass rate: e.g. 3 of 4
+        trials correct on a semantic-loss case is 0.75 true positive and 0.25
+        false negative. With one trial per case the counts are whole numbers.
+        """
+        trials_per_case: Dict[str, int] = {}
+        for r in results:
+            trials_per_case[r['test_id']] = trials_per_case.get(r['test_id'], 0) + 1
+        counts = {'true_positive': 0.0, 'true_negative': 0.0, 'false_positive': 0.0, 'false_negative': 0.0}
+        for r in results:
+            counts[r['classification']] += 1 / trials_per_case[r['test_id']]
+        counts = {k: int(round(v)) if abs(v - round(v)) < 1e-9 else round(v, 3) for k, v in counts.items()}
         
-        tp = classifications.count('true_positive')
-        tn = classifications.count('true_negative')
-        fp = classifications.count('false_positive')
-        fn = classifications.count('false_negative')
+        tp = counts['true_positive']
+        tn = counts['true_negative']
+        fp = counts['false_positive']
+        fn = counts['false_negative']
         
-        total = len(results)
+        total = len(trials_per_case)
         correct = tp + tn
         
         # Calculate metrics
@@ -257,7 +782,7 @@ class SemanticPreservationEvaluator:
         metrics = {
             'total_tests': total,
             'passed': correct,
-            'failed': total - correct,
+            'failed': round(total - correct, 3),
             'accuracy': accuracy,
             'precision': precision,
             'recall': recall,
@@ -271,6 +796,36 @@ class SemanticPreservationEvaluator:
         }
         
         return metrics
+
+    def trial_statistics(self, test_cases: List[Dict], case_results: List[List[Dict]], settled: List[bool]) -> Dict:
+        """Per-case pass rates with Wilson intervals and bootstrap intervals on the metrics"""
+        cases = []
+        outcomes = []
+        for test_case, trials, is_done in zip(test_cases, case_results, settled):
+            passes = sum(r['success'] for r in trials)
+            low, high = wilson_interval(passes, len(trials), self.confidence)
+            classifications: Dict[str, int] = {}
+            for r in trials:
+                classifications[r['classification']] = classifications.get(r['classification'], 0) + 1
+            cases.append({
+                'test_id': test_case['test_id'],
+                'trials': len(trials),
+                'passes': passes,
+                'pass_rate': passes / len(trials) if trials else 0,
+                'interval': [round(low, 4), round(high, 4)],
+                'settled': is_done,
+                'classifications': classifications
+            })
+            expected = test_case.get('semantic_check', {}).get('semantic_loss', False)
+            outcomes.append((expected, [bool(r['success']) for r in trials]))
+        intervals = bootstrap_intervals([o for o in outcomes if o[1]], self.confidence)
+        return {
+            'max_trials': self.trials,
+            'total_trials': sum(len(trials) for trials in case_results),
+            'confidence': self.confidence,
+            'intervals': {name: [round(low, 4), round(high, 4)] for name, (low, high) in intervals.items()},
+            'cases': cases
+        }
     
     def save_results(self, results: List[Dict], metrics: Dict):
         """Save evaluation results to file"""
@@ -304,10 +859,42 @@ class SemanticPreservationEvaluator:
             f.write(f"  True Negatives: {metrics['confusion_matrix']['true_negative']}\n")
             f.write(f"  False Positives: {metrics['confusion_matrix']['false_positive']}\n")
             f.write(f"  False Negatives: {metrics['confusion_matrix']['false_negative']}\n")
+            if 'cache' in metrics:
+                f.write(f"\nCache: {metrics['cache']['hits']} hits, {metrics['cache']['misses']} misses "
+                        f"({metrics['cache']['hit_rate']:.0%} hit rate)\n")
+            if metrics.get('markdown_check', {}).get('checked'):
+                check = metrics['markdown_check']
+                f.write(f"Markdown pre-check (markdown_check.py, advisory): {check['clean']}/{check['checked']} "
+                        f"outputs without errors ({check['errors']} errors)\n")
+            if 'trials' in metrics:
+                f.write("\n" + "\n".join(self.format_trials(metrics['trials'])) + "\n")
         
+        # Append to the run history so reports don't have to re-read every JSON file
+        history = RunHistory(self.results_dir / HISTORY_FILE)
+        history.record(results_file.name, timestamp, metrics, results)
+        history.import_results(self.results_dir)
+        history.close()
+
         print(f"\nResults saved to {results_file}")
         print(f"Summary saved to {summary_file}")
     
+    @staticmethod
+    def format_trials(trials: Dict) -> List[str]:
+        """Lines describing metric intervals and per-case pass rates of a trials run"""
+        confidence = f"{trials['confidence']:.0%}"
+        lines = [f"Trials: {trials['total_trials']} total, up to {trials['max_trials']} per case",
+                 f"{confidence} intervals:"]
+        for name in ('accuracy', 'precision', 'recall', 'f1_score'):
+            low, high = trials['intervals'][name]
+            lines.append(f"  {name:<10} [{low:.2%}, {high:.2%}]")
+        lines.append("Per-case pass rates:")
+        for case in trials['cases']:
+            low, high = case['interval']
+            state = "settled" if case['settled'] else "unsettled"
+            lines.append(f"  {case['test_id']:<30} {case['passes']}/{case['trials']} "
+                         f"({case['pass_rate']:.0%}, {confidence} CI [{low:.0%}, {high:.0%}], {state})")
+        return lines
+
     def print_summary(self, metrics: Dict):
         """Print evaluation summary to console"""
         print("\n" + "="*50)
@@ -317,11 +904,77 @@ class SemanticPreservationEvaluator:
         print(f"Precision: {metrics['precision']:.2%}")
         print(f"Recall: {metrics['recall']:.2%}")
         print(f"F1 Score: {metrics['f1_score']:.2%}")
-        print(f"\nTests Passed: {metrics['passed']}/{metrics['total_tests']}")
+        print(f"\nTests Passed: {metrics['passed']:g}/{metrics['total_tests']}")
+        if 'wall_time_seconds' in metrics:
+            print(f"Wall time: {metrics['wall_time_seconds']:.1f}s with {metrics['workers']} worker(s) "
+                  f"({metrics['throughput_cases_per_sec']:.2f} cases/s, {metrics['reviewer']} reviewer)")
+        if 'cache' in metrics:
+            print(f"Cache: {metrics['cache']['hits']}/{metrics['cache']['hits'] + metrics['cache']['misses']} hits "
+                  f"({metrics['cache']['hit_rate']:.0%})")
+        if metrics.get('markdown_check', {}).get('checked'):
+            check = metrics['markdown_check']
+            print(f"Markdown pre-check (markdown_check.py, advisory): {check['clean']}/{check['checked']} "
+                  f"outputs without errors ({check['errors']} errors)")
+        if 'trials' in metrics:
+            print()
+            print("\n".join(self.format_trials(metrics['trials'])))
+        if metrics.get('timings'):
+            print("\nStage timings (seconds):")
+            print(f"  {'stage':<24} {'count':>5} {'mean':>8} {'max':>8} {'total':>8}")
+            for stage, timing in sorted(metrics['timings'].items(), key=lambda t: -t[1]['total_seconds']):
+                print(f"  {stage:<24} {timing['count']:>5} {timing['mean_seconds']:>8.3f} "
+                      f"{timing['max_seconds']:>8.3f} {timing['total_seconds']:>8.3f}")
 
 
 def main():
-    evaluator = SemanticPreservationEvaluator()
+    if len(sys.argv) > 1 and sys.argv[1] == "report":
+        return report_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Evaluate semantic loss detection of the doc-reviewer subagent")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="Number of test cases to run concurrently (default: 1)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the reviewer and don't store outputs")
+    parser.add_argument("--refresh", action="append", default=[], metavar="TEST_ID",
+                        help="Ignore the cached output for this test_id (repeatable)")
+    parser.add_argument("--refresh-all", action="store_true",
+                        help="Ignore all cached outputs but store the new ones")
+    parser.add_argument("--cache-max-mb", type=float, default=500, help="Cache size limit in MB (default: 500)")
+    parser.add_argument("--cache-max-age-days", type=float, default=30, help="Cache entry lifetime (default: 30)")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--record", action="store_true",
+                         help="Save every reviewer output to the fixtures directory")
+    backend.add_argument("--replay", action="store_true",
+                         help="Replay recorded fixtures instead of calling the claude CLI (no cache)")
+    parser.add_argument("--fixtures", default="fixtures", help="Fixtures directory (default: fixtures)")
+    parser.add_argument("--replay-latency", type=float, default=0.0,
+                        help="Seconds each replayed review takes (default: 0)")
+    parser.add_argument("--replay-jitter", type=float, default=0.0,
+                        help="Uniform +/- jitter on the replay latency in seconds (default: 0)")
+    parser.add_argument("--trials", type=int, default=1,
+                        help="Run each case up to N times, stopping once its outcome is settled (default: 1)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="Confidence level for trial intervals and early stopping (default: 0.95)")
+    parser.add_argument("--min-accuracy", type=float, default=0.8,
+                        help="Exit non-zero below this accuracy; with --trials, only when the whole "
+                             "accuracy interval is below it (default: 0.8)")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome trace-event file of all stage spans")
+    parser.add_argument("--profile", metavar="FILE", help="cProfile every worker thread and save merged pstats to FILE")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Log verbosity; DEBUG shows CLI output and parsing details (default: WARNING)")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s [%(threadName)s] %(message)s")
+
+    cache = None
+    # Replayed outputs must not end up in the cache under the real CLI's key
+    if not args.no_cache and not args.replay:
+        cache = ResultCache(Path("results") / "cache", int(args.cache_max_mb * 1024 * 1024), args.cache_max_age_days)
+    store = FixtureStore(Path(args.fixtures))
+    reviewer = ReplayReviewer(store, args.replay_latency, args.replay_jitter) if args.replay else None
+    evaluator = SemanticPreservationEvaluator(workers=args.workers, cache=cache,
+                                              refresh_ids=set(args.refresh), refresh_all=args.refresh_all,
+                                              reviewer=reviewer, record_to=store if args.record else None,
+                                              profile=bool(args.profile), trials=args.trials,
+                                              confidence=args.confidence)
     
     # Check if test cases exist
     if not Path("test-cases.json").exists():
@@ -329,11 +982,29 @@ def main():
         # Create sample test cases (we'll do this next)
         return 1
     
-    metrics = evaluator.run_evaluation()
+    try:
+        metrics = evaluator.run_evaluation()
+    except KeyboardInterrupt:
+        print("Evaluation cancelled")
+        return 130
     evaluator.print_summary(metrics)
+    if args.trace:
+        evaluator.tracer.write_chrome_trace(args.trace, "doc-reviewer eval")
+        print(f"Trace saved to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+    if args.profile:
+        evaluator.write_profile(args.profile)
     
-    # Return non-zero exit code if accuracy is below threshold
-    if metrics['accuracy'] < 0.8:
+    # Return non-zero exit code if accuracy is below threshold. A single noisy
+    # pass decides directly; with trials only a confidently low accuracy fails.
+    if 'trials' in metrics:
+        low, high = metrics['trials']['intervals']['accuracy']
+        if high < args.min_accuracy:
+            return 1
+        if low < args.min_accuracy:
+            print(f"Warning: accuracy interval [{low:.0%}, {high:.0%}] includes the {args.min_accuracy:.0%} "
+                  f"threshold; raise --trials to settle it")
+        return 0
+    if metrics['accuracy'] < args.min_accuracy:
         return 1
     return 0
 
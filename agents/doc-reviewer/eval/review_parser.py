@@ -0,0 +1,316 @@
+"""
+Single-pass parser for doc-reviewer output (agents/doc-reviewer/output-template.md).
+Turns a review into typed findings and action items in time linear in its size.
+The pass only tracks structure, like the line scan it replaced; each finding
+parses its labeled fields from its own lines the first time they are read.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+SEVERITIES = ("critical", "warning", "suggestion")
+# Keys of the per-severity findings dict kept in eval results
+SEVERITY_KEYS = {"critical": "critical", "warning": "warnings", "suggestion": "suggestions"}
+ID_PREFIX_SEVERITY = {"C": "critical", "W": "warning", "S": "suggestion"}
+PRIORITY_HEADERS = (("IMMEDIATE", "immediate"), ("RECOMMENDED", "recommended"))
+
+FENCE_OPENERS = ("```", "~~~")
+HEADING = re.compile(r"^(#{1,6})\s")
+FINDING = re.compile(r"^Finding #\s*([A-Za-z]*)(\d+)\s*[:.\-–]?\s*(.*)$")
+FIELD = re.compile(r"^([A-Z][A-Za-z /]{0,40}):(?:\s+(.*))?$")
+# Labels giving a finding's line range; the one given last wins
+LOCATION_LABELS = ("Lines", "Line")
+LINE_RANGE = re.compile(r"(\d+)(?:\s*[-–]\s*(\d+))?")
+ACTION_ITEM = re.compile(r"^\d+\.\s+\[([ xX])\]\s*(.*)$")
+ACTION_LOCATION = re.compile(r"\(([^(),]+),\s*lines?\s+(\d+)(?:\s*[-–]\s*(\d+))?\)")
+SUMMARY_LINE = re.compile(r"^([A-Z][A-Za-z ]+):\s*(.*)$")
+_W = r"[^\S\n]*"
+_SEVERITY_HEADING = r"#[^\n]*?(?i:critical|warning|suggestion)"
+# Lines of a fence outside any finding that are neither a fence, a heading nor a
+# finding; in a findings section or none, nothing else in them matters
+FENCED_LINES = re.compile(rf"(?:(?!{_W}(?:[`~#]|Finding #))[^\n]*\n)*")
+# Lines of a finding inside a fence that can't end it or change the fence stack: any
+# line but a fence, a heading naming a severity, another finding or "---", and whole
+# code blocks opened by three backticks or tildes and an info string (so they never
+# close an open fence) and closed by a bare fence. Matched in bulk to skip the body.
+_CODE_LINES = rf"(?:(?!{_W}(?:[`~]|{_SEVERITY_HEADING}|Finding #))[^\n]*\n)*"
+BODY_LINES = re.compile(
+    rf"(?:(?!{_W}(?:[`~]|{_SEVERITY_HEADING}|Finding #|---))[^\n]*\n"
+    rf"|{_W}```{_W}[^\s`][^\n]*\n{_CODE_LINES}{_W}`{{3,}}{_W}\n"
+    rf"|{_W}~~~{_W}[^\s~][^\n]*\n{_CODE_LINES}{_W}~{{3,}}{_W}\n)*")
+
+
+@dataclass
+class Finding:
+    id: str
+    severity: str
+    title: str
+    # Text after the "Finding #" line up to where the finding ends
+    body: str = field(default="", repr=False)
+
+    @cached_property
+    def fields(self) -> Dict[str, str]:
+        """Every "Label: value" of the finding (Issue, Impact, BEFORE, SUGGESTED FIX, ...),
+        continuation lines included"""
+        return parse_fields(self.body.split("\n"))
+
+    @property
+    def file(self) -> Optional[str]:
+        return self.fields.get("File") or None
+
+    @property
+    def lines(self) -> Optional[str]:
+        for name in reversed(self.fields):
+            if name in LOCATION_LABELS:
+                return self.fields[name] or None
+        return None
+
+    @cached_property
+    def _line_range(self) -> Tuple[Optional[int], Optional[int]]:
+        return parse_line_range(self.lines or "")
+
+    @property
+    def line_start(self) -> Optional[int]:
+        return self._line_range[0]
+
+    @property
+    def line_end(self) -> Optional[int]:
+        return self._line_range[1]
+
+    @property
+    def rationale(self) -> Optional[str]:
+        """Why the finding matters: Impact for critical/warning, Rationale for suggestions"""
+        for key in ("Impact", "Rationale", "Issue"):
+            if self.fields.get(key):
+                return self.fields[key]
+        return None
+
+    @property
+    def header(self) -> str:
+        return f"Finding #{self.id}: {self.title}"
+
+    def to_dict(self) -> Dict:
+        start, end = self._line_range
+        return {"id": self.id, "severity": self.severity, "title": self.title, "file": self.file,
+                "lines": self.lines, "line_start": start, "line_end": end,
+                "fields": dict(self.fields), "rationale": self.rationale}
+
+
+@dataclass
+class ActionItem:
+    text: str
+    priority: Optional[str] = None
+    done: bool = False
+    file: Optional[str] = None
+    line_start: Optional[int] = None
+    line_end: Optional[int] = None
+
+
+@dataclass
+class Review:
+    summary: Dict[str, str] = field(default_factory=dict)
+    findings: List[Finding] = field(default_factory=list)
+    action_items: List[ActionItem] = field(default_factory=list)
+
+    def by_severity(self) -> Dict[str, List[Finding]]:
+        """Findings grouped under the critical/warnings/suggestions keys"""
+        grouped = {key: [] for key in SEVERITY_KEYS.values()}
+        for finding in self.findings:
+            grouped[SEVERITY_KEYS[finding.severity]].append(finding)
+        return grouped
+
+
+def section_severity(upper: str) -> Optional[str]:
+    """Severity introduced by a findings section header (line already upper-cased)"""
+    if "CRITICAL ISSUES" in upper or ("CRITICAL" in upper and "MUST FIX" in upper):
+        return "critical"
+    if "WARNING" in upper and ("SHOULD FIX" in upper or "MEANING CHANGED" in upper):
+        return "warning"
+    if "SUGGESTION" in upper and "CONSIDER" in upper:
+        return "suggestion"
+    return None
+
+
+def fence_line(fences: List[str], stripped: str) -> bool:
+    """Push or pop the fence of a ``` or ~~~ line; whether it closed the innermost one
+
+    A fence closes with the same character, at least as long and without an info
+    string (CommonMark); any other fence line opens a nested fence.
+    """
+    first = stripped[0]
+    rest = stripped.lstrip(first)
+    if fences and not rest and fences[-1][0] == first and len(stripped) >= len(fences[-1]):
+        fences.pop()
+        return True
+    fences.append(stripped[:len(stripped) - len(rest)])
+    return False
+
+
+def parse_line_range(text: str):
+    match = LINE_RANGE.search(text)
+    if not match:
+        return None, None
+    start = int(match.group(1))
+    return start, int(match.group(2)) if match.group(2) else start
+
+
+def parse_fields(body: List[str]) -> Dict[str, str]:
+    """Labeled fields of a finding's lines; code blocks stay in the field they follow"""
+    fields: Dict[str, str] = {}
+    fences: List[str] = []
+    name: Optional[str] = None
+    value: List[str] = []
+
+    def end_field():
+        if name in LOCATION_LABELS:
+            # Moved to the end so the location given last is the one used
+            fields.pop(name, None)
+        fields[name] = "\n".join(value).strip()
+
+    for line in body:
+        stripped = line.strip()
+        if stripped[:3] in FENCE_OPENERS:
+            fence_line(fences, stripped)
+        elif not fences and ":" in stripped:
+            label = FIELD.match(stripped)
+            if label:
+                if name is not None:
+                    end_field()
+                name, value = label.group(1), [label.group(2) or ""]
+                continue
+        if name is not None:
+            value.append(line)
+    if name is not None:
+        end_field()
+    return fields
+
+
+def parse_review(text: str) -> Review:
+    """Parse a review in one pass over its text
+
+    Findings are recognized by their "Finding #<id>: <title>" line and take
+    their severity from the enclosing CRITICAL/WARNINGS/SUGGESTIONS section
+    (or, outside one, from the id prefix). A finding runs until "---", the
+    next finding, a new section or the end of its code fence. Fences are
+    tracked as a stack so code blocks nested in a finding stay in its body,
+    which parse_fields splits into fields when Finding.fields is first read.
+    Within a fence, the scan skips the lines of a finding that can't end it
+    (BODY_LINES), or outside findings those that can't change the structure
+    (FENCED_LINES), in one match instead of visiting each of them.
+    """
+    review = Review()
+    size = len(text)
+    fences: List[str] = []
+    section: Optional[str] = None  # severity, "summary", "actions" or None
+    priority: Optional[str] = None
+    finding: Optional[Finding] = None
+    finding_depth = 0
+    body_start = 0
+    action: Optional[ActionItem] = None
+    action_lines: List[str] = []
+
+    def end_finding(end: int):
+        """End the open finding at the line starting at offset end"""
+        nonlocal finding
+        if finding is not None:
+            finding.body = text[body_start:end - 1]
+            review.findings.append(finding)
+        finding = None
+
+    def end_action():
+        nonlocal action, action_lines
+        if action is not None:
+            action.text = " ".join(action_lines)
+            location = ACTION_LOCATION.search(action.text)
+            if location:
+                action.file = location.group(1).strip()
+                action.line_start = int(location.group(2))
+                action.line_end = int(location.group(3) or location.group(2))
+            review.action_items.append(action)
+        action, action_lines = None, []
+
+    pos = 0
+    while pos <= size:
+        if fences:
+            if finding is not None:
+                pos = BODY_LINES.match(text, pos).end()
+            elif section is None or section in SEVERITIES:
+                pos = FENCED_LINES.match(text, pos).end()
+        start = pos
+        pos = text.find("\n", start)
+        if pos < 0:
+            pos = size
+        line = text[start:pos]
+        pos += 1
+        stripped = line.strip()
+        if not stripped:
+            continue
+        # Cheap first-character checks before any regex
+        first = stripped[0]
+
+        if first in "`~" and stripped[:3] in FENCE_OPENERS:
+            if fence_line(fences, stripped) and finding is not None and len(fences) < finding_depth:
+                end_finding(start)
+            continue
+
+        # Inside a code block nested in a finding (BEFORE/AFTER/fix snippets)
+        in_code = finding is not None and len(fences) > finding_depth
+
+        # Section headers: markdown headings anywhere (so an unbalanced fence can't hide
+        # them) and header-like lines outside fences; action items never switch sections
+        heading = HEADING.match(stripped) if first == "#" else None
+        if heading or (not fences and section != "actions"):
+            severity = section_severity(stripped.upper())
+            if severity:
+                end_finding(start)
+                end_action()
+                section, fences = severity, []
+                continue
+        if heading and not fences and len(heading.group(1)) <= 2:
+            end_finding(start)
+            end_action()
+            upper = stripped.upper()
+            section = ("actions" if "ACTION ITEMS" in upper else
+                       "summary" if "REVIEW SUMMARY" in upper else None)
+            continue
+
+        found = FINDING.match(stripped) if first == "F" and not in_code and stripped.startswith("Finding #") else None
+        if found:
+            end_finding(start)
+            prefix, number, title = found.groups()
+            severity = section if section in SEVERITIES else ID_PREFIX_SEVERITY.get(prefix[:1].upper())
+            if severity:
+                finding = Finding(id=f"{prefix}{number}", severity=severity, title=title.strip())
+                finding_depth = len(fences)
+                body_start = pos
+            continue
+
+        if finding is not None:
+            if first == "-" and stripped == "---" and not in_code:
+                end_finding(start)
+            continue
+
+        if section == "summary":
+            pair = SUMMARY_LINE.match(stripped)
+            if pair:
+                review.summary[pair.group(1)] = pair.group(2)
+        elif section == "actions":
+            item = ACTION_ITEM.match(stripped)
+            if item:
+                end_action()
+                action = ActionItem(text="", priority=priority, done=item.group(1) != " ")
+                action_lines = [item.group(2).strip()]
+            elif stripped.startswith("**") and stripped.endswith("**"):
+                end_action()
+                upper = stripped.upper()
+                priority = next((name for key, name in PRIORITY_HEADERS if key in upper), priority)
+            elif action is not None and line[:1].isspace():
+                action_lines.append(stripped)
+            else:
+                end_action()
+
+    end_finding(size + 1)
+    end_action()
+    return review
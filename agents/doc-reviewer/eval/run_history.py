@@ -0,0 +1,238 @@
+"""
+Append-only history of evaluation runs in results/history.sqlite.
+save_results records every run with one row per test case. The report
+command turns that into accuracy/F1 trends, per-test flakiness and
+reviewer latency percentiles without re-reading the eval-results-*.json files.
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HISTORY_FILE = "history.sqlite"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    results_file TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    accuracy REAL NOT NULL,
+    precision REAL NOT NULL,
+    recall REAL NOT NULL,
+    f1_score REAL NOT NULL,
+    wall_time_seconds REAL,
+    workers INTEGER,
+    reviewer TEXT,
+    cache_hit_rate REAL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    test_id TEXT NOT NULL,
+    trial INTEGER NOT NULL DEFAULT 0,
+    classification TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    duration_seconds REAL,
+    reviewer_seconds REAL,
+    critical INTEGER NOT NULL,
+    warnings INTEGER NOT NULL,
+    suggestions INTEGER NOT NULL,
+    action_items INTEGER,
+    cache_hit INTEGER,
+    PRIMARY KEY (run_id, test_id, trial)
+);
+CREATE INDEX IF NOT EXISTS runs_results_file ON runs (results_file);
+CREATE INDEX IF NOT EXISTS cases_test ON cases (test_id, run_id);
+"""
+
+# Runs considered by the report, newest last; ':last' and ':reviewer' are bound per query
+RECENT_RUNS = """
+SELECT id FROM runs WHERE :reviewer IS NULL OR reviewer = :reviewer ORDER BY timestamp DESC, id DESC LIMIT :last
+"""
+
+TREND_QUERY = f"""
+SELECT timestamp, total, accuracy, f1_score,
+       accuracy - LAG(accuracy) OVER (ORDER BY timestamp, id) AS accuracy_delta,
+       f1_score - LAG(f1_score) OVER (ORDER BY timestamp, id) AS f1_delta,
+       wall_time_seconds, reviewer, cache_hit_rate
+FROM runs WHERE id IN ({RECENT_RUNS}) ORDER BY timestamp, id
+"""
+
+# A test is flaky when its outcome differs between runs (or trials of a run); flips
+# count outcome changes between consecutive runs/trials
+FLAKINESS_QUERY = f"""
+WITH recent AS (
+    SELECT c.test_id, c.success, c.classification,
+           LAG(c.success) OVER (PARTITION BY c.test_id ORDER BY r.timestamp, r.id, c.trial) AS previous
+    FROM cases c JOIN runs r ON r.id = c.run_id
+    WHERE c.run_id IN ({RECENT_RUNS})
+)
+SELECT test_id, COUNT(*) AS runs, AVG(success) AS pass_rate,
+       SUM(previous IS NOT NULL AND previous != success) AS flips,
+       COUNT(DISTINCT classification) AS classifications
+FROM recent GROUP BY test_id
+ORDER BY pass_rate > 0 AND pass_rate < 1 DESC, flips DESC, pass_rate, test_id
+"""
+
+# Nearest-rank percentiles of the reviewer call alone (reviewer_seconds, not the whole
+# case); cache hits never called the reviewer
+LATENCY_QUERY = f"""
+WITH ranked AS (
+    SELECT test_id, reviewer_seconds AS d,
+           ROW_NUMBER() OVER (PARTITION BY test_id ORDER BY reviewer_seconds) AS rn,
+           COUNT(*) OVER (PARTITION BY test_id) AS n
+    FROM cases
+    WHERE run_id IN ({RECENT_RUNS}) AND reviewer_seconds IS NOT NULL AND NOT COALESCE(cache_hit, 0)
+    UNION ALL
+    SELECT '(all)', reviewer_seconds,
+           ROW_NUMBER() OVER (ORDER BY reviewer_seconds), COUNT(*) OVER ()
+    FROM cases
+    WHERE run_id IN ({RECENT_RUNS}) AND reviewer_seconds IS NOT NULL AND NOT COALESCE(cache_hit, 0)
+)
+SELECT test_id, MAX(n),
+       MAX(CASE WHEN rn = CAST(0.50 * n + 0.999999 AS INTEGER) THEN d END) AS p50,
+       MAX(CASE WHEN rn = CAST(0.90 * n + 0.999999 AS INTEGER) THEN d END) AS p90,
+       MAX(CASE WHEN rn = CAST(0.99 * n + 0.999999 AS INTEGER) THEN d END) AS p99,
+       MAX(d) AS max
+FROM ranked GROUP BY test_id ORDER BY test_id = '(all)', p50 DESC
+"""
+
+
+def finding_count(findings: Dict, key: str) -> int:
+    return len(findings.get(key) or [])
+
+
+def reviewer_seconds(result: Dict) -> Optional[float]:
+    """Seconds in the reviewer call; results saved before the field existed have it in their timings"""
+    if 'reviewer_seconds' in result:
+        return result['reviewer_seconds']
+    return (result.get('timings') or {}).get('run_doc_reviewer')
+
+
+class RunHistory:
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+
+    def _case_columns(self) -> List[str]:
+        return [row[1] for row in self.conn.execute("PRAGMA table_info(cases)")]
+
+    def _migrate(self):
+        """Bring histories from before --trials (trial column and key) and reviewer_seconds up to date"""
+        columns = self._case_columns()
+        if not columns:
+            return
+        if 'trial' not in columns:
+            with self.conn:
+                self.conn.execute("DROP INDEX IF EXISTS cases_test")
+                self.conn.execute("ALTER TABLE cases RENAME TO cases_v1")
+                self.conn.executescript(SCHEMA)
+                self.conn.execute(f"INSERT INTO cases ({', '.join(columns)}) SELECT {', '.join(columns)} FROM cases_v1")
+                self.conn.execute("DROP TABLE cases_v1")
+            columns = self._case_columns()
+        if 'reviewer_seconds' not in columns:
+            # Older runs only have the whole-case duration; they drop out of the latency report
+            with self.conn:
+                self.conn.execute("ALTER TABLE cases ADD COLUMN reviewer_seconds REAL")
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, results_file: str, timestamp: str, metrics: Dict, results: List[Dict]):
+        """Append one run and its per-case rows"""
+        cache = metrics.get('cache')
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (results_file, timestamp, total, passed, accuracy, precision, recall, "
+                "f1_score, wall_time_seconds, workers, reviewer, cache_hit_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (results_file, timestamp, metrics['total_tests'], metrics['passed'], metrics['accuracy'],
+                 metrics['precision'], metrics['recall'], metrics['f1_score'], metrics.get('wall_time_seconds'),
+                 metrics.get('workers'), metrics.get('reviewer', 'cli'), cache['hit_rate'] if cache else None))
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cases (run_id, test_id, trial, classification, success, duration_seconds, "
+                "reviewer_seconds, critical, warnings, suggestions, action_items, cache_hit) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, r['test_id'], r.get('trial', 0), r['classification'], int(r['success']), r.get('duration_seconds'),
+                  reviewer_seconds(r),
+                  finding_count(r['findings'], 'critical'), finding_count(r['findings'], 'warnings'),
+                  finding_count(r['findings'], 'suggestions'),
+                  len(r['action_items']) if 'action_items' in r else None,
+                  int(r['cache_hit']) if 'cache_hit' in r else None)
+                 for r in results])
+
+    def import_results(self, results_dir: Path) -> int:
+        """Record eval-results-*.json files written before the history existed"""
+        known = {row[0] for row in self.conn.execute("SELECT results_file FROM runs")}
+        imported = 0
+        for path in sorted(results_dir.glob("eval-results-*.json")):
+            if path.name in known:
+                continue
+            try:
+                data = json.loads(path.read_text())
+                self.record(path.name, data['timestamp'], data['metrics'], data['test_results'])
+                imported += 1
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: skipping {path.name}: {e}")
+        return imported
+
+    def query(self, sql: str, last: int, reviewer: Optional[str]):
+        return self.conn.execute(sql, {'last': last, 'reviewer': reviewer}).fetchall()
+
+
+def format_delta(delta: Optional[float]) -> str:
+    return "" if delta is None else f"{delta:+.0%}"
+
+
+def report_main(argv=None) -> int:
+    """eval.py report: trends, flakiness and latency over the last runs"""
+    parser = argparse.ArgumentParser(prog="eval.py report",
+                                     description="Accuracy/F1 trends, flaky tests and latency percentiles")
+    parser.add_argument("--last", type=int, default=20, help="Number of most recent runs to analyze (default: 20)")
+    parser.add_argument("--reviewer", choices=["cli", "replay"], help="Only runs with this reviewer backend")
+    parser.add_argument("--results-dir", default="results", help="Results directory (default: results)")
+    args = parser.parse_args(argv)
+
+    results_dir = Path(args.results_dir)
+    if not results_dir.is_dir():
+        print(f"Error: {results_dir} not found")
+        return 1
+    history = RunHistory(results_dir / HISTORY_FILE)
+    imported = history.import_results(results_dir)
+    if imported:
+        print(f"Imported {imported} earlier result files into {history.db_path}")
+
+    trend = history.query(TREND_QUERY, args.last, args.reviewer)
+    if not trend:
+        print("No runs recorded yet")
+        return 1
+
+    print(f"\nTREND (last {len(trend)} runs)")
+    print(f"{'timestamp':<17} {'tests':>5} {'accuracy':>9} {'Δ':>6} {'F1':>6} {'Δ':>6} {'wall':>8} "
+          f"{'reviewer':<8} {'cache':>5}")
+    for timestamp, total, accuracy, f1, accuracy_delta, f1_delta, wall, reviewer, hit_rate in trend:
+        regression = "  ← regression" if accuracy_delta is not None and accuracy_delta < 0 else ""
+        print(f"{timestamp:<17} {total:>5} {accuracy:>9.0%} {format_delta(accuracy_delta):>6} {f1:>6.0%} "
+              f"{format_delta(f1_delta):>6} {'' if wall is None else f'{wall:.1f}s':>8} {reviewer or '':<8} "
+              f"{'' if hit_rate is None else f'{hit_rate:.0%}':>5}{regression}")
+
+    print("\nPER-TEST OUTCOMES (flaky first)")
+    print(f"{'test_id':<30} {'runs':>5} {'pass rate':>9} {'flips':>5}  status")
+    for test_id, runs, pass_rate, flips, classifications in history.query(FLAKINESS_QUERY, args.last, args.reviewer):
+        status = "flaky" if 0 < pass_rate < 1 else "passing" if pass_rate == 1 else "failing"
+        print(f"{test_id:<30} {runs:>5} {pass_rate:>9.0%} {flips:>5}  {status}")
+
+    latency = history.query(LATENCY_QUERY, args.last, args.reviewer)
+    print("\nREVIEWER LATENCY (seconds, cache hits excluded)")
+    if not latency:
+        print("No timed, uncached cases in these runs")
+    else:
+        print(f"{'test_id':<30} {'n':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+        for test_id, n, p50, p90, p99, max_d in latency:
+            print(f"{test_id:<30} {n:>5} {p50:>8.1f} {p90:>8.1f} {p99:>8.1f} {max_d:>8.1f}")
+    history.close()
+    return 0
@@ -0,0 +1,36 @@
+"""
+markdown_check.py against markdownlint's documented examples and the custom rule
+Run with: python -m pytest agents/doc-reviewer/eval
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from markdown_check import DEFAULT_CONFIG, RULES, check, load_config
+
+EXAMPLES = Path(__file__).resolve().parent / "markdownlint-examples.json"
+CASES = json.loads(EXAMPLES.read_text())
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["source"] for case in CASES])
+def test_documented_example(case):
+    got = [[v.line, v.rule] for v in check(case["markdown"], case["config"])]
+    assert got == case["errors"]
+
+
+def test_every_rule_has_a_failing_example():
+    covered = {rule for case in CASES for _, rule in case["errors"]}
+    assert covered == set(RULES)
+
+
+def test_inline_disable_applies_to_custom_rule():
+    config = load_config(DEFAULT_CONFIG)
+    document = ("# Report\n\n## 🎯 ACTION ITEMS\n\n**Immediate Actions Required:**\n\n"
+                "**Recommended Improvements:**\n\n"
+                "<!-- markdownlint-disable-next-line action-items-structure -->\n**Other Notes:**\n")
+    assert [v.rule for v in check(document, config) if v.rule == "action-items-structure"] == []
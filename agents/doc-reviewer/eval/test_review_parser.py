@@ -0,0 +1,82 @@
+"""
+Golden tests for review_parser.py against the example review and the legacy scan
+Run with: python -m pytest agents/doc-reviewer/eval
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark import EXAMPLE_REVIEW, legacy_extract, synthetic_review
+from review_parser import parse_review
+
+# Expected parse of EXAMPLE_REVIEW: (id, severity, title, file, line_start, line_end)
+GOLDEN_FINDINGS = [
+    ("W1", "warning", "Loss of Evaluation Framework Details", ".claude/agents/doc-pr-evaluator.md", 9, 25),
+    ("S1", "suggestion", "Template Reference Could Be More Explicit", ".claude/agents/doc-pr-evaluator.md", 9, 9),
+    ("S2", "suggestion", "Missing Integration Instructions", ".claude/agents/doc-pr-evaluator.md", 15, 18),
+]
+GOLDEN_ACTION_ITEMS = [("recommended", ".claude/agents/doc-pr-evaluator.md", 11, 12),
+                       ("recommended", ".claude/agents/doc-pr-evaluator.md", 9, 9)]
+
+
+@pytest.fixture(scope="module")
+def example_text():
+    return EXAMPLE_REVIEW.read_text()
+
+
+@pytest.fixture(scope="module")
+def example_review(example_text):
+    return parse_review(example_text)
+
+
+@pytest.fixture(scope="module", params=[1, 10, 100])
+def synthetic(request):
+    """(findings per severity, template-shaped review text)"""
+    return request.param, synthetic_review(request.param)
+
+
+def test_example_findings(example_review):
+    got = [(f.id, f.severity, f.title, f.file, f.line_start, f.line_end) for f in example_review.findings]
+    assert got == GOLDEN_FINDINGS
+
+
+def test_example_action_items(example_review):
+    got = [(a.priority, a.file, a.line_start, a.line_end) for a in example_review.action_items]
+    assert got == GOLDEN_ACTION_ITEMS
+
+
+def test_example_fields(example_review):
+    warning = example_review.findings[0]
+    assert (warning.rationale or "").startswith("Agent users may lack")
+    # Code blocks inside a field are kept verbatim
+    assert warning.fields.get("SUGGESTED FIX", "").startswith("```markdown")
+
+
+def test_example_summary(example_review):
+    assert example_review.summary.get("Severity Distribution") == "Critical: 0 | Warning: 1 | Suggestion: 2"
+
+
+def test_example_counts_match_legacy_scan(example_text, example_review):
+    legacy = {key: len(items) for key, items in legacy_extract(example_text).items()}
+    parsed = {key: len(items) for key, items in example_review.by_severity().items()}
+    assert parsed == legacy
+
+
+def test_synthetic_counts_match_legacy_scan(synthetic):
+    count, text = synthetic
+    review = parse_review(text)
+    assert len(review.findings) == 3 * count
+    legacy = {key: len(items) for key, items in legacy_extract(text).items()}
+    parsed = {key: len(items) for key, items in review.by_severity().items()}
+    assert parsed == legacy == {"critical": count, "warnings": count, "suggestions": count}
+
+
+def test_synthetic_locations(synthetic):
+    count, text = synthetic
+    review = parse_review(text)
+    assert [(f.file, f.line_start, f.line_end) for f in review.findings[:count]] == [
+        (f"docs/page_{n}.md", n, n + 5) for n in range(1, count + 1)]
@@ -0,0 +1,97 @@
+"""
+Lightweight span timing for the evaluator.
+Spans are recorded per thread, summed into per-test-case stage timings and
+can be exported as a Chrome trace-event file (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class Span:
+    __slots__ = ("name", "args", "start", "duration", "thread")
+
+    def __init__(self, name: str, args: Dict):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = threading.current_thread().name
+
+
+class Tracer:
+    """Thread-safe recorder of named spans
+
+    span() times a block. collect() gathers the durations of every span
+    finished on the current thread while it is active, keyed by span name,
+    which is how run_test_case builds its per-stage timings.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        span = Span(name, args)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            timings = getattr(self._local, 'timings', None)
+            if timings is not None:
+                timings[name] = round(timings.get(name, 0.0) + span.duration, 6)
+            with self._lock:
+                self.spans.append(span)
+
+    @contextmanager
+    def collect(self):
+        """Yield a dict filled with {span name: seconds} for spans on this thread"""
+        previous = getattr(self._local, 'timings', None)
+        self._local.timings = timings = {}
+        try:
+            yield timings
+        finally:
+            self._local.timings = previous
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per span name: count, total, mean and max seconds"""
+        with self._lock:
+            spans = list(self.spans)
+        stages: Dict[str, Dict] = {}
+        for span in spans:
+            stage = stages.setdefault(span.name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            stage['count'] += 1
+            stage['total_seconds'] += span.duration
+            stage['max_seconds'] = max(stage['max_seconds'], span.duration)
+        for stage in stages.values():
+            stage['mean_seconds'] = round(stage['total_seconds'] / stage['count'], 6)
+            stage['total_seconds'] = round(stage['total_seconds'], 6)
+            stage['max_seconds'] = round(stage['max_seconds'], 6)
+        return stages
+
+    def write_chrome_trace(self, path: str, process_name: Optional[str] = None):
+        """Write complete ("X") trace events, one track per worker thread"""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        tids: Dict[str, int] = {}
+        events = []
+        for span in sorted(spans, key=lambda s: s.start):
+            tid = tids.setdefault(span.thread, len(tids) + 1)
+            events.append({'name': span.name, 'cat': 'eval', 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': round((span.start - self.origin) * 1e6, 1),
+                           'dur': round(span.duration * 1e6, 1), 'args': span.args})
+        if process_name:
+            events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': process_name}})
+        for thread, tid in tids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread}})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,81 @@
+"""
+Statistics for repeated-trial evaluation runs.
+Reviewer output is nondeterministic, so each case is run several times and
+judged by its pass rate; these helpers put confidence intervals on that.
+"""
+
+import math
+import random
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+
+def z_score(confidence: float) -> float:
+    """Two-sided normal quantile, e.g. 1.96 for 0.95"""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(passes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a pass rate (well behaved at 0/n and n/n)"""
+    if trials == 0:
+        return 0.0, 1.0
+    z = z_score(confidence)
+    p = passes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def is_settled(passes: int, trials: int, confidence: float = 0.95) -> bool:
+    """Whether the case's majority outcome is known: its interval excludes a 50% pass rate"""
+    low, high = wilson_interval(passes, trials, confidence)
+    return low > 0.5 or high < 0.5
+
+
+def fractional_metrics(cases: List[Tuple[bool, float]]) -> Dict[str, float]:
+    """Accuracy/precision/recall/F1 with each case counted once, weighted by its pass rate
+
+    cases holds (expected_semantic_loss, pass_rate) per test case: a case with
+    expected loss contributes pass_rate true positives and 1 - pass_rate false
+    negatives, a case without contributes true/false negatives likewise.
+    With one trial per case this is the usual confusion-matrix calculation.
+    """
+    tp = sum(rate for loss, rate in cases if loss)
+    fn = sum(1 - rate for loss, rate in cases if loss)
+    tn = sum(rate for loss, rate in cases if not loss)
+    fp = sum(1 - rate for loss, rate in cases if not loss)
+    total = len(cases)
+    precision = tp / (tp + fp) if (tp + fp) > 0 else 0
+    recall = tp / (tp + fn) if (tp + fn) > 0 else 0
+    return {
+        'accuracy': (tp + tn) / total if total else 0,
+        'precision': precision,
+        'recall': recall,
+        'f1_score': 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0,
+    }
+
+
+def bootstrap_intervals(case_outcomes: List[Tuple[bool, List[bool]]], confidence: float = 0.95,
+                        iterations: int = 2000, seed: Optional[int] = 0) -> Dict[str, Tuple[float, float]]:
+    """Percentile bootstrap intervals on the fractional metrics
+
+    case_outcomes holds (expected_semantic_loss, [success per trial]) per test
+    case. Trials are resampled within each case, so the intervals reflect
+    reviewer nondeterminism on this fixed suite, not sampling of test cases.
+    """
+    rng = random.Random(seed)
+    samples: Dict[str, List[float]] = {'accuracy': [], 'precision': [], 'recall': [], 'f1_score': []}
+    for _ in range(iterations):
+        resampled = []
+        for loss, outcomes in case_outcomes:
+            n = len(outcomes)
+            resampled.append((loss, sum(outcomes[rng.randrange(n)] for _ in range(n)) / n))
+        for name, value in fractional_metrics(resampled).items():
+            samples[name].append(value)
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for name, values in samples.items():
+        values.sort()
+        intervals[name] = (values[int(alpha * (iterations - 1))], values[int(math.ceil((1 - alpha) * (iterations - 1)))])
+    return intervals
@@ -0,0 +1,757 @@
+#!/usr/bin/env python3
+"""
+Fast in-process markdown checker for doc-reviewer reports.
+Implements the custom action-items-structure rule (line for line as
+rules/action-items-structure.js) and the markdownlint core rules listed in
+RULES, configured from markdownlint.jsonc, without starting Node. Output
+follows markdownlint-cli2's "file:line rule detail" format.
+
+Only rules that reproduce every example in markdownlint's own documentation
+(docs/markdownlint/Rules.md, recorded with the expected errors in
+eval/markdownlint-examples.json) are included; the other core rules are left
+to markdownlint-cli2, which remains the final check. Rule options beyond
+those the examples and markdownlint.jsonc set are untested.
+
+Inline configuration comments (<!-- markdownlint-disable MD013 -->, -enable,
+-disable-line, -disable-next-line, -capture, -restore, -disable-file,
+-enable-file and -configure-file) are honored when each sits on one line;
+rule tags in them are not recognized.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set
+
+DEFAULT_CONFIG = Path(__file__).resolve().parent / "markdownlint.jsonc"
+
+# id: (aliases, description) of the rules checked here
+RULES = {
+    "MD001": (["heading-increment"], "Heading levels should only increment by one level at a time"),
+    "MD003": (["heading-style"], "Heading style"),
+    "MD004": (["ul-style"], "Unordered list style"),
+    "MD005": (["list-indent"], "Inconsistent indentation for list items at the same level"),
+    "MD007": (["ul-indent"], "Unordered list indentation"),
+    "MD009": (["no-trailing-spaces"], "Trailing spaces"),
+    "MD010": (["no-hard-tabs"], "Hard tabs"),
+    "MD012": (["no-multiple-blanks"], "Multiple consecutive blank lines"),
+    "MD013": (["line-length"], "Line length"),
+    "MD018": (["no-missing-space-atx"], "No space after hash on atx style heading"),
+    "MD019": (["no-multiple-space-atx"], "Multiple spaces after hash on atx style heading"),
+    "MD020": (["no-missing-space-closed-atx"], "No space inside hashes on closed atx style heading"),
+    "MD021": (["no-multiple-space-closed-atx"], "Multiple spaces inside hashes on closed atx style heading"),
+    "MD022": (["blanks-around-headings"], "Headings should be surrounded by blank lines"),
+    "MD023": (["heading-start-left"], "Headings must start at the beginning of the line"),
+    "MD024": (["no-duplicate-heading"], "Multiple headings with the same content"),
+    "MD025": (["single-title", "single-h1"], "Multiple top-level headings in the same document"),
+    "MD026": (["no-trailing-punctuation"], "Trailing punctuation in heading"),
+    "MD027": (["no-multiple-space-blockquote"], "Multiple spaces after blockquote symbol"),
+    "MD028": (["no-blanks-blockquote"], "Blank line inside blockquote"),
+    "MD030": (["list-marker-space"], "Spaces after list markers"),
+    "MD031": (["blanks-around-fences"], "Fenced code blocks should be surrounded by blank lines"),
+    "MD032": (["blanks-around-lists"], "Lists should be surrounded by blank lines"),
+    "MD033": (["no-inline-html"], "Inline HTML"),
+    "MD035": (["hr-style"], "Horizontal rule style"),
+    "MD036": (["no-emphasis-as-heading"], "Emphasis used instead of a heading"),
+    "MD037": (["no-space-in-emphasis"], "Spaces inside emphasis markers"),
+    "MD038": (["no-space-in-code"], "Spaces inside code span elements"),
+    "MD039": (["no-space-in-links"], "Spaces inside link text"),
+    "MD040": (["fenced-code-language"], "Fenced code blocks should have a language specified"),
+    "MD041": (["first-line-heading", "first-line-h1"], "First line in a file should be a top-level heading"),
+    "MD042": (["no-empty-links"], "No empty links"),
+    "MD043": (["required-headings"], "Required heading structure"),
+    "MD046": (["code-block-style"], "Code block style"),
+    "MD047": (["single-trailing-newline"], "Files should end with a single newline character"),
+    "MD048": (["code-fence-style"], "Code fence style"),
+    "MD049": (["emphasis-style"], "Emphasis style"),
+    "MD050": (["strong-style"], "Strong style"),
+    "action-items-structure": (["AIS"], "ACTION ITEMS section must only contain allowed subsections"),
+}
+
+# Upper-cased rule id or alias → rule id, for names in inline configuration comments
+RULE_NAMES = {name.upper(): rule for rule, (aliases, _) in RULES.items() for name in [rule] + aliases}
+
+ACTION_ITEMS_HEADING = "## 🎯 ACTION ITEMS"
+ACTION_SUBSECTIONS = ("**Immediate Actions Required:**", "**Recommended Improvements:**")
+ACTION_SUBSECTION = re.compile(r"^\*\*[^*]+:\*\*$")
+
+FENCE = re.compile(r"^( {0,3})(`{3,}|~{3,})(.*)$")
+ATX = re.compile(r"^( *)(#{1,6})([ \t]+|$)(.*?)(?:[ \t]+#+)?[ \t]*$")
+ATX_NO_SPACE = re.compile(r"^#+[^# \t]")
+ATX_MULTI_SPACE = re.compile(r"^#{1,6}[ \t]{2,}\S")
+# Closed ATX heading: hashes, spaces, content, spaces, hashes (as markdownlint's MD020 matches it)
+ATX_CLOSED = re.compile(r"^(#+)([ \t]*)([^# \t\\]|[^# \t][^#]*?[^# \t\\])([ \t]*)((?:\\#)?)(#+)(\s*)$")
+SETEXT = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+HR = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+LIST_ITEM = re.compile(r"^( *)([-*+]|\d{1,9}[.)])([ \t]+|$)(.*)$")
+BLOCKQUOTE = re.compile(r"^ {0,3}>")
+TABLE_DELIMITER = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+REFERENCE_DEFINITION = re.compile(r"^ {0,3}\[([^\]]+)\]:\s*\S")
+CODE_SPAN = re.compile(r"(`+)(.+?)(?<!`)\1(?!`)")
+INLINE_HTML = re.compile(r"(?<!\\)<([A-Za-z][A-Za-z0-9-]*)(?=[\s/>])")
+BARE_URL = re.compile(r"(?<![(<\[\"'=/\w])(https?|ftp)://[^\s<>)\]]+")
+SPACE_IN_LINK = re.compile(r"(?<![!\\])\[(\s+[^\]]*?|[^\]]*?\S\s+)\]\(")
+EMPTY_LINK = re.compile(r"(?<!!)\[[^\]]+\]\((#?)\)")
+LINK_ONLY = re.compile(r"^\s*(?:[-*+]\s+|\d+[.)]\s+)?[*_]*!?\[[^\]]*\]\([^)]*\)[*_]*\s*$")
+# Emphasis that parses as such (markers hug the text; underscores not intraword)
+EMPHASIS = re.compile(r"(?<![*\\])(\*{1,3})(?![\s*]).*?[^\s*\\]\1(?!\*)"
+                      r"|(?<![\w\\_])(_{1,3})(?![\s_]).*?[^\s_\\]\2(?![\w_])")
+EMPHASIS_MARKER = re.compile(r"(?<![\\*_])(\*{1,3}|_{1,3})(?![*_])")
+AUTOLINK = re.compile(r"<(?:https?|ftp|mailto):[^<>\s]+>")
+LINK_DESTINATION = re.compile(r"\]\([^)]*\)")
+# <!-- markdownlint-<action> [rules] --> on one line; configure-file may span lines
+INLINE_CONFIG = re.compile(r"<!--\s*markdownlint-(disable-next-line|disable-line|disable-file|enable-file|"
+                           r"disable|enable|capture|restore)(?=\s|-->)(.*?)-->", re.IGNORECASE)
+CONFIGURE_FILE = re.compile(r"<!--\s*markdownlint-configure-file(?=\s|-->)(.*?)-->", re.IGNORECASE | re.DOTALL)
+HTML_H1 = re.compile(r"^\s*<h1[\s>]", re.IGNORECASE)
+EMPHASIS_LINE = re.compile(r"^(\*\*|__|\*|_)(?!\s)(.+?)(?<!\s)\1$")
+HEADING_PUNCTUATION = ".,;:!。，；：！"
+EMPHASIS_PUNCTUATION = ".,;:!?。，；：！？"
+
+
+class Violation(NamedTuple):
+    line: int
+    rule: str
+    detail: Optional[str] = None
+    context: Optional[str] = None
+
+    def format(self, path: str) -> str:
+        aliases, description = RULES[self.rule]
+        text = f"{path}:{self.line} {'/'.join([self.rule] + aliases)} {description}"
+        if self.detail:
+            text += f" [{self.detail}]"
+        if self.context:
+            text += f' [Context: "{self.context}"]'
+        return text
+
+
+def strip_jsonc(text: str) -> str:
+    """Remove // and /* */ comments outside strings"""
+    out = []
+    i, n = 0, len(text)
+    in_string = False
+    while i < n:
+        c = text[i]
+        if in_string:
+            out.append(c)
+            if c == "\\":
+                out.append(text[i + 1:i + 2])
+                i += 1
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+            out.append(c)
+        elif text.startswith("//", i):
+            while i < n and text[i] != "\n":
+                i += 1
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def load_config(path: Path) -> Dict:
+    return json.loads(strip_jsonc(path.read_text()))
+
+
+def rule_option(config: Dict, rule: str):
+    """The config value for a rule (by id or alias), else the default"""
+    for key in [rule] + RULES[rule][0]:
+        if key in config:
+            return config[key]
+    return config.get("default", True)
+
+
+def configure_file(document: str, config: Dict) -> Dict:
+    """config with any <!-- markdownlint-configure-file {...} --> settings merged over it"""
+    for match in CONFIGURE_FILE.finditer(document):
+        try:
+            settings = json.loads(strip_jsonc(match.group(1)))
+        except ValueError:
+            continue
+        if isinstance(settings, dict):
+            config = dict(config, **settings)
+    return config
+
+
+def utf16_length(text: str) -> int:
+    """String length as JavaScript counts it, so limits match markdownlint"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def mask_code_spans(line: str) -> str:
+    """Blank out code span contents (keeping columns) so inline rules skip them"""
+    return CODE_SPAN.sub(lambda m: m.group(1) + " " * len(m.group(2)) + m.group(1), line)
+
+
+def blank(pattern, text: str) -> str:
+    """text with every match of pattern replaced by as many spaces"""
+    return pattern.sub(lambda m: " " * len(m.group(0)), text)
+
+
+def spaced_emphasis(text: str) -> List[str]:
+    """Emphasis markers around text that starts or ends with a space (MD037)
+
+    Markers left over once real emphasis is removed are paired in order, like
+    markdownlint pairs the markers it finds in plain text.
+    """
+    def hide_markers(match):
+        size = len(match.group(1) or match.group(2))
+        return " " * size + match.group(0)[size:-size] + " " * size
+
+    plain = EMPHASIS.sub(hide_markers, text)
+    found = []
+    opened = {}
+    for match in EMPHASIS_MARKER.finditer(plain):
+        start = opened.pop(match.group(1), None)
+        if start is None:
+            opened[match.group(1)] = match
+            continue
+        content = plain[start.end():match.start()]
+        if content.strip() and (content[0].isspace() or content[-1].isspace()):
+            found.append(text[start.start():match.end()])
+    return found
+
+
+class Line:
+    __slots__ = ("text", "kind", "level", "heading", "style", "fence", "item", "table")
+
+    def __init__(self, text):
+        self.text = text
+        self.kind = "text"      # blank, fence, code, heading, hr, item, table, quote, comment, front_matter, text
+        self.level = 0          # heading level
+        self.heading = None     # heading text
+        self.style = None       # heading style (atx, atx_closed, setext) or fence marker
+        self.fence = None       # opening fence info for fence lines
+        self.item = None        # list item match
+        self.table = False
+
+
+def tokenize(lines: List[str]) -> List[Line]:
+    """Classify every line in one pass: fences, headings, lists, tables, paragraphs"""
+    tokens = [Line(text) for text in lines]
+    start = 0
+    if lines and lines[0].rstrip() == "---":
+        end = next((j for j in range(1, len(lines)) if lines[j].rstrip() in ("---", "...")), None)
+        if end is not None:
+            for token in tokens[:end + 1]:
+                token.kind = "front_matter"
+            start = end + 1
+    fence = None
+    comment = False
+    for i, token in enumerate(tokens[start:], start):
+        text = token.text
+        if comment or text.lstrip().startswith("<!--"):
+            token.kind = "comment"
+            comment = "-->" not in text
+            continue
+        if fence is not None:
+            match = FENCE.match(text)
+            if match and match.group(2)[0] == fence[0] and len(match.group(2)) >= len(fence) \
+                    and not match.group(3).strip():
+                token.kind, fence = "fence", None
+            else:
+                token.kind = "code"
+            continue
+        if not text.strip():
+            token.kind = "blank"
+            continue
+        match = FENCE.match(text)
+        if match and not (match.group(2)[0] == "`" and "`" in match.group(3)):
+            token.kind, token.style, token.fence = "fence", match.group(2), match.group(3).strip()
+            fence = match.group(2)
+            continue
+        previous = tokens[i - 1] if i else None
+        if SETEXT.match(text) and previous is not None and previous.kind == "text" and not previous.table:
+            previous.kind, previous.style = "heading", "setext"
+            previous.level = 1 if text.strip()[0] == "=" else 2
+            previous.heading = previous.text.strip()
+            token.kind = "setext_underline"
+            continue
+        if HR.match(text):
+            token.kind = "hr"
+            continue
+        match = ATX.match(text)
+        if match and len(match.group(1)) <= 3:
+            token.kind, token.level = "heading", len(match.group(2))
+            token.heading = match.group(4).strip()
+            token.style = "atx_closed" if token.heading and re.search(r"\s#+\s*$", text) else "atx"
+            continue
+        if BLOCKQUOTE.match(text):
+            token.kind = "quote"
+            continue
+        match = LIST_ITEM.match(text)
+        if match and (match.group(3) or not match.group(4)):
+            token.kind, token.item = "item", match
+            continue
+        if "|" in text and i + 1 < len(tokens) and TABLE_DELIMITER.match(tokens[i + 1].text) \
+                and "-" in tokens[i + 1].text:
+            token.kind, token.table = "table", True
+            continue
+        if "|" in text and previous is not None and previous.table:
+            token.kind, token.table = "table", True
+    return tokens
+
+
+def inline_rule_states(tokens: List[Line], on: Set[str]) -> Optional[List[FrozenSet[str]]]:
+    """Rules enabled on each line once inline configuration comments are applied, or
+    None when the document has none (as markdownlint applies them: -file actions to
+    the whole document first, then the rest line by line, -line and -next-line last)"""
+    commands = []
+    for i, token in enumerate(tokens):
+        if token.kind not in ("code", "fence", "front_matter") and "markdownlint-" in token.text:
+            for match in INLINE_CONFIG.finditer(mask_code_spans(token.text)):
+                names = match.group(2).split()
+                rules = {RULE_NAMES[name.upper()] for name in names if name.upper() in RULE_NAMES} \
+                    if names else set(RULES)
+                commands.append((i, match.group(1).lower(), rules))
+    if not commands:
+        return None
+
+    state = set(on)
+    for _, action, rules in commands:
+        if action == "disable-file":
+            state -= rules
+        elif action == "enable-file":
+            state |= rules
+    captured = current = frozenset(state)
+    states = []
+    pending = iter(commands)
+    command = next(pending, None)
+    for i in range(len(tokens)):
+        while command is not None and command[0] == i:
+            action, rules = command[1], command[2]
+            if action == "disable":
+                current = current - rules
+            elif action == "enable":
+                current = current | rules
+            elif action == "capture":
+                captured = current
+            elif action == "restore":
+                current = captured
+            command = next(pending, None)
+        states.append(current)
+    for i, action, rules in commands:
+        if action == "disable-line":
+            states[i] = states[i] - rules
+        elif action == "disable-next-line" and i + 1 < len(states):
+            states[i + 1] = states[i + 1] - rules
+    return states
+
+
+def action_items_errors(lines: List[str], first: int = 0) -> List[Violation]:
+    """action-items-structure, line for line as rules/action-items-structure.js: raw
+    lines from first on, code blocks included, stopping at the section's end"""
+    errors = []
+    in_section = found_immediate = found_recommended = False
+    for i in range(first, len(lines)):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped == ACTION_ITEMS_HEADING:
+            in_section = True
+            continue
+        if in_section and re.match(r"^##\s", line):
+            break
+        if not in_section:
+            continue
+        if stripped == ACTION_SUBSECTIONS[0]:
+            found_immediate = True
+        elif stripped == ACTION_SUBSECTIONS[1]:
+            found_recommended = True
+        elif ACTION_SUBSECTION.match(line) and found_immediate and found_recommended:
+            errors.append(Violation(i + 1, "action-items-structure",
+                                    "ACTION ITEMS section should only contain 'Immediate Actions Required' and "
+                                    "'Recommended Improvements' subsections", stripped))
+    return errors
+
+
+def check(document: str, config: Dict) -> List[Violation]:
+    """Lint one markdown document, returning violations sorted by line"""
+    lines = document.replace("\r\n", "\n").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    tokens = tokenize(lines)
+    config = configure_file(document, config)
+    enabled = {rule: rule_option(config, rule) for rule in RULES}
+    on = {rule for rule, option in enabled.items() if option}
+    options = {rule: option if isinstance(option, dict) else {} for rule, option in enabled.items()}
+    allowed_html = {name.lower() for name in options["MD033"].get("allowed_elements", [])}
+    errors: List[Violation] = []
+
+    # Every rule is checked: inline comments can enable rules the config turns off
+    def report(line, rule, detail=None, context=None):
+        errors.append(Violation(line, rule, detail, context))
+
+    md013 = options["MD013"]
+    line_length = md013.get("line_length", 80)
+    heading_length = md013.get("heading_line_length", line_length)
+    code_length = md013.get("code_block_line_length", line_length)
+    check_tables = md013.get("tables", True)
+    check_code = md013.get("code_blocks", True)
+    check_headings = md013.get("headings", True)
+
+    headings = []
+    heading_style = ul_marker = hr_style = fence_style = emphasis_style = strong_style = None
+    code_style = options["MD046"].get("style", "consistent")
+    code_style = None if code_style == "consistent" else code_style
+    seen_headings = set()
+    blank_run = 0
+    lists = []          # stack of (indent, content_offset, ordered, [items]) for open lists
+    list_start = None   # line index where the current top-level list started
+    in_indented_code = False
+
+    def close_lists(i):
+        """End every open list before line i (checking ol-prefix and trailing blank)"""
+        nonlocal lists, list_start
+        for _, _, ordered, items in lists:
+            end_list(ordered, items)
+        if list_start is not None:
+            last = i - 1
+            while last > list_start and tokens[last].kind == "blank":
+                last -= 1
+            if last + 1 < len(tokens) and tokens[last + 1].kind != "blank":
+                report(last + 1, "MD032", context=tokens[last].text.strip()[:80])
+        lists, list_start = [], None
+
+    def end_list(ordered, items):
+        if ordered:
+            check_ordered_indent(items)
+
+    def check_ordered_indent(items):
+        """MD005 for an ordered list: items start in the same column, or once one does not,
+        their markers end in the same column (right-aligned numbers)"""
+        expected_indent = len(items[0][1].group(1))
+        expected_end = expected_indent + len(items[0][1].group(2))
+        end_matching = False
+        for line_index, match in items:
+            indent = len(match.group(1))
+            end = indent + len(match.group(2))
+            if indent != expected_indent or end_matching:
+                if end == expected_end:
+                    end_matching = True
+                elif end_matching:
+                    report(line_index + 1, "MD005", f"Expected: ({expected_end}); Actual: ({end})")
+                else:
+                    report(line_index + 1, "MD005", f"Expected: {expected_indent}; Actual: {indent}")
+
+    def check_code_style(lineno, style):
+        nonlocal code_style
+        code_style = code_style or style
+        if style != code_style:
+            report(lineno, "MD046", f"Expected: {code_style}; Actual: {style}")
+
+    for i, token in enumerate(tokens):
+        text = token.text
+        lineno = i + 1
+        kind = token.kind
+        if kind == "front_matter":
+            continue
+
+        # Indented code: four columns past any open list item's content, where it does not
+        # continue a paragraph (it can't interrupt one)
+        if kind != "blank":
+            indented = False
+            if kind in ("text", "item", "table") and text[:1] in (" ", "\t") and \
+                    (i == 0 or tokens[i - 1].kind not in ("text", "item", "table", "quote")):
+                expanded = text.expandtabs(4)
+                columns = len(expanded) - len(expanded.lstrip(" "))
+                indented = columns - max((offset for _, offset, _, _ in lists if offset <= columns), default=0) >= 4
+            if indented:
+                if not in_indented_code:
+                    check_code_style(lineno, "indented")
+                token.kind = kind = "code"
+            in_indented_code = indented
+
+        # Line-level rules
+        if "\t" in text:
+            report(lineno, "MD010", f"Column: {text.index(chr(9)) + 1}")
+        if kind != "code" and text.endswith(" "):
+            # Exactly two trailing spaces are a hard line break, but not on an empty line
+            trailing = len(text) - len(text.rstrip(" "))
+            if trailing != 2 or not text.strip():
+                report(lineno, "MD009", f"Expected: 0 or 2; Actual: {trailing}")
+        limit = (heading_length if kind == "heading" else code_length if kind in ("code", "fence")
+                 else line_length)
+        if utf16_length(text) > limit and not (token.table and not check_tables) \
+                and not (kind in ("code", "fence") and not check_code) \
+                and not (kind == "heading" and not check_headings):
+            # As in markdownlint's non-strict mode, only flag if there is whitespace beyond the limit
+            beyond = text.encode("utf-16-le")[limit * 2:].decode("utf-16-le", errors="ignore")
+            if re.search(r"\s", beyond) and not REFERENCE_DEFINITION.match(text) and not LINK_ONLY.match(text):
+                report(lineno, "MD013", f"Expected: {limit}; Actual: {utf16_length(text)}")
+
+        if kind == "blank":
+            blank_run += 1
+            if blank_run > 1:
+                report(lineno, "MD012", f"Expected: 1; Actual: {blank_run}")
+            if i and tokens[i - 1].kind == "quote":
+                nxt = next((t for t in tokens[i + 1:] if t.kind != "blank"), None)
+                if nxt is not None and nxt.kind == "quote":
+                    report(lineno, "MD028")
+            continue
+        blank_run = 0
+
+        if kind == "code":
+            continue
+        if kind == "comment":
+            continue
+
+        # Lists: open/continue/close
+        if kind == "item":
+            match = token.item
+            indent = len(match.group(1))
+            marker = match.group(2)
+            ordered = marker[0].isdigit()
+            if list_start is None:
+                list_start = i
+                if i and tokens[i - 1].kind != "blank":
+                    report(lineno, "MD032", context=text.strip()[:80])
+            # An item ends the nested lists whose parent item's content it does not start in
+            while len(lists) > 1 and indent < lists[-2][1]:
+                _, _, was_ordered, items = lists.pop()
+                end_list(was_ordered, items)
+            if lists and indent >= lists[-1][1]:
+                lists.append((indent, indent + len(marker) + len(match.group(3) or " "), ordered, []))
+            elif not lists:
+                lists.append((indent, indent + len(marker) + len(match.group(3) or " "), ordered, []))
+            elif lists[-1][2] != ordered:
+                _, _, was_ordered, items = lists.pop()
+                end_list(was_ordered, items)
+                lists.append((indent, indent + len(marker) + len(match.group(3) or " "), ordered, []))
+            elif indent != lists[-1][0] and not ordered:
+                report(lineno, "MD005", f"Expected: {lists[-1][0]}; Actual: {indent}")
+            lists[-1][3].append((i, match))
+            if not ordered:
+                ul_marker = ul_marker or marker
+                if marker != ul_marker:
+                    report(lineno, "MD004", f"Expected: {'dash' if ul_marker == '-' else 'asterisk' if ul_marker == '*' else 'plus'}; "
+                           f"Actual: {'dash' if marker == '-' else 'asterisk' if marker == '*' else 'plus'}")
+                if all(not level[2] for level in lists):
+                    expected_indent = 2 * (len(lists) - 1)
+                    if indent != expected_indent:
+                        report(lineno, "MD007", f"Expected: {expected_indent}; Actual: {indent}")
+            spaces = match.group(3)
+            if match.group(4) and spaces and len(spaces.expandtabs(4)) != 1 and len(spaces) < 5:
+                report(lineno, "MD030", f"Expected: 1; Actual: {len(spaces)}")
+        elif lists:
+            # After a blank line, only indented content continues a list; without one,
+            # paragraph text is a lazy continuation but other blocks interrupt it
+            indent = len(text) - len(text.lstrip(" "))
+            if indent < lists[0][1] and (tokens[i - 1].kind == "blank" or kind != "text"):
+                close_lists(i)
+
+        if kind == "fence":
+            if token.fence is not None:
+                # Opening fence
+                check_code_style(lineno, "fenced")
+                fence_style = fence_style or token.style[0]
+                if token.style[0] != fence_style:
+                    report(lineno, "MD048", f"Expected: {'backtick' if fence_style == '`' else 'tilde'}; "
+                           f"Actual: {'backtick' if token.style[0] == '`' else 'tilde'}")
+                if not token.fence:
+                    report(lineno, "MD040", context=text.strip())
+                if i and tokens[i - 1].kind != "blank":
+                    report(lineno, "MD031", context=text.strip())
+            else:
+                # Closing fence
+                if i + 1 < len(tokens) and tokens[i + 1].kind != "blank":
+                    report(lineno, "MD031", context=text.strip())
+            continue
+
+        if kind == "setext_underline":
+            continue
+
+        if kind == "hr":
+            hr_style = hr_style or text.strip()
+            if text.strip() != hr_style:
+                report(lineno, "MD035", f"Expected: {hr_style}; Actual: {text.strip()}")
+            continue
+
+        if text.startswith("#"):
+            closed = ATX_CLOSED.match(text)
+            if closed and (not closed.group(2) or not closed.group(4) or closed.group(5)):
+                report(lineno, "MD020", context=text.strip())
+
+        if kind == "heading":
+            level, title = token.level, token.heading
+            style = token.style
+            heading_style = heading_style or style
+            if style != heading_style:
+                report(lineno, "MD003", f"Expected: {heading_style}; Actual: {style}")
+            if headings and level > headings[-1][1] + 1:
+                report(lineno, "MD001", f"Expected: h{headings[-1][1] + 1}; Actual: h{level}")
+            if style != "setext":
+                if text.startswith(" "):
+                    report(lineno, "MD023", context=text.strip())
+                if style == "atx" and ATX_MULTI_SPACE.match(text.lstrip()):
+                    report(lineno, "MD019", context=text.strip())
+                closed = ATX_CLOSED.match(text.lstrip()) if style == "atx_closed" else None
+                if closed and (len(closed.group(2)) > 1 or len(closed.group(4)) > 1):
+                    report(lineno, "MD021", context=text.strip())
+                above = i - 1
+            else:
+                above = i - 1
+            below = i + 2 if style == "setext" else i + 1
+            if above >= 0 and tokens[above].kind != "blank":
+                report(lineno, "MD022", "Expected: 1; Actual: 0; Above", text.strip())
+            if below < len(tokens) and tokens[below].kind != "blank":
+                report(lineno, "MD022", "Expected: 1; Actual: 0; Below", text.strip())
+            if title in seen_headings:
+                report(lineno, "MD024", context=title)
+            seen_headings.add(title)
+            if title and title[-1] in HEADING_PUNCTUATION:
+                report(lineno, "MD026", f"Punctuation: '{title[-1]}'")
+            if level == 1 and headings and headings[0][1] == 1 and headings[0][0] == 0:
+                report(lineno, "MD025", context=title)
+            headings.append((i, level, title))
+            continue
+
+        if ATX_NO_SPACE.match(text) and not re.search(r"#\s*$", text) and not text.startswith("#\ufe0f\u20e3"):
+            report(lineno, "MD018", context=text.strip())
+
+        if kind == "quote" and re.match(r"^ {0,3}> {2,}\S", text):
+            report(lineno, "MD027")
+
+        # Reference definitions are not inline content
+        if REFERENCE_DEFINITION.match(text):
+            continue
+
+        # Inline rules on text with code spans masked
+        for span in CODE_SPAN.finditer(text):
+            content = span.group(2)
+            # One space on each side is stripped by CommonMark, so it is allowed
+            padded = content.startswith(" ") and content.endswith(" ") and content[1:-1] == content[1:-1].strip()
+            if content.strip() and content != content.strip() and not padded:
+                report(lineno, "MD038", context=span.group(0)[:80])
+        masked = mask_code_spans(text)
+        for match in INLINE_HTML.finditer(masked):
+            if match.group(1).lower() not in allowed_html:
+                report(lineno, "MD033", f"Element: {match.group(1)}")
+        for match in SPACE_IN_LINK.finditer(masked):
+            report(lineno, "MD039", context=match.group(0))
+        for match in EMPTY_LINK.finditer(masked):
+            report(lineno, "MD042", context=match.group(0))
+        if "*" in masked or "_" in masked:
+            # Without the list marker and URLs, whose * and _ are not emphasis
+            content = masked[token.item.start(4):] if kind == "item" else masked
+            for pattern in (BARE_URL, AUTOLINK, LINK_DESTINATION):
+                content = blank(pattern, content)
+            for context in spaced_emphasis(content):
+                report(lineno, "MD037", context=context[:80])
+        for marker in re.findall(r"(?<![*_\w])(\*\*|__)(?=\S)", masked):
+            strong_style = strong_style or marker
+            if marker != strong_style:
+                report(lineno, "MD050", f"Expected: {'asterisk' if strong_style == '**' else 'underscore'}; "
+                       f"Actual: {'asterisk' if marker == '**' else 'underscore'}")
+        for marker in re.findall(r"(?<![*_\w\\])([*_])(?![*_\s])[^*_]+?(?<![\s\\])\1(?![*_\w])", masked):
+            emphasis_style = emphasis_style or marker
+            if marker != emphasis_style:
+                report(lineno, "MD049", f"Expected: {'asterisk' if emphasis_style == '*' else 'underscore'}; "
+                       f"Actual: {'asterisk' if marker == '*' else 'underscore'}")
+
+        # Emphasis used as a heading: a one-line paragraph that is entirely emphasized
+        if kind == "text" and not lists and (i == 0 or tokens[i - 1].kind == "blank") and \
+                (i + 1 == len(tokens) or tokens[i + 1].kind == "blank"):
+            emphasis = EMPHASIS_LINE.match(text.strip())
+            if emphasis and emphasis.group(2)[-1] not in EMPHASIS_PUNCTUATION and "*" not in emphasis.group(2):
+                report(lineno, "MD036", context=emphasis.group(2))
+
+    if lists:
+        close_lists(len(tokens))
+
+    # Document-level rules
+    front_matter = [t.text for t in tokens if t.kind == "front_matter"]
+    titled = any(re.match(r"^\s*title\s*[:=]", line) for line in front_matter)
+    first = next((t for t in tokens if t.kind not in ("blank", "comment", "front_matter")), None)
+    if first is not None and not titled and not (first.kind == "heading" and first.level == 1) \
+            and not HTML_H1.match(first.text):
+        report(tokens.index(first) + 1, "MD041", context=first.text.strip()[:80])
+    if document and not document.endswith("\n"):
+        report(len(lines), "MD047")
+
+    required = options["MD043"].get("headings")
+    if required:
+        match_case = options["MD043"].get("match_case", False)
+        fold = (lambda s: s) if match_case else str.lower
+        index = 0
+        match_any = has_error = any_headings = False
+
+        def expected_heading():
+            nonlocal index
+            value = required[index] if index < len(required) else "[None]"
+            index += 1
+            return value
+
+        for line_index, level, title in headings:
+            if has_error:
+                break
+            actual = "#" * level + " " + title
+            any_headings = True
+            expected = expected_heading()
+            if expected == "*":
+                if fold(expected_heading()) != fold(actual):
+                    match_any = True
+                    index -= 1
+            elif expected == "+":
+                match_any = True
+            elif expected == "?":
+                pass
+            elif fold(expected) == fold(actual):
+                match_any = False
+            elif match_any:
+                index -= 1
+            else:
+                report(line_index + 1, "MD043", f"Expected: {expected}; Actual: {actual}")
+                has_error = True
+        extra = len(required) - index
+        if not has_error and (extra > 1 or (extra == 1 and required[index] != "*")) and \
+                (any_headings or not all(h == "*" for h in required)):
+            report(len(lines), "MD043", f"Expected: {required[index]}", )
+
+    body_start = next((i for i, token in enumerate(tokens) if token.kind != "front_matter"), len(tokens))
+    errors.extend(action_items_errors(lines, body_start))
+
+    states = inline_rule_states(tokens, on)
+    if states is None:
+        errors = [error for error in errors if error.rule in on]
+    else:
+        errors = [error for error in errors if error.rule in states[max(error.line, 1) - 1]]
+    return sorted(errors, key=lambda e: (e.line, e.rule))
+
+
+def check_file(path: Path, config: Dict) -> List[Violation]:
+    return check(path.read_text(encoding="utf-8"), config)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check doc-reviewer reports against markdownlint.jsonc in-process")
+    parser.add_argument("files", nargs="+", help="Markdown files to check")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG),
+                        help="markdownlint config (default: markdownlint.jsonc next to this script)")
+    parser.add_argument("--time", action="store_true", help="Print how long checking took")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    config = load_config(Path(args.config))
+    count = 0
+    for name in args.files:
+        for violation in check_file(Path(name), config):
+            print(violation.format(name), file=sys.stderr)
+            count += 1
+    if args.time:
+        print(f"Checked {len(args.files)} file(s) in {(time.perf_counter() - start) * 1000:.1f}ms")
+    print(f"Summary: {count} error(s)")
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
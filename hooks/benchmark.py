@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the inject-time.py UserPromptSubmit hook.
+Spawns the hook the way Claude Code does (JSON on stdin, context on stdout)
+and reports p50/p99 wall-clock latency per mode: the original full-startup
+script, the client without the daemon (time and branch only), and the client
+answered by the resident daemon. Also times bare requests to the daemon's
+socket. Exits 1 if the client without the daemon is slower than the original
+script at p50 or p99.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+HOOK_SCRIPT = SCRIPT_DIR / "inject-time.py"
+DAEMON_SCRIPT = SCRIPT_DIR / "context-daemon.py"
+
+# inject-time.py before the resident mode: full startup, json.load, time only
+ORIGINAL_HOOK = """\
+import json
+import sys
+import datetime
+
+input_data = json.load(sys.stdin)
+prompt = input_data.get("prompt", "")
+now = datetime.datetime.now()
+context = f"Current time: {now:%H:%M:%S, %A, %B %d, %Y} (Week: Monday-Sunday)"
+print(context)
+sys.exit(0)
+"""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty sorted list"""
+    return values[min(len(values) - 1, len(values) * pct // 100)]
+
+
+def hook_input(cwd):
+    return json.dumps({
+        "session_id": "00000000-0000-4000-8000-000000000000",
+        "transcript_path": "/tmp/transcript.jsonl",
+        "cwd": cwd,
+        "hook_event_name": "UserPromptSubmit",
+        "prompt": "Please review the hook and fix the latency regression",
+    }).encode()
+
+
+def time_runs(command, payload, runs, env):
+    """Sorted wall-clock seconds of runs spawns of command, after a warm-up run"""
+    latencies = []
+    for i in range(runs + 1):
+        start = time.perf_counter()
+        result = subprocess.run(command, input=payload, stdout=subprocess.PIPE, env=env, check=True)
+        elapsed = time.perf_counter() - start
+        if not result.stdout.startswith(b"Current time:"):
+            raise RuntimeError(f"unexpected hook output: {result.stdout[:200]!r}")
+        if i:
+            latencies.append(elapsed)
+    latencies.sort()
+    return latencies
+
+
+def report(label, latencies):
+    """Print p50/p99/mean of latencies and return (p50, p99) in milliseconds"""
+    ms = [value * 1000 for value in latencies]
+    p50, p99 = percentile(ms, 50), percentile(ms, 99)
+    print(f"{label:<24} p50 {p50:6.2f}ms  p99 {p99:6.2f}ms  mean {sum(ms) / len(ms):6.2f}ms")
+    return p50, p99
+
+
+def socket_round_trips(path, cwd, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        sock.sendall(b"context\t" + os.fsencode(cwd) + b"\n")
+        while sock.recv(65536):
+            pass
+        sock.close()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inject-time.py hook latency with and without the daemon")
+    parser.add_argument("--runs", type=int, default=200, help="Hook invocations per mode (default: 200)")
+    parser.add_argument("--cwd", default=str(SCRIPT_DIR.parent),
+                        help="Project directory passed as the hook's cwd (default: this repository)")
+    parser.add_argument("--python", default=sys.executable,
+                        help="Interpreter to spawn; use a real binary, not a version-manager shim (default: this one)")
+    args = parser.parse_args()
+
+    payload = hook_input(os.path.abspath(args.cwd))
+    with tempfile.TemporaryDirectory() as tmp:
+        original = os.path.join(tmp, "inject-time-original.py")
+        with open(original, "w") as f:
+            f.write(ORIGINAL_HOOK)
+        socket_path = os.path.join(tmp, "daemon.sock")
+        env = dict(os.environ, CLAUDE_CONTEXT_SOCKET=socket_path)
+        client = [args.python, "-S", str(HOOK_SCRIPT)]
+
+        print(f"{args.runs} runs per mode, cwd {args.cwd}")
+        baseline = report("original (time only)", time_runs([args.python, original], payload, args.runs, env))
+        fallback = report("client, no daemon", time_runs(client, payload, args.runs, env))
+
+        subprocess.run([args.python, str(DAEMON_SCRIPT), "--socket", socket_path, "start"], check=True)
+        try:
+            report("client, daemon", time_runs(client, payload, args.runs, env))
+            report("daemon socket only", socket_round_trips(socket_path, os.path.abspath(args.cwd), args.runs))
+            stats = subprocess.run([args.python, str(DAEMON_SCRIPT), "--socket", socket_path, "status"],
+                                   stdout=subprocess.PIPE, text=True).stdout.strip()
+            print(stats)
+        finally:
+            subprocess.run([args.python, str(DAEMON_SCRIPT), "--socket", socket_path, "stop"],
+                           stdout=subprocess.DEVNULL)
+
+    failed = [name for name, ours, theirs in zip(("p50", "p99"), fallback, baseline) if ours > theirs]
+    if failed:
+        print(f"FAIL: client without the daemon is slower than the original at {', '.join(failed)}")
+        return 1
+    print("OK: client without the daemon is no slower than the original at p50 and p99")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Resident context daemon for the inject-time.py UserPromptSubmit hook.
+
+Listens on a per-user Unix socket and answers each prompt from a cache of
+the git and project context of its working directory, so the hook skips
+`git status` and most of its own startup. Only the time is formatted per
+request. An entry is recomputed before answering when the branch or the
+index changed, and refreshed in the background once it is older than
+--max-age. Exits after --idle-timeout without requests.
+
+Usage:
+    context-daemon.py start     # background; a no-op if already running
+    context-daemon.py stop
+    context-daemon.py status
+    context-daemon.py run       # foreground
+
+Starting it from a SessionStart hook keeps it up while Claude Code is used.
+Without it, inject-time.py reports only the time and the git branch.
+"""
+
+import argparse
+import fcntl
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+import hook_context
+
+MAX_AGE = 5.0
+IDLE_TIMEOUT = 4 * 3600
+START_TIMEOUT = 5.0
+MAX_REQUEST = 65536
+
+
+class ContextCache:
+    """Static context per working directory, keyed by the git state it was computed from"""
+
+    def __init__(self, max_age=MAX_AGE):
+        self.max_age = max_age
+        # cwd → (git state key, computed at, text)
+        self.entries = {}
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'background_refreshes': 0}
+
+    @staticmethod
+    def _state(cwd):
+        found = hook_context.find_git_dir(cwd)
+        return hook_context.git_state_key(found[1]) if found else None
+
+    def _compute(self, cwd):
+        state = self._state(cwd)
+        text = hook_context.static_context(cwd)
+        with self.lock:
+            self.entries[cwd] = (state, time.monotonic(), text)
+        return text
+
+    def _refresh(self, cwd):
+        try:
+            self._compute(cwd)
+        finally:
+            with self.lock:
+                self.refreshing.discard(cwd)
+
+    def get(self, cwd):
+        state = self._state(cwd)
+        with self.lock:
+            self.stats['requests'] += 1
+            entry = self.entries.get(cwd)
+            if entry is None or entry[0] != state:
+                self.stats['misses'] += 1
+                entry = None
+            else:
+                self.stats['hits'] += 1
+                # Stale by age only: answer now, recompute for the next prompt
+                if time.monotonic() - entry[1] > self.max_age and cwd not in self.refreshing:
+                    self.refreshing.add(cwd)
+                    self.stats['background_refreshes'] += 1
+                    threading.Thread(target=self._refresh, args=(cwd,), daemon=True).start()
+        if entry is None:
+            return self._compute(cwd)
+        return entry[2]
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """One request line per connection: 'context<TAB>cwd', 'ping' or 'stats'"""
+
+    timeout = 5.0
+
+    def handle(self):
+        server = self.server
+        server.last_request = time.monotonic()
+        line = self.rfile.readline(MAX_REQUEST).rstrip(b"\n")
+        command, _, arg = line.partition(b"\t")
+        if command == b"context":
+            cwd = os.fsdecode(arg)
+            text = server.cache.get(cwd)
+            context = hook_context.time_context()
+            reply = f"{context}\n{text}" if text else context
+        elif command == b"ping":
+            reply = str(os.getpid())
+        elif command == b"stats":
+            with server.cache.lock:
+                stats = dict(server.cache.stats, entries=len(server.cache.entries))
+            stats['pid'] = os.getpid()
+            stats['uptime_s'] = round(time.monotonic() - server.started)
+            reply = " ".join(f"{key}={value}" for key, value in stats.items())
+        else:
+            self.wfile.write(b"error\nunknown command\n")
+            return
+        self.wfile.write(b"ok\n" + reply.encode("utf-8", "surrogateescape"))
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def request(path, command, timeout=1.0):
+    """Reply to one command from the daemon at path, or None if none answers"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+        sock.sendall(command + b"\n")
+        reply = b"".join(iter(lambda: sock.recv(65536), b""))
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    return reply[3:].decode() if reply.startswith(b"ok\n") else None
+
+
+def prepare_socket_dir(path):
+    """Create the socket's directory private to this user, refusing one someone else controls"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.stat(directory)
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        raise PermissionError(f"{directory} must be owned by you and not writable by others")
+
+
+def run(args):
+    path = args.socket
+    prepare_socket_dir(path)
+    # Held for the daemon's lifetime: of two concurrent starts, one backs off
+    lock = open(f"{path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print(f"Context daemon already running on {path}", file=sys.stderr)
+        return 0
+    if os.path.exists(path):
+        # Left behind by a daemon that did not exit cleanly
+        os.remove(path)
+
+    server = Server(path, Handler)
+    os.chmod(path, 0o600)
+    server.cache = ContextCache(args.max_age)
+    server.started = server.last_request = time.monotonic()
+
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, lambda *_: stop.set())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Context daemon {os.getpid()} listening on {path}", file=sys.stderr)
+    try:
+        while not stop.wait(1.0):
+            if time.monotonic() - server.last_request > args.idle_timeout:
+                print("Idle timeout, exiting", file=sys.stderr)
+                break
+    finally:
+        server.shutdown()
+        server.server_close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def start(args):
+    if request(args.socket, b"ping") is not None:
+        return 0
+    prepare_socket_dir(args.socket)
+    command = [sys.executable, os.path.abspath(__file__), "--socket", args.socket, "run",
+               "--max-age", str(args.max_age), "--idle-timeout", str(args.idle_timeout)]
+    subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if request(args.socket, b"ping") is not None:
+            return 0
+        time.sleep(0.02)
+    print(f"Context daemon did not come up on {args.socket}", file=sys.stderr)
+    return 1
+
+
+def stop(args):
+    pid = request(args.socket, b"ping")
+    if pid is None:
+        print("Context daemon not running")
+        return 0
+    os.kill(int(pid), signal.SIGTERM)
+    deadline = time.monotonic() + START_TIMEOUT
+    while os.path.exists(args.socket) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    print(f"Stopped context daemon {pid}")
+    return 0
+
+
+def status(args):
+    stats = request(args.socket, b"stats")
+    if stats is None:
+        print(f"Context daemon not running ({args.socket})")
+        return 1
+    print(f"Context daemon on {args.socket}: {stats}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident context daemon for the inject-time.py hook")
+    parser.add_argument("--socket", default=hook_context.socket_path(),
+                        help="Unix socket path (default: $CLAUDE_CONTEXT_SOCKET or a per-user path)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, func, help_text in (("start", start, "Start in the background unless already running"),
+                                  ("run", run, "Run in the foreground")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--max-age", type=float, default=MAX_AGE,
+                         help=f"Seconds before cached git status is refreshed in the background (default: {MAX_AGE:g})")
+        sub.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                         help=f"Exit after this many seconds without requests (default: {IDLE_TIMEOUT})")
+        sub.set_defaults(func=func)
+    subparsers.add_parser("stop", help="Stop the running daemon").set_defaults(func=stop)
+    subparsers.add_parser("status", help="Show request and cache statistics").set_defaults(func=status)
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
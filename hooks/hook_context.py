@@ -0,0 +1,149 @@
+"""
+Context injected by the UserPromptSubmit hook (inject-time.py).
+Builds the time, git and project lines for a working directory. The resident
+daemon (context-daemon.py) keeps them cached across prompts; when it is not
+running, inject-time.py imports this module and reports only what needs no
+subprocess: the time and the branch read from .git/HEAD.
+Standard library only, and cheap to import: the hook runs under python3 -S.
+"""
+
+import os
+import time
+
+TIME_FORMAT = "%H:%M:%S, %A, %B %d, %Y"
+GIT_TIMEOUT = 2.0
+# Changed files listed by name before falling back to a count
+MAX_CHANGED_NAMES = 5
+# Manifests whose presence describes a project, in the order they are reported
+MANIFESTS = (
+    "package.json", "pyproject.toml", "setup.py", "requirements.txt", "Cargo.toml",
+    "go.mod", "Gemfile", "pom.xml", "build.gradle", "Makefile", "Dockerfile",
+)
+
+
+def socket_path():
+    """Unix socket the daemon listens on: $CLAUDE_CONTEXT_SOCKET, else a per-user path"""
+    path = os.environ.get("CLAUDE_CONTEXT_SOCKET")
+    if path:
+        return path
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "claude-context.sock")
+    # Not $TMPDIR: macOS's is long enough to overflow the ~104 byte socket path limit
+    return f"/tmp/claude-context-{os.getuid()}/daemon.sock"
+
+
+def time_context(now=None):
+    return f"Current time: {time.strftime(TIME_FORMAT, time.localtime(now))} (Week: Monday-Sunday)"
+
+
+def find_git_dir(cwd):
+    """(work tree root, git dir) of the repository containing cwd, or None"""
+    path = os.path.abspath(cwd)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return path, dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules: .git is a file pointing at the real git dir
+            try:
+                with open(dot_git) as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if line.startswith("gitdir:"):
+                return path, os.path.normpath(os.path.join(path, line[len("gitdir:"):].strip()))
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def git_branch(git_dir):
+    """Branch name read from HEAD without running git, or 'detached at <sha>'"""
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/"):]
+    return f"detached at {head[:7]}" if head else None
+
+
+def git_state_key(git_dir):
+    """Modification times that change whenever the branch or the index does
+
+    Edits to tracked files do not touch either, so callers pair the key with a
+    maximum age.
+    """
+    key = []
+    for name in ("HEAD", "index"):
+        try:
+            key.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    return tuple(key)
+
+
+def git_status(root):
+    """Short description of uncommitted changes, or None if git failed"""
+    # Imported here: the hook client imports this module on every prompt, subprocess costs ms
+    import subprocess
+    try:
+        result = subprocess.run(
+            ["git", "-C", root, "--no-optional-locks", "status", "--porcelain", "--untracked-files=normal"],
+            capture_output=True, text=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    changed = [line[3:] for line in result.stdout.splitlines() if line]
+    if not changed:
+        return "clean"
+    if len(changed) <= MAX_CHANGED_NAMES:
+        return f"{len(changed)} changed ({', '.join(changed)})"
+    return f"{len(changed)} changed"
+
+
+def git_context(root, git_dir):
+    branch = git_branch(git_dir)
+    status = git_status(root)
+    parts = [f"branch {branch}" if branch else "no branch"]
+    if status:
+        parts.append(status)
+    return f"Git: {', '.join(parts)}"
+
+
+def project_context(root):
+    """Project name and the manifests found at its root"""
+    try:
+        names = set(os.listdir(root))
+    except OSError:
+        return None
+    manifests = [name for name in MANIFESTS if name in names]
+    line = f"Project: {os.path.basename(root) or root} ({root})"
+    if manifests:
+        line += f", {', '.join(manifests)}"
+    return line
+
+
+def static_context(cwd):
+    """Everything but the time for cwd: git and project lines, joined"""
+    found = find_git_dir(cwd)
+    root = found[0] if found else os.path.abspath(cwd)
+    lines = []
+    if found:
+        lines.append(git_context(*found))
+    project = project_context(root)
+    if project:
+        lines.append(project)
+    return "\n".join(lines)
+
+
+def fallback_context(cwd, now=None):
+    """Hook output for cwd without the daemon: the time and the branch, no git status"""
+    found = find_git_dir(cwd)
+    branch = git_branch(found[1]) if found else None
+    return f"{time_context(now)}\nGit: branch {branch}" if branch else time_context(now)
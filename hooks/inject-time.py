@@ -1,18 +1,93 @@
-#!/usr/bin/env python3
-import json
+#!/usr/bin/env -S python3 -S
+"""
+UserPromptSubmit hook: injects the current time, git branch/status and project
+into the prompt context.
+
+Runs on every prompt, so it starts without site-packages (-S), imports only
+builtin modules and does not decode the hook's JSON input. The context comes
+from the resident daemon (context-daemon.py) when it is running, which answers
+from its cache in well under a millisecond. Without it the hook reports only
+the time and the branch read from .git/HEAD: git status and the project line
+need a subprocess or directory scan per prompt, so they are opt-in by running
+the daemon.
+"""
+
+import _socket
+import os
 import sys
-import datetime
 
-# Load input from stdin
-input_data = json.load(sys.stdin)
-prompt = input_data.get("prompt", "")
+import hook_context
+
+CONNECT_TIMEOUT = 0.5
+CWD_KEY = b'"cwd":'
+
+
+def hook_cwd(raw):
+    """The "cwd" field of the hook input, found without decoding the JSON"""
+    key = raw.find(CWD_KEY)
+    if key >= 0:
+        start = raw.find(b'"', key + len(CWD_KEY))
+        end = raw.find(b'"', start + 1)
+        if start >= 0 and end >= 0 and not raw[key + len(CWD_KEY):start].strip():
+            value = raw[start + 1:end]
+            if b'\\' not in value:
+                return os.fsdecode(value)
+            # Escaped characters in the path: decode just this field properly
+            import json
+            try:
+                return json.loads(raw)["cwd"]
+            except (ValueError, KeyError, TypeError):
+                pass
+    return os.getcwd()
+
+
+def trusted(path):
+    """Whether the socket's directory belongs to this user and nobody else can write to it"""
+    try:
+        st = os.stat(os.path.dirname(path) or ".")
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def from_daemon(cwd):
+    """Context from the resident daemon, or None when it is not running"""
+    path = hook_context.socket_path()
+    if not trusted(path):
+        return None
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    chunks = []
+    try:
+        sock.connect(path)
+        sock.sendall(b"context\t" + os.fsencode(cwd) + b"\n")
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    reply = b"".join(chunks)
+    if not reply.startswith(b"ok\n"):
+        return None
+    return reply[3:].decode("utf-8", "replace")
+
 
-# Add current date and time to context
-now = datetime.datetime.now()
-context = f"Current time: {now:%H:%M:%S, %A, %B %d, %Y} (Week: Monday-Sunday)"
+def main():
+    cwd = hook_cwd(sys.stdin.buffer.read())
+    context = None
+    if os.environ.get("CLAUDE_CONTEXT_DAEMON") != "0":
+        context = from_daemon(cwd)
+    if context is None:
+        context = hook_context.fallback_context(cwd)
+    # Output the context to be injected
+    sys.stdout.write(context + "\n")
+    # Allow prompt to proceed
+    return 0
 
-# Output the context to be injected
-print(context)
 
-# Allow prompt to proceed
-sys.exit(0)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
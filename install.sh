@@ -73,7 +73,7 @@ if [[ -d "$SRC_BASE/agents/doc-reviewer" ]]; then
   echo "📦 Installing doc-reviewer dependencies to $CLAUDE_HOME..."
   mkdir -p "$CLAUDE_HOME"
   
-  for file in output-template.md markdownlint.jsonc; do
+  for file in output-template.md markdownlint.jsonc markdown_check.py; do
     if [[ -f "$SRC_BASE/agents/doc-reviewer/$file" ]]; then
       cp "$SRC_BASE/agents/doc-reviewer/$file" "$CLAUDE_HOME/"
       echo "  ✅ Installed $file"
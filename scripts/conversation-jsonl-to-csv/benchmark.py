@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the JSONL to CSV converter.
+Generates synthetic Claude Code transcripts and measures peak memory and throughput.
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CONVERTER_SCRIPT = SCRIPT_DIR / "jsonl-to-csv.py"
+
+FILE_BODY_LINE = "    def handler(self, request):  # synthetic source line used to pad Read results\n"
+
+def load_converter():
+    """Import jsonl-to-csv.py (not importable by name because of the dashes)"""
+    spec = importlib.util.spec_from_file_location("jsonl_to_csv", CONVERTER_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, str(SCRIPT_DIR))
+    spec.loader.exec_module(module)
+    return module
+
+def synthetic_messages(read_body_kb=64):
+    """Yield an endless, repeating cycle of realistic transcript messages"""
+    body = FILE_BODY_LINE * max(1, (read_body_kb * 1024) // len(FILE_BODY_LINE))
+    session_id = "00000000-0000-4000-8000-000000000000"
+    n = 0
+    while True:
+        n += 1
+        ts = f"2025-08-{1 + n % 28:02d}T{n % 24:02d}:{n % 60:02d}:{n % 60:02d}.000Z"
+        file_path = f"/repo/src/module_{n % 500}.py"
+        yield {"type": "user", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "user", "content": f"Please review {file_path} and fix the hook #{n}"}}
+        yield {"type": "assistant", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "assistant", "content": [
+                   {"type": "tool_use", "id": f"toolu_{n}r", "name": "Read", "input": {"file_path": file_path}}]}}
+        yield {"type": "user", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "user", "content": [
+                   {"type": "tool_result", "tool_use_id": f"toolu_{n}r", "content": body}]}}
+        yield {"type": "assistant", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "assistant", "content": [
+                   {"type": "tool_use", "id": f"toolu_{n}b", "name": "Bash",
+                    "input": {"command": "pytest -q", "description": "Run tests"}}]}}
+        yield {"type": "user", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "user", "content": [
+                   {"type": "tool_result", "tool_use_id": f"toolu_{n}b",
+                    "content": [{"type": "text", "text": "12 passed in 0.53s\n" * 40}]}]}}
+        yield {"type": "assistant", "sessionId": session_id, "timestamp": ts,
+               "message": {"role": "assistant", "content": [
+                   {"type": "text", "text": f"Fixed the hook in {file_path}. " * 20}]}}
+        if n % 10 == 0:
+            yield {"type": "system", "timestamp": ts, "content": "Conversation compacted " * 30}
+
+def write_synthetic_transcript(path, size_mb, read_body_kb=64):
+    """Write a synthetic transcript of roughly size_mb megabytes, returning its line count"""
+    target = size_mb * 1024 * 1024
+    written = 0
+    lines = 0
+    with open(path, 'w') as f:
+        for msg in synthetic_messages(read_body_kb):
+            line = json.dumps(msg) + "\n"
+            f.write(line)
+            written += len(line)
+            lines += 1
+            if written >= target:
+                break
+    return lines
+
+def peak_child_rss_mb():
+    """Peak RSS of any waited-for child process, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def bench_convert(args):
+    """Convert a synthetic transcript and report peak RSS and rows/sec"""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "transcript.jsonl"
+        output_file = Path(tmp) / "transcript.csv"
+
+        print(f"Generating {args.size_mb}MB synthetic transcript...")
+        rows = write_synthetic_transcript(input_file, args.size_mb, args.read_body_kb)
+        input_size = input_file.stat().st_size
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(CONVERTER_SCRIPT), str(input_file), str(output_file)],
+                       check=True, stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+
+        print(f"Input: {input_size / 1024 / 1024:.0f}MB, {rows} rows")
+        print(f"Time: {elapsed:.2f}s")
+        print(f"Throughput: {rows / elapsed:,.0f} rows/s, {input_size / 1024 / 1024 / elapsed:.1f} MB/s")
+        print(f"Peak RSS: {peak_child_rss_mb():.1f}MB")
+
+def bench_decode(args):
+    """Compare decode + row extraction MB/s across decoder backends on a Read-heavy transcript"""
+    converter = load_converter()
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "transcript.jsonl"
+        print(f"Generating {args.size_mb}MB synthetic transcript ({args.read_body_kb}KB Read results)...")
+        write_synthetic_transcript(input_file, args.size_mb, args.read_body_kb)
+        with open(input_file, 'rb') as f:
+            lines = f.readlines()
+    size_mb = sum(map(len, lines)) / 1024 / 1024
+
+    print(f"{'backend':<10} {'prefilter':<10} {'MB/s':>8} {'rows/s':>10}")
+    for backend in converter.available_decoders():
+        for prefilter in (False, True):
+            decode = converter.get_decoder(backend, prefilter)
+            start = time.perf_counter()
+            for _ in converter.iter_csv_rows(converter.iter_messages(lines, decode), {'pending_read_count': 0}):
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"{backend:<10} {'on' if prefilter else 'off':<10} {size_mb / elapsed:>8.1f} {len(lines) / elapsed:>10,.0f}")
+
+SEARCH_VOCABULARY = (
+    "react hook state effect render component props context reducer memo callback ref "
+    "python test fixture pytest mock patch import module package build deploy docker "
+    "kubernetes helm chart config yaml json parse schema validate migrate database sql "
+    "query index table join postgres redis cache queue worker thread async await lock "
+    "race condition deadlock timeout retry error exception stack trace debug log metric "
+    "latency throughput memory leak profile benchmark optimize refactor rename extract "
+    "function class method interface type annotation generic lint format commit branch "
+    "merge rebase conflict review approve release version changelog docs readme api "
+    "endpoint route handler middleware auth token session cookie oauth permission role"
+).split()
+
+def write_search_corpus(base_dir, sessions, messages_per_session, seed=0):
+    """Write synthetic sessions with Zipf-distributed vocabulary spread over 20 projects"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(SEARCH_VOCABULARY))]
+    for s in range(sessions):
+        project = Path(base_dir) / f"-repo-project-{s % 20}"
+        project.mkdir(exist_ok=True)
+        with open(project / f"{s:08d}-0000-4000-8000-000000000000.jsonl", 'w') as f:
+            for m in range(messages_per_session):
+                words = ' '.join(rng.choices(SEARCH_VOCABULARY, weights, k=rng.randint(8, 60)))
+                ts = f"2025-08-{1 + s % 28:02d}T10:{m % 60:02d}:00.000Z"
+                if m % 3 == 0:
+                    msg = {"type": "user", "timestamp": ts, "message": {"role": "user", "content": words}}
+                elif m % 3 == 1:
+                    msg = {"type": "assistant", "timestamp": ts, "message": {"role": "assistant", "content": [
+                        {"type": "tool_use", "name": "Grep", "input": {"pattern": words[:40], "path": "src"}}]}}
+                else:
+                    msg = {"type": "assistant", "timestamp": ts, "message": {"role": "assistant", "content": [
+                        {"type": "text", "text": words}]}}
+                f.write(json.dumps(msg) + "\n")
+
+def bench_search(args):
+    """Index build time, index size and query latency over many sessions"""
+    converter = load_converter()
+    import conversation_search
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {args.sessions} sessions x {args.messages} messages...")
+        write_search_corpus(tmp, args.sessions, args.messages)
+        corpus_size = sum(p.stat().st_size for p in Path(tmp).glob("*/*.jsonl"))
+
+        index = conversation_search.SearchIndex(os.path.join(tmp, "index.sqlite"))
+        stats = index.update(tmp, converter.get_decoder(), converter.extract_search_text)
+        print(f"Build: {stats['seconds']:.2f}s for {stats['messages']:,} messages "
+              f"({corpus_size / 1024 / 1024 / stats['seconds']:.1f} MB/s)")
+        print(f"Index size: {os.path.getsize(index.db_path) / 1024 / 1024:.1f}MB "
+              f"(corpus {corpus_size / 1024 / 1024:.1f}MB)")
+
+        start = time.perf_counter()
+        noop = index.update(tmp, converter.get_decoder(), converter.extract_search_text)
+        print(f"No-op refresh: {(time.perf_counter() - start) * 1000:.0f}ms ({noop['files']} files checked)")
+
+        rng = random.Random(1)
+        queries = [' '.join(rng.sample(SEARCH_VOCABULARY, rng.randint(1, 3))) for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, 10)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"Query latency over {len(queries)} queries: p50 {p50:.1f}ms, p99 {p99:.1f}ms, max {latencies[-1] * 1000:.1f}ms")
+        index.close()
+
+def scan_csv(paths):
+    """Rows per type from CSV files: every row must be parsed"""
+    counts = {}
+    for path in paths:
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f, fieldnames=['type', 'timestamp', 'description']):
+                counts[row['type']] = counts.get(row['type'], 0) + 1
+    return counts
+
+def scan_archive(columnar_export, path, columns):
+    """Rows per type (and estimated tokens per tool) from an archive, reading only `columns`"""
+    counts = {}
+    tokens = {}
+    for group in columnar_export.iter_row_groups(path, columns):
+        for value in group['type']:
+            counts[value] = counts.get(value, 0) + 1
+        if 'tool_name' in group:
+            for tool, estimate in zip(group['tool_name'], group['tokens_est']):
+                tokens[tool] = tokens.get(tool, 0) + estimate
+    return counts
+
+def bench_export(args):
+    """Output size, write time and scan speed of CSV vs each columnar format/codec"""
+    converter = load_converter()
+    import columnar_export
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {args.sessions} sessions ({args.size_mb}MB transcript + search corpus)...")
+        write_search_corpus(tmp, args.sessions, args.messages)
+        write_synthetic_transcript(Path(tmp) / "-repo-project-0" / "large.jsonl", args.size_mb, args.read_body_kb)
+        paths = sorted(str(p) for p in Path(tmp).glob("*/*.jsonl"))
+        input_size = sum(os.path.getsize(p) for p in paths)
+        print(f"Input: {len(paths)} files, {input_size / 1024 / 1024:.1f}MB")
+
+        start = time.perf_counter()
+        csv_paths = []
+        for path in paths:
+            csv_paths.append(path[:-len('.jsonl')] + '.csv')
+            converter.process_jsonl(path, csv_paths[-1], verbose=False)
+        write_s = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = scan_csv(csv_paths)
+        scan_s = time.perf_counter() - start
+        csv_size = sum(os.path.getsize(p) for p in csv_paths)
+
+        print(f"{'format':<16} {'size':>9} {'write s':>8} {'scan s':>8} {'2-col s':>8}")
+        print(f"{'csv':<16} {csv_size / 1024:>8.0f}K {write_s:>8.2f} {scan_s:>8.3f} {'-':>8}")
+
+        start = time.perf_counter()
+        exported = [converter.export_columns(path) for path in paths]
+        extract_s = time.perf_counter() - start
+        for fmt in columnar_export.available_formats():
+            for codec in columnar_export.available_codecs():
+                output = os.path.join(tmp, f"archive-{codec}{columnar_export.default_suffix(fmt)}")
+                start = time.perf_counter()
+                with columnar_export.ArchiveWriter(output, fmt, codec, args.row_group_size) as writer:
+                    for _, columns, _ in exported:
+                        writer.append_rows(columns)
+                write_s = extract_s + time.perf_counter() - start
+                start = time.perf_counter()
+                full = scan_archive(columnar_export, output, None)
+                scan_s = time.perf_counter() - start
+                start = time.perf_counter()
+                projected = scan_archive(columnar_export, output, ['type', 'tool_name', 'tokens_est'])
+                projected_s = time.perf_counter() - start
+                if full != expected or projected != expected:
+                    print(f"MISMATCH: {fmt}/{codec} row counts differ from the CSV")
+                print(f"{f'{fmt}/{codec}':<16} {os.path.getsize(output) / 1024:>8.0f}K {write_s:>8.2f} "
+                      f"{scan_s:>8.3f} {projected_s:>8.3f}")
+        print("scan: rows per type over all columns; 2-col: type counts plus tokens per tool, "
+              "reading only those columns")
+
+def synthetic_columns(session_analytics, calls, sessions, tools=40, projects=100, seed=0):
+    """Columns of random tool calls (Zipf-distributed tools, log-normal latencies and sizes)"""
+    rng = random.Random(seed)
+    columns = session_analytics.Columns()
+    weights = [1 / (rank + 1) for rank in range(tools)]
+    names = [f"Tool{rank}" for rank in range(tools)]
+    per_session = max(1, calls // sessions)
+    for s in range(sessions):
+        tool = rng.choices(names, weights, k=per_session)
+        answered = [rng.random() < 0.98 for _ in tool]
+        columns.add(f"-repo-project-{s % projects}", {
+            'tool': tool,
+            'latency_ms': [rng.lognormvariate(6, 1.5) if a else float('nan') for a in answered],
+            'result_chars': [int(rng.lognormvariate(7, 2)) if a else -1 for a in answered],
+            'error': [int(rng.random() < 0.03) for _ in tool],
+        }, [(f"session-{s}", s * 1000.0, s * 1000.0 + rng.lognormvariate(13, 1), per_session * 3, per_session)])
+    return columns
+
+def same_report(a, b):
+    """Reports equal up to float rounding of sums and means"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(k == 'backend' or same_report(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same_report(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+    return a == b
+
+def bench_analytics(args):
+    """Transcript parsing throughput and aggregation time of each analytics backend"""
+    converter = load_converter()
+    import session_analytics
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {args.size_mb}MB transcript ({args.read_body_kb}KB Read results)...")
+        input_file = Path(tmp) / "-repo-project-0" / "large.jsonl"
+        input_file.parent.mkdir()
+        lines = write_synthetic_transcript(input_file, args.size_mb, args.read_body_kb)
+        start = time.perf_counter()
+        _, calls, _, error = converter.analytics_columns(str(input_file))
+        elapsed = time.perf_counter() - start
+        if error:
+            raise SystemExit(f"analytics_columns failed: {error}")
+        print(f"Parse + pairing: {lines:,} messages, {len(calls['tool']):,} tool calls in {elapsed:.2f}s "
+              f"({lines / elapsed:,.0f} messages/s, {args.size_mb / elapsed:.1f} MB/s per worker)")
+
+    print(f"Generating {args.calls:,} synthetic tool calls in {args.sessions:,} sessions...")
+    columns = synthetic_columns(session_analytics, args.calls, args.sessions)
+    reports = {}
+    print(f"{'backend':<10} {'aggregate s':>12} {'calls/s':>14}")
+    for backend in session_analytics.available_backends():
+        start = time.perf_counter()
+        reports[backend] = session_analytics.summarize(columns, backend)
+        elapsed = time.perf_counter() - start
+        print(f"{backend:<10} {elapsed:>12.3f} {len(columns.call_tool) / elapsed:>14,.0f}")
+    if len(reports) > 1 and not same_report(reports['numpy'], reports['python']):
+        print("MISMATCH: numpy and python reports differ")
+
+def bench_seek(args):
+    """Line index build/append time and seek latency vs parsing from the start"""
+    converter = load_converter()
+    import line_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / "transcript.jsonl"
+        print(f"Generating {args.size_mb}MB synthetic transcript ({args.read_body_kb}KB Read results)...")
+        lines = write_synthetic_transcript(input_file, args.size_mb, args.read_body_kb)
+        size_mb = input_file.stat().st_size / 1024 / 1024
+
+        start = time.perf_counter()
+        line_index.update(str(input_file))
+        build_s = time.perf_counter() - start
+        sidecar_kb = os.path.getsize(line_index.sidecar_path(input_file)) / 1024
+        print(f"Build: {lines:,} messages in {build_s:.2f}s ({size_mb / build_s:.0f} MB/s), sidecar {sidecar_kb:.0f}KB")
+
+        with open(input_file, 'a') as f:
+            for msg, _ in zip(synthetic_messages(args.read_body_kb), range(100)):
+                f.write(json.dumps(msg) + "\n")
+        start = time.perf_counter()
+        added = line_index.update(str(input_file))
+        print(f"Append: {added} new messages indexed in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        rng = random.Random(0)
+        with line_index.open_index(str(input_file)) as index:
+            targets = [rng.randrange(len(index)) for _ in range(args.seeks)]
+            start = time.perf_counter()
+            for n in targets:
+                for line in index.lines(n, n + 100):
+                    converter.get_decoder()(bytes(line))
+            seek_ms = (time.perf_counter() - start) / len(targets) * 1000
+            first, last = index.first_timestamp, index.last_timestamp
+            start = time.perf_counter()
+            for _ in range(args.seeks):
+                index.seek_time(rng.randint(first, last))
+            time_us = (time.perf_counter() - start) / args.seeks * 1e6
+
+        start = time.perf_counter()
+        decode = converter.get_decoder()
+        with open(input_file, 'rb') as f:
+            for n, _ in enumerate(converter.iter_messages(f, decode)):
+                if n == len(index) // 2 + 100:
+                    break
+        parse_ms = (time.perf_counter() - start) * 1000
+        print(f"Decode 100 messages at a random position: {seek_ms:.2f}ms with the index, "
+              f"{parse_ms:.0f}ms parsing from the start to the middle")
+        print(f"Timestamp seek: {time_us:.1f}us")
+
+def source_file(rng, n, lines=400):
+    """Body of synthetic source file n as Read returns it (numbered lines), with some lines edited"""
+    body = []
+    for i in range(lines):
+        text = f"    value_{n}_{i} = compute(record, {i})  # step {i} of module {n}"
+        if rng.random() < 0.01:
+            text += f"  # edited {rng.randrange(1000)}"
+        body.append(f"{i + 1:>6}\u2192{text}")
+    return "\n".join(body)
+
+def write_archive_corpus(base_dir, sessions, reads, files, seed=0):
+    """Sessions re-reading (slightly edited versions of) the same pool of source files"""
+    rng = random.Random(seed)
+    for s in range(sessions):
+        project = Path(base_dir) / f"-repo-project-{s % 5}"
+        project.mkdir(exist_ok=True)
+        with open(project / f"{s:08d}-0000-4000-8000-000000000000.jsonl", 'w') as f:
+            for r in range(reads):
+                ts = f"2025-08-{1 + s % 28:02d}T10:{r % 60:02d}:00.000Z"
+                n = rng.randrange(files)
+                f.write(json.dumps({"type": "assistant", "timestamp": ts, "message": {"role": "assistant", "content": [
+                    {"type": "tool_use", "id": f"toolu_{s}_{r}", "name": "Read",
+                     "input": {"file_path": f"/repo/src/module_{n}.py"}}]}}) + "\n")
+                f.write(json.dumps({"type": "user", "timestamp": ts, "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"toolu_{s}_{r}",
+                     "content": source_file(random.Random(n * 7919 + rng.randrange(4)), n)}]}}) + "\n")
+                f.write(json.dumps({"type": "assistant", "timestamp": ts, "message": {"role": "assistant", "content": [
+                    {"type": "text", "text": f"module_{n} looks fine."}]}}) + "\n")
+
+def bench_archive(args):
+    """Dedup ratio, disk savings and throughput of archive/restore, plus byte-for-byte round trip"""
+    import hashlib
+    converter = load_converter()
+    import content_store
+
+    def digests(paths):
+        return {p: hashlib.sha256(Path(p).read_bytes()).hexdigest() for p in paths}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {args.sessions} sessions x {args.reads} Reads of {args.files} files...")
+        write_archive_corpus(tmp, args.sessions, args.reads, args.files)
+        paths = sorted(str(p) for p in Path(tmp).glob("*/*.jsonl"))
+        original = digests(paths)
+        input_size = sum(os.path.getsize(p) for p in paths)
+        csv_before = []
+        for path in paths:
+            converter.process_jsonl(path, path + ".csv", verbose=False)
+            csv_before.append(Path(path + ".csv").read_bytes())
+
+        store = content_store.ContentStore(content_store.store_path_for(paths[0]))
+        start = time.perf_counter()
+        for path in paths:
+            content_store.archive_file(store, path)
+        archive_s = time.perf_counter() - start
+        stats = store.stats
+        store.close()
+        archived_size = sum(os.path.getsize(p) for p in paths)
+        store_size = os.path.getsize(store.path)
+        print(f"Archive: {input_size / 1024 / 1024:.1f}MB in {archive_s:.2f}s "
+              f"({input_size / 1024 / 1024 / archive_s:.1f} MB/s)")
+        print(f"Dedup ratio: {stats['logical_bytes'] / max(1, stats['unique_bytes']):.1f}x "
+              f"({stats['blob_hits']}/{stats['blobs']} strings, {stats['chunk_hits']}/{stats['chunks']} chunks "
+              f"already stored)")
+        print(f"Disk: {input_size / 1024 / 1024:.1f}MB → {archived_size / 1024 / 1024:.2f}MB transcripts + "
+              f"{store_size / 1024 / 1024:.2f}MB store ({input_size / (archived_size + store_size):.1f}x smaller)")
+
+        start = time.perf_counter()
+        for n, path in enumerate(paths):
+            converter.process_jsonl(path, path + ".csv", verbose=False)
+            if Path(path + ".csv").read_bytes() != csv_before[n]:
+                print(f"MISMATCH: CSV of archived {os.path.basename(path)} differs")
+        print(f"CSV from archived transcripts (lazy rehydration): {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        for path in paths:
+            content_store.restore_file(path)
+        restore_s = time.perf_counter() - start
+        print(f"Restore: {restore_s:.2f}s ({input_size / 1024 / 1024 / restore_s:.1f} MB/s)")
+        print("Round trip: " + ("byte-for-byte identical" if digests(paths) == original else "MISMATCH"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSONL to CSV converter")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    convert = subparsers.add_parser("convert", help="Peak RSS and rows/sec for a full conversion")
+    convert.add_argument("--size-mb", type=int, default=1024, help="Synthetic transcript size (default: 1024)")
+    convert.add_argument("--read-body-kb", type=int, default=64, help="Size of each Read result body (default: 64)")
+    convert.set_defaults(func=bench_convert)
+
+    decode = subparsers.add_parser("decode", help="MB/s of each JSON decoder backend, with and without prefilter")
+    decode.add_argument("--size-mb", type=int, default=256, help="Synthetic transcript size (default: 256)")
+    decode.add_argument("--read-body-kb", type=int, default=64, help="Size of each Read result body (default: 64)")
+    decode.set_defaults(func=bench_decode)
+
+    search = subparsers.add_parser("search", help="Search index build time, size and query latency")
+    search.add_argument("--sessions", type=int, default=10000, help="Number of synthetic sessions (default: 10000)")
+    search.add_argument("--messages", type=int, default=30, help="Messages per session (default: 30)")
+    search.add_argument("--queries", type=int, default=200, help="Number of timed queries (default: 200)")
+    search.set_defaults(func=bench_search)
+
+    export = subparsers.add_parser("export", help="Size and scan speed of CSV vs columnar archives")
+    export.add_argument("--sessions", type=int, default=2000, help="Number of synthetic sessions (default: 2000)")
+    export.add_argument("--messages", type=int, default=30, help="Messages per session (default: 30)")
+    export.add_argument("--size-mb", type=int, default=64, help="Size of one large Read-heavy transcript (default: 64)")
+    export.add_argument("--read-body-kb", type=int, default=64, help="Size of each Read result body (default: 64)")
+    export.add_argument("--row-group-size", type=int, default=65536, help="Rows per row group (default: 65536)")
+    export.set_defaults(func=bench_export)
+
+    analytics = subparsers.add_parser("analytics", help="Analytics parse throughput and aggregation time per backend")
+    analytics.add_argument("--size-mb", type=int, default=64, help="Synthetic transcript size (default: 64)")
+    analytics.add_argument("--read-body-kb", type=int, default=8, help="Size of each Read result body (default: 8)")
+    analytics.add_argument("--calls", type=int, default=2000000, help="Synthetic tool calls to aggregate (default: 2000000)")
+    analytics.add_argument("--sessions", type=int, default=20000, help="Sessions they are spread over (default: 20000)")
+    analytics.set_defaults(func=bench_analytics)
+
+    seek = subparsers.add_parser("seek", help="Line index build time and seek latency by message number or time")
+    seek.add_argument("--size-mb", type=int, default=512, help="Synthetic transcript size (default: 512)")
+    seek.add_argument("--read-body-kb", type=int, default=16, help="Size of each Read result body (default: 16)")
+    seek.add_argument("--seeks", type=int, default=200, help="Number of random seeks (default: 200)")
+    seek.set_defaults(func=bench_seek)
+
+    archive = subparsers.add_parser("archive", help="Content store dedup ratio, throughput and round trip")
+    archive.add_argument("--sessions", type=int, default=200, help="Number of synthetic sessions (default: 200)")
+    archive.add_argument("--reads", type=int, default=40, help="Read calls per session (default: 40)")
+    archive.add_argument("--files", type=int, default=100, help="Distinct source files read (default: 100)")
+    archive.set_defaults(func=bench_archive)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
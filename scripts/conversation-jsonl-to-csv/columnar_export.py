@@ -0,0 +1,302 @@
+"""
+Typed, compressed columnar archives of Claude Code conversations.
+Rows are buffered into row groups and written as Parquet when pyarrow is
+installed, otherwise as a framed format with one compressed chunk per
+column (zstd when the zstandard package is installed, else gzip), so a scan
+of a few columns only decompresses those.
+"""
+
+import gzip
+import json
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# (name, type): type is 'string', 'int64' or 'timestamp' (milliseconds since the epoch, UTC)
+COLUMNS = [
+    ('project', 'string'),
+    ('session_id', 'string'),
+    ('type', 'string'),
+    ('timestamp', 'timestamp'),
+    ('tool_name', 'string'),
+    ('description', 'string'),
+    ('content_chars', 'int64'),
+    ('tokens_est', 'int64'),
+    ('line_bytes', 'int64'),
+]
+ROW_GROUP_SIZE = 65536
+
+FRAMED_MAGIC = b"CCOLUMN1"
+ROW_GROUP_MAGIC = b"RGRP"
+FRAMED_SUFFIX = '.ccol'
+PARQUET_SUFFIX = '.parquet'
+INT64_NULL = -2 ** 63
+STRING_NULL = -1
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def available_formats():
+    """Writer formats usable in this environment"""
+    return ['parquet', 'framed'] if pyarrow is not None else ['framed']
+
+
+def available_codecs():
+    return ['zstd', 'gzip'] if zstandard is not None else ['gzip']
+
+
+def default_suffix(fmt):
+    return PARQUET_SUFFIX if fmt == 'parquet' else FRAMED_SUFFIX
+
+
+def _le(values):
+    """array contents as little-endian bytes"""
+    if not LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if not LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def encode_strings(values):
+    encoded = [None if v is None else v.encode('utf-8', 'surrogatepass') for v in values]
+    lengths = array('i', (STRING_NULL if v is None else len(v) for v in encoded))
+    return _le(lengths) + b''.join(v for v in encoded if v)
+
+
+def decode_strings(data, rows):
+    lengths = _from_le('i', data[:4 * rows])
+    blob = bytes(data[4 * rows:])
+    values = []
+    append = values.append
+    pos = 0
+    if blob.isascii():
+        # One decode for the whole chunk; byte offsets are character offsets
+        text = blob.decode('ascii')
+        for n in lengths:
+            if n < 0:
+                append(None)
+            else:
+                append(text[pos:pos + n])
+                pos += n
+        return values
+    for n in lengths:
+        if n < 0:
+            append(None)
+        else:
+            append(blob[pos:pos + n].decode('utf-8', 'surrogatepass'))
+            pos += n
+    return values
+
+
+def encode_column(kind, values):
+    """int64/timestamp: little-endian int64s. string: b'P' then int32 byte lengths and
+    UTF-8 bytes, or b'D', a distinct-value count, those values and int32 indices when
+    at most half the values are distinct (types, tools, projects, sessions)"""
+    if kind != 'string':
+        return _le(array('q', (INT64_NULL if v is None else v for v in values)))
+    distinct = {}
+    for v in values:
+        if v not in distinct:
+            distinct[v] = len(distinct)
+            if len(distinct) * 2 > len(values):
+                return b'P' + encode_strings(values)
+    return (b'D' + struct.pack('<I', len(distinct)) + encode_strings(list(distinct)) +
+            _le(array('i', (distinct[v] for v in values))))
+
+
+def decode_column(kind, data, rows):
+    if kind != 'string':
+        return [None if v == INT64_NULL else v for v in _from_le('q', data)]
+    if data[:1] == b'P':
+        return decode_strings(memoryview(data)[1:], rows)
+    count, = struct.unpack_from('<I', data, 1)
+    indices = _from_le('i', data[len(data) - 4 * rows:])
+    dictionary = decode_strings(memoryview(data)[5:len(data) - 4 * rows], count)
+    return [dictionary[i] for i in indices]
+
+
+class FramedWriter:
+    """Header (magic, JSON schema and codec), then per row group: magic, row
+    count, compressed length of each column and the compressed columns"""
+
+    def __init__(self, path, codec='zstd', level=None):
+        if codec == 'zstd' and zstandard is None:
+            raise ValueError("zstd codec requested but zstandard is not installed")
+        self.codec = codec
+        if codec == 'zstd':
+            self._compress = zstandard.ZstdCompressor(level=level or 3).compress
+        else:
+            self._compress = lambda data: gzip.compress(data, compresslevel=level or 6, mtime=0)
+        self.f = open(path, 'wb')
+        header = json.dumps({'codec': codec, 'columns': COLUMNS}).encode()
+        self.f.write(FRAMED_MAGIC + struct.pack('<I', len(header)) + header)
+
+    def write_row_group(self, columns, rows):
+        chunks = [self._compress(encode_column(kind, columns[name])) for name, kind in COLUMNS]
+        self.f.write(ROW_GROUP_MAGIC + struct.pack(f'<I{len(chunks)}I', rows, *map(len, chunks)))
+        for chunk in chunks:
+            self.f.write(chunk)
+
+    def close(self):
+        self.f.close()
+
+
+class ParquetWriter:
+    """Parquet via pyarrow, one row group per write"""
+
+    def __init__(self, path, codec='zstd', level=None):
+        types = {'string': pyarrow.string(), 'int64': pyarrow.int64(),
+                 'timestamp': pyarrow.timestamp('ms', tz='UTC')}
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in COLUMNS])
+        self.codec = codec
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression=codec,
+                                                    compression_level=level)
+
+    def write_row_group(self, columns, rows):
+        table = pyarrow.Table.from_pydict(columns, schema=self.schema)
+        self.writer.write_table(table, row_group_size=rows)
+
+    def close(self):
+        self.writer.close()
+
+
+class ArchiveWriter:
+    """Buffer rows and write them to `path` in row groups of row_group_size
+
+    Like the CSV converter, output goes to a temporary file that replaces
+    `path` only once everything was written.
+    """
+
+    def __init__(self, path, fmt='auto', codec=None, row_group_size=ROW_GROUP_SIZE, level=None):
+        if fmt == 'auto':
+            fmt = available_formats()[0]
+        if fmt == 'parquet' and pyarrow is None:
+            raise ValueError("parquet format requested but pyarrow is not installed")
+        self.path = path
+        self.format = fmt
+        self.row_group_size = max(1, row_group_size)
+        self.tmp_path = f"{path}.tmp"
+        writer_class = ParquetWriter if fmt == 'parquet' else FramedWriter
+        self.writer = writer_class(self.tmp_path, codec or available_codecs()[0], level)
+        self.codec = self.writer.codec
+        self.rows = 0
+        self.row_groups = 0
+        self._reset()
+
+    def _reset(self):
+        self.buffer = {name: [] for name, _ in COLUMNS}
+        self.buffered = 0
+
+    def append_rows(self, columns):
+        """Append a dict of equal-length column lists"""
+        count = len(columns[COLUMNS[0][0]])
+        start = 0
+        while start < count:
+            take = min(count - start, self.row_group_size - self.buffered)
+            for name, _ in COLUMNS:
+                self.buffer[name].extend(columns[name][start:start + take])
+            self.buffered += take
+            start += take
+            if self.buffered == self.row_group_size:
+                self.flush()
+
+    def flush(self):
+        if self.buffered:
+            self.writer.write_row_group(self.buffer, self.buffered)
+            self.rows += self.buffered
+            self.row_groups += 1
+            self._reset()
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        try:
+            self.writer.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def iter_framed(path, columns=None):
+    """Yield {column: values} per row group of a framed file, decompressing only `columns`"""
+    with open(path, 'rb') as f:
+        if f.read(len(FRAMED_MAGIC)) != FRAMED_MAGIC:
+            raise ValueError(f"{path} is not a framed conversation archive")
+        header_len, = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len))
+        schema = [tuple(column) for column in header['columns']]
+        if header['codec'] == 'zstd':
+            if zstandard is None:
+                raise ValueError(f"{path} is zstd-compressed but zstandard is not installed")
+            decompress = zstandard.ZstdDecompressor().decompress
+        else:
+            decompress = gzip.decompress
+        wanted = set(columns) if columns is not None else {name for name, _ in schema}
+        group_header = struct.Struct(f'<4sI{len(schema)}I')
+        while True:
+            raw = f.read(group_header.size)
+            if not raw:
+                return
+            magic, rows, *lengths = group_header.unpack(raw)
+            if magic != ROW_GROUP_MAGIC:
+                raise ValueError(f"{path}: corrupt row group header")
+            group = {}
+            for (name, kind), length in zip(schema, lengths):
+                if name in wanted:
+                    group[name] = decode_column(kind, decompress(f.read(length)), rows)
+                else:
+                    f.seek(length, os.SEEK_CUR)
+            yield group
+
+
+def iter_parquet(path, columns=None):
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    for i in range(parquet_file.num_row_groups):
+        table = parquet_file.read_row_group(i, columns=columns)
+        group = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if pyarrow.types.is_timestamp(column.type):
+                column = column.cast(pyarrow.int64())
+            group[name] = column.to_pylist()
+        yield group
+
+
+def iter_row_groups(path, columns=None):
+    """Row groups of a Parquet or framed archive as {column: list of values}"""
+    if str(path).endswith(PARQUET_SUFFIX):
+        if pyarrow is None:
+            raise ValueError("reading Parquet requires pyarrow")
+        return iter_parquet(path, columns)
+    return iter_framed(path, columns)
@@ -0,0 +1,322 @@
+"""
+Content-addressed store for the large strings in Claude Code transcripts.
+jsonl-to-csv.py archive moves every JSON string literal of at least
+MIN_BYTES raw bytes (Read results, command output, written files) into a
+SQLite store next to the projects: the literal's raw, still-escaped bytes are
+cut into content-defined chunks at line breaks, each chunk is kept once under
+its SHA-256 (zlib-compressed), and the literal becomes a short reference.
+Keeping the raw bytes means restoring gives back the original JSONL byte for
+byte. Readers expand references line by line as they go (rehydrate_lines),
+so archived transcripts are never rehydrated on disk just to be read.
+"""
+
+import hashlib
+import os
+import sqlite3
+import zlib
+from functools import lru_cache
+from urllib.parse import quote
+
+STORE_FILE = ".content-store.sqlite"
+# A JSON-escaped NUL starts every reference; literals that happen to start
+# with it are escaped (ESCAPE prefix) so restoring them is unambiguous
+MARKER = b'\\u0000ccstore:'
+REF = MARKER + b'ref:'
+ESCAPE = MARKER + b'esc:'
+DIGEST_SIZE = 32
+MIN_BYTES = 4096
+MIN_CHUNK = 2048
+MAX_CHUNK = 65536
+# Once MIN_CHUNK is reached, a line ends its chunk with probability 1/64
+BOUNDARY_MASK = 0x3F
+CHUNK_CACHE = 1024
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    hash BLOB PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    hash BLOB PRIMARY KEY,
+    size INTEGER NOT NULL,
+    chunks BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def string_end(line, start):
+    """Index of the closing quote of the JSON string literal whose body starts at start"""
+    find = line.find
+    while True:
+        end = find(b'"', start)
+        if end < 0:
+            return -1
+        # A quote preceded by an odd run of backslashes is escaped
+        k = end - 1
+        while line[k] == 0x5C:
+            k -= 1
+        if (end - 1 - k) % 2 == 0:
+            return end
+        start = end + 1
+
+
+def store_path_for(jsonl_path):
+    """<projects>/.content-store.sqlite for <projects>/<project>/<session>.jsonl"""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(jsonl_path))), STORE_FILE)
+
+
+def chunk_boundaries(body):
+    """End offsets of the content-defined chunks of a raw string body
+
+    A chunk ends after an escaped newline once it holds MIN_CHUNK bytes and
+    that line's CRC-32 matches BOUNDARY_MASK, so boundaries depend only on
+    nearby lines: a file re-read after an edit shares every chunk but the
+    edited ones. Text without line breaks is cut every MAX_CHUNK bytes.
+    """
+    ends = []
+    start = pos = 0
+    size = len(body)
+    view = memoryview(body)
+    crc32 = zlib.crc32
+    find = body.find
+    while pos < size:
+        newline = find(b'\\n', pos)
+        line_end = size if newline < 0 else newline + 2
+        while line_end - start > MAX_CHUNK:
+            start += MAX_CHUNK
+            ends.append(start)
+        if line_end - start >= MIN_CHUNK and not crc32(view[pos:line_end]) & BOUNDARY_MASK:
+            ends.append(line_end)
+            start = line_end
+        pos = line_end
+    if start < size:
+        ends.append(size)
+    return ends
+
+
+def _opening_quote(line, pos):
+    """Whether line[pos - 1] is an unescaped quote, i.e. line[pos] starts a string body
+
+    After a closing quote JSON only allows , : ] } or whitespace, so an
+    unescaped quote directly before a backslash always opens a string.
+    """
+    if pos == 0 or line[pos - 1] != 0x22:
+        return False
+    k = pos - 2
+    while k >= 0 and line[k] == 0x5C:
+        k -= 1
+    return (pos - 2 - k) % 2 == 0
+
+
+class ContentStore:
+    """SQLite chunk and blob tables; blobs list their chunks' digests in order"""
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(path)
+            self.conn.executescript(SCHEMA)
+        self._chunk = lru_cache(maxsize=CHUNK_CACHE)(self._load_chunk)
+        self.stats = {'blobs': 0, 'blob_hits': 0, 'chunks': 0, 'chunk_hits': 0,
+                      'logical_bytes': 0, 'unique_bytes': 0, 'stored_bytes': 0}
+
+    def put(self, body):
+        """Store a raw string body, returning its digest"""
+        digest = hashlib.sha256(body).digest()
+        stats = self.stats
+        stats['blobs'] += 1
+        stats['logical_bytes'] += len(body)
+        execute = self.conn.execute
+        if execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone():
+            stats['blob_hits'] += 1
+            return digest
+        view = memoryview(body)
+        digests = []
+        start = 0
+        for end in chunk_boundaries(body):
+            chunk = view[start:end]
+            chunk_digest = hashlib.sha256(chunk).digest()
+            digests.append(chunk_digest)
+            stats['chunks'] += 1
+            if execute("SELECT 1 FROM chunks WHERE hash = ?", (chunk_digest,)).fetchone():
+                stats['chunk_hits'] += 1
+            else:
+                data = zlib.compress(chunk)
+                execute("INSERT INTO chunks VALUES (?, ?, ?)", (chunk_digest, end - start, data))
+                stats['unique_bytes'] += end - start
+                stats['stored_bytes'] += len(data)
+            start = end
+        execute("INSERT INTO blobs VALUES (?, ?, ?)", (digest, len(body), b''.join(digests)))
+        return digest
+
+    def _load_chunk(self, digest):
+        row = self.conn.execute("SELECT data FROM chunks WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"chunk {digest.hex()} missing from {self.path}")
+        return zlib.decompress(row[0])
+
+    def get(self, digest):
+        """Raw body of a blob, from cached chunks where possible"""
+        row = self.conn.execute("SELECT chunks FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"blob {digest.hex()} missing from {self.path}")
+        chunks = row[0]
+        return b''.join(self._chunk(chunks[i:i + DIGEST_SIZE]) for i in range(0, len(chunks), DIGEST_SIZE))
+
+    def archive_line(self, line, min_bytes=MIN_BYTES):
+        """line with every string body of at least min_bytes raw bytes replaced by a reference
+
+        Lines that are not complete JSON are returned unchanged.
+        """
+        parts = []
+        copy_from = scan = 0
+        find = line.find
+        while True:
+            opening = find(b'"', scan)
+            if opening < 0:
+                break
+            body_start = opening + 1
+            end = string_end(line, body_start)
+            if end < 0:
+                return line
+            if end - body_start >= min_bytes:
+                parts.append(line[copy_from:body_start])
+                parts.append(REF + self.put(line[body_start:end]).hex().encode())
+                copy_from = end
+            elif line.startswith(MARKER, body_start):
+                parts.append(line[copy_from:body_start])
+                parts.append(ESCAPE)
+                copy_from = body_start
+            scan = end + 1
+        if not parts:
+            return line
+        parts.append(line[copy_from:])
+        return b''.join(parts)
+
+    def rehydrate_line(self, line):
+        """Inverse of archive_line"""
+        pos = line.find(MARKER)
+        if pos < 0:
+            return line
+        parts = []
+        copy_from = 0
+        while pos >= 0:
+            if _opening_quote(line, pos):
+                if line.startswith(REF, pos):
+                    digest_end = pos + len(REF) + 2 * DIGEST_SIZE
+                    parts.append(line[copy_from:pos])
+                    parts.append(self.get(bytes.fromhex(line[pos + len(REF):digest_end].decode('ascii'))))
+                    copy_from = digest_end
+                elif line.startswith(ESCAPE, pos):
+                    parts.append(line[copy_from:pos])
+                    copy_from = pos + len(ESCAPE)
+            pos = line.find(MARKER, pos + 1)
+        parts.append(line[copy_from:])
+        return b''.join(parts)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+_readers = {}
+
+
+def open_store(path):
+    """Shared read-only store for rehydrating, one per path and process"""
+    store = _readers.get(path)
+    if store is None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"transcript references content store {path}, which does not exist")
+        store = _readers[path] = ContentStore(path, readonly=True)
+    return store
+
+
+def rehydrate_lines(lines, jsonl_path):
+    """Lines of transcript jsonl_path with store references expanded as they are read"""
+    store = None
+    for line in lines:
+        if MARKER in line:
+            if store is None:
+                store = open_store(store_path_for(jsonl_path))
+            line = store.rehydrate_line(line)
+        yield line
+
+
+def _rewrite(path, transform, check=None):
+    """Replace path with transform(line) for each line, keeping its mode and times
+
+    check(tmp_path) may reject the new file before it replaces path. Returns (old size, new size), or None when no line changed.
+    """
+    st = os.stat(path)
+    tmp = f"{path}.store.tmp"
+    changed = False
+    try:
+        with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+            for line in src:
+                new = transform(line)
+                changed = changed or (new is not line and new != line)
+                dst.write(new)
+        if not changed:
+            os.remove(tmp)
+            return None
+        if check is not None:
+            check(tmp)
+        now = os.stat(path)
+        if (now.st_size, now.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+            raise ValueError("transcript changed while it was being rewritten")
+        os.chmod(tmp, st.st_mode)
+        os.replace(tmp, path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return st.st_size, os.path.getsize(path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def archive_file(store, path, min_bytes=MIN_BYTES):
+    """Move the large strings of one transcript into store, rewriting it with references
+
+    Already archived lines are rehydrated first, so archiving is idempotent.
+    The store is committed and the rewritten file read back and rehydrated
+    before it replaces the original, which must match byte for byte.
+    """
+    def archive(line):
+        return store.archive_line(store.rehydrate_line(line), min_bytes)
+
+    def verify(tmp):
+        store.commit()
+        rehydrated, original = hashlib.sha256(), hashlib.sha256()
+        with open(tmp, 'rb') as f:
+            for line in f:
+                rehydrated.update(store.rehydrate_line(line))
+        with open(path, 'rb') as f:
+            for line in f:
+                original.update(store.rehydrate_line(line))
+        if rehydrated.digest() != original.digest():
+            raise ValueError("archived transcript does not rehydrate to the original, left unchanged")
+
+    try:
+        return _rewrite(path, archive, verify)
+    finally:
+        store.commit()
+
+
+def restore_file(path):
+    """Rehydrate one archived transcript in place; the store is only opened if it has references"""
+    store = None
+
+    def restore(line):
+        nonlocal store
+        if MARKER not in line:
+            return line
+        if store is None:
+            store = open_store(store_path_for(path))
+        return store.rehydrate_line(line)
+
+    return _rewrite(path, restore)
@@ -0,0 +1,195 @@
+"""
+Full-text search over Claude Code conversation history.
+Maintains an incrementally updated SQLite FTS5 inverted index of every
+transcript under ~/.claude/projects, ranked with BM25.
+"""
+
+import os
+import re
+import sqlite3
+import time
+
+import content_store
+
+INDEX_FILE = ".conversation-search.sqlite"
+# Messages per indexed chunk: small enough for useful snippets, large enough to keep row counts low
+CHUNK_MESSAGES = 50
+MAX_MESSAGE_CHARS = 4000
+QUERY_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    tail BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    session TEXT NOT NULL,
+    project TEXT NOT NULL,
+    started TEXT,
+    ended TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    text, content='chunks', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+TAIL_BYTES = 64
+
+def iter_transcripts(base_dir):
+    """Yield <base_dir>/<project>/*.jsonl paths"""
+    with os.scandir(base_dir) as projects:
+        for project in projects:
+            if not project.is_dir():
+                continue
+            with os.scandir(project.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.jsonl') and entry.is_file():
+                        yield entry.path
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching all words (prefix match on the last one)"""
+    tokens = QUERY_TOKEN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+class SearchIndex:
+    """SQLite FTS5 index of conversation text, updated by appending new lines only"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def update(self, base_dir, decode, extract_text):
+        """Index lines appended since the last update; rewritten files are reindexed
+
+        decode turns a raw line into a message and extract_text returns the
+        searchable text of a message ('' to skip it). Returns a stats dict.
+        """
+        start = time.perf_counter()
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, inode, offset, tail FROM files")}
+        seen = set()
+        stats = {'files': 0, 'updated_files': 0, 'messages': 0, 'bytes': 0}
+
+        with self.conn:
+            for path in iter_transcripts(base_dir):
+                seen.add(path)
+                stats['files'] += 1
+                st = os.stat(path)
+                old = known.get(path)
+                if old and old[0] == st.st_ino and old[1] == st.st_size:
+                    continue
+                with open(path, 'rb') as f:
+                    offset = old[1] if old and self._can_resume(old, st, f) else 0
+                    if offset == 0 and old:
+                        self.conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                    f.seek(offset)
+                    new_offset, messages = self._index_lines(f, offset, path, decode, extract_text)
+                    tail_start = max(0, new_offset - TAIL_BYTES)
+                    f.seek(tail_start)
+                    tail = f.read(new_offset - tail_start)
+                self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                  (path, st.st_ino, new_offset, tail))
+                stats['updated_files'] += 1
+                stats['messages'] += messages
+                stats['bytes'] += new_offset - offset
+
+            for path in set(known) - seen:
+                self.conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+    @staticmethod
+    def _can_resume(old, st, f):
+        inode, offset, tail = old
+        if inode != st.st_ino or offset > st.st_size:
+            return False
+        f.seek(offset - len(tail))
+        return f.read(len(tail)) == tail
+
+    def _index_lines(self, f, offset, path, decode, extract_text):
+        """Index complete lines from the current position, returning (new_offset, messages)"""
+        session = os.path.basename(path)[:-len('.jsonl')]
+        project = os.path.basename(os.path.dirname(path))
+        texts, started, ended = [], None, None
+        messages = 0
+
+        def flush():
+            if texts:
+                self.conn.execute(
+                    "INSERT INTO chunks (path, session, project, started, ended, text) VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, session, project, started, ended, '\n'.join(texts)))
+
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            if not line.strip():
+                continue
+            if content_store.MARKER in line:
+                line = content_store.open_store(content_store.store_path_for(path)).rehydrate_line(line)
+            try:
+                msg = decode(line)
+            except ValueError:
+                continue
+            if not isinstance(msg, dict):
+                continue
+            text = extract_text(msg)
+            if not text:
+                continue
+            messages += 1
+            timestamp = msg.get('timestamp')
+            started = started or timestamp
+            ended = timestamp or ended
+            texts.append(text[:MAX_MESSAGE_CHARS])
+            if len(texts) >= CHUNK_MESSAGES:
+                flush()
+                texts, started, ended = [], None, None
+        flush()
+        return offset, messages
+
+    def search(self, query, limit=10, raw=False):
+        """Best-ranked sessions for query as dicts, one per session"""
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+        # Rank first and build snippets only for the winners: snippet() is far
+        # more expensive than bm25 and would otherwise run for every match
+        ranked = self.conn.execute(
+            "SELECT rowid, rank FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit * 5)).fetchall()
+        results = {}
+        for rowid, rank in ranked:
+            session, project, started, ended = self.conn.execute(
+                "SELECT session, project, started, ended FROM chunks WHERE id = ?", (rowid,)).fetchone()
+            hit = results.get(session)
+            if hit is not None:
+                hit['hits'] += 1
+                continue
+            if len(results) >= limit:
+                continue
+            snippet = self.conn.execute(
+                "SELECT snippet(chunks_fts, 0, '[', ']', '…', 16) FROM chunks_fts "
+                "WHERE chunks_fts MATCH ? AND rowid = ?", (match, rowid)).fetchone()[0]
+            results[session] = {'session': session, 'project': project, 'started': started,
+                                'ended': ended, 'snippet': snippet, 'score': -rank, 'hits': 1}
+        return list(results.values())
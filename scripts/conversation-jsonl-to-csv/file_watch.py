@@ -0,0 +1,166 @@
+"""
+Change detection for JSONL transcripts.
+Uses Linux inotify through ctypes when available, otherwise polls with os.scandir.
+No external processes are spawned in either mode.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+SKIP_DIRS = {'csv-minified'}
+
+def iter_watch_dirs(root):
+    """Yield root and every subdirectory that can contain transcripts"""
+    yield root
+    try:
+        with os.scandir(root) as entries:
+            subdirs = [e.path for e in entries
+                       if e.is_dir(follow_symlinks=False) and e.name not in SKIP_DIRS]
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from iter_watch_dirs(subdir)
+
+def scan_jsonl(root):
+    """Map every .jsonl path under root to its (mtime_ns, size) fingerprint"""
+    files = {}
+    for directory in iter_watch_dirs(root):
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.jsonl') and entry.is_file():
+                        st = entry.stat()
+                        files[entry.path] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+    return files
+
+class InotifyWatcher:
+    """Recursive inotify watch reporting changed .jsonl paths"""
+
+    name = 'inotify'
+
+    def __init__(self, root):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.dirs = {}
+        try:
+            for directory in iter_watch_dirs(root):
+                self.add_dir(directory)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def add_dir(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOSPC, errno.ENOMEM):
+                raise OSError(err, "inotify watch limit reached (see fs.inotify.max_user_watches)")
+            return
+        self.dirs[wd] = directory
+
+    def read_changes(self, timeout):
+        """Block up to timeout seconds (None = forever) and return changed .jsonl paths"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        pos = 0
+        while pos < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b'\0').decode(errors='surrogateescape')
+            pos += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so report everything and let the caller sort it out
+                changed.update(scan_jsonl(self.root))
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in SKIP_DIRS:
+                    # New project directory: watch it and pick up files created before the watch existed
+                    for new_dir in iter_watch_dirs(path):
+                        self.add_dir(new_dir)
+                    changed.update(scan_jsonl(path))
+            elif name.endswith('.jsonl'):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Portable fallback comparing scandir fingerprints every interval seconds"""
+
+    name = 'polling'
+
+    def __init__(self, root, interval=2.0):
+        self.root = root
+        self.interval = interval
+        self.files = scan_jsonl(root)
+        self.next_scan = time.monotonic() + interval
+
+    def read_changes(self, timeout):
+        """Sleep until the next scan (or timeout) and return changed .jsonl paths"""
+        delay = self.next_scan - time.monotonic()
+        if timeout is not None and timeout < delay:
+            time.sleep(max(0, timeout))
+            return set()
+        time.sleep(max(0, delay))
+        self.next_scan = time.monotonic() + self.interval
+
+        current = scan_jsonl(self.root)
+        changed = {path for path, fingerprint in current.items()
+                   if self.files.get(path) != fingerprint}
+        self.files = current
+        return changed
+
+    def close(self):
+        pass
+
+def open_watcher(root, poll_interval=2.0, force_polling=False):
+    """Return an InotifyWatcher, or a PollingWatcher when inotify is unavailable"""
+    if not force_polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, poll_interval)
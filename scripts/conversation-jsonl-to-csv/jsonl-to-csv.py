@@ -4,32 +4,26 @@ Convert Claude Code JSONL conversation files to compact CSV format with smart tr
 Read file responses are trimmed to 150 chars, other content is trimmed to 500 chars.
 """
 
+import argparse
 import json
 import csv
 import sys
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
-def is_read_tool_call(msg):
-    """Check if a message is a Read tool call"""
-    if msg.get('type') != 'assistant':
-        return False
-
-    content = msg.get('message', {}).get('content')
-    if not content:
-        return False
+import content_store
+import line_index
+from content_store import rehydrate_lines, string_end
+from line_index import is_read_tool_call, parse_timestamp_ms, track_read_response
 
-    # Handle string content
-    if isinstance(content, str):
-        return 'Tool: Read file_path=' in content
-
-    # Handle array content
-    if isinstance(content, list) and len(content) > 0:
-        first_item = content[0]
-        return (first_item.get('type') == 'tool_use' and
-                first_item.get('name') == 'Read')
-
-    return False
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def extract_description(msg, is_read_response=False):
     """Extract description from a message, with smart trimming"""
@@ -93,31 +87,159 @@ def extract_description(msg, is_read_response=False):
 
     return "Empty content array"
 
-def process_jsonl(input_file, output_file):
-    """Process JSONL file and convert to CSV with smart trimming"""
+def extract_search_text(msg):
+    """Untrimmed user/assistant text and tool names/parameters for the search index
 
-    # Read all messages
-    messages = []
-    with open(input_file, 'r') as f:
-        for line in f:
-            if line.strip():
-                messages.append(json.loads(line))
+    Covers the fields extract_description understands, minus tool results
+    (file bodies and command output would swamp the index).
+    """
+    if msg.get('type') not in ('user', 'assistant'):
+        return ''
+    message = msg.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    if isinstance(content, str):
+        return content
+    if not isinstance(content, list):
+        return ''
 
-    # Track pending Read responses
-    pending_read_count = 0
-    csv_rows = []
+    parts = []
+    for item in content:
+        if not isinstance(item, dict):
+            continue
+        if item.get('type') == 'text' and isinstance(item.get('text'), str):
+            parts.append(item['text'])
+        elif item.get('type') == 'tool_use' and item.get('name'):
+            tool_input = item.get('input') or {}
+            params = ' '.join(f"{k}={v}" for k, v in tool_input.items()) if isinstance(tool_input, dict) else ''
+            parts.append(f"Tool: {item['name']} {params}")
+    return '\n'.join(parts)
 
-    for msg in messages:
-        # Check if this is a Read tool call
-        if is_read_tool_call(msg):
-            pending_read_count += 1
+# Lines shorter than this are decoded directly; the prefilter only pays off on big tool results
+PREFILTER_MIN_LINE = 8192
+# String literals longer than this many raw bytes are cut before decoding
+PREFILTER_KEEP_BYTES = 8192
+# Never cut below this: at worst 12 raw bytes (a \uXXXX surrogate pair) decode to one
+# character, so 6144 bytes still leave more than the 500 chars any description keeps
+PREFILTER_MIN_KEEP = 6144
+
+def shrink_long_strings(line):
+    """Cut long JSON string literals in a raw line without decoding it
+
+    Returns the line unchanged when nothing was cut. Cuts never split an
+    escape sequence or a UTF-8 character, so the result is still valid JSON
+    unless a surrogate pair got separated (decoders then fall back).
+    """
+    parts = []
+    copy_from = scan = 0
+    find = line.find
+    while True:
+        quote = find(b'"', scan)
+        if quote < 0:
+            break
+        end = string_end(line, quote + 1)
+        if end < 0:
+            return line
+        if end - quote - 1 > PREFILTER_KEEP_BYTES:
+            cut = quote + 1 + PREFILTER_KEEP_BYTES
+            backslash = line.rfind(b'\\', cut - 6, cut)
+            if backslash >= 0:
+                # Back up to the start of the backslash run, which is always an escape boundary
+                while line[backslash - 1] == 0x5C:
+                    backslash -= 1
+                cut = backslash
+            while line[cut] & 0xC0 == 0x80:
+                cut -= 1
+            if cut - quote - 1 >= PREFILTER_MIN_KEEP:
+                parts.append(line[copy_from:cut])
+                copy_from = end
+        scan = end + 1
+    if not parts:
+        return line
+    parts.append(line[copy_from:])
+    return b''.join(parts)
 
-        # Check if this is a Read response
-        is_read_response = (msg.get('type') == 'user' and pending_read_count > 0)
+def first_tool_use(msg):
+    """The tool_use item whose input extract_description prints in full, if any"""
+    message = msg.get('message')
+    content = message.get('content') if isinstance(message, dict) else None
+    if (isinstance(content, list) and len(content) > 0 and
+            isinstance(content[0], dict) and content[0].get('type') == 'tool_use'):
+        return content[0]
+    return None
+
+def needs_full_message(msg):
+    """Whether the CSV row could depend on text beyond the prefilter cut
+
+    Tool calls print their whole input, and Read detection searches
+    assistant string content, so those messages are decoded in full.
+    """
+    if not isinstance(msg, dict) or msg.get('type') == 'assistant':
+        return True
+    return first_tool_use(msg) is not None
+
+def contains_float(value):
+    if isinstance(value, float):
+        return True
+    if isinstance(value, dict):
+        return any(contains_float(v) for v in value.values())
+    if isinstance(value, list):
+        return any(contains_float(v) for v in value)
+    return False
 
-        # If it's a Read response, decrement the counter
-        if is_read_response:
-            pending_read_count -= 1
+def available_decoders():
+    """Decoder backends usable in this environment"""
+    return ['json', 'orjson'] if orjson is not None else ['json']
+
+@lru_cache(maxsize=None)
+def get_decoder(backend='auto', prefilter=True):
+    """Build a line decoder: orjson when installed (or requested), stdlib json otherwise
+
+    Any line orjson rejects (NaN, lone surrogates) is retried with the
+    stdlib, so error messages match plain json.loads. orjson also turns
+    integers beyond 64 bits into floats, so printed tool inputs holding
+    floats are decoded again with the stdlib to keep the output identical.
+    """
+    if backend == 'auto':
+        backend = 'orjson' if orjson is not None else 'json'
+    if backend == 'orjson' and orjson is None:
+        raise ValueError("orjson backend requested but orjson is not installed")
+    loads = orjson.loads if backend == 'orjson' else json.loads
+
+    def decode(line):
+        if prefilter and len(line) >= PREFILTER_MIN_LINE:
+            small = shrink_long_strings(line)
+            if small is not line:
+                try:
+                    msg = loads(small)
+                    if not needs_full_message(msg):
+                        return msg
+                except ValueError:
+                    pass
+        try:
+            msg = loads(line)
+        except ValueError:
+            if loads is json.loads:
+                raise
+            return json.loads(line)
+        if loads is not json.loads and isinstance(msg, dict):
+            tool_use = first_tool_use(msg)
+            if tool_use is not None and contains_float(tool_use.get('input')):
+                return json.loads(line)
+        return msg
+
+    return decode
+
+def iter_messages(lines, decode=None):
+    """Parse JSONL lines lazily, skipping blank lines"""
+    decode = decode or get_decoder()
+    for line in lines:
+        if line.strip():
+            yield decode(line)
+
+def iter_csv_rows(messages, state):
+    """Yield CSV rows for messages, tracking pending Read responses in state"""
+    for msg in messages:
+        is_read_response = track_read_response(msg, state)
 
         # Extract description with appropriate trimming
         description = extract_description(msg, is_read_response)
@@ -125,30 +247,221 @@ def process_jsonl(input_file, output_file):
         # Clean up description for CSV
         description = description.replace('\n', ' ').replace('\r', '').replace('"', '""')
 
-        # Add row
-        csv_rows.append({
+        yield {
             'type': msg.get('type', ''),
             'timestamp': msg.get('timestamp', ''),
             'description': description
-        })
+        }
+
+CSV_FIELDS = ['type', 'timestamp', 'description']
+CHECKPOINT_TAIL_BYTES = 64
+
+def process_jsonl(input_file, output_file, verbose=True, decode=None):
+    """Process JSONL file and convert to CSV with smart trimming
+
+    Messages are streamed one line at a time, so memory stays flat regardless
+    of input size. Rows go to a temporary file that replaces the output only
+    once the whole input parsed, so a bad line never leaves a partial CSV.
+    """
+    state = {'pending_read_count': 0}
+    tmp_file = f"{output_file}.tmp"
+
+    try:
+        with open(input_file, 'rb') as src, open(tmp_file, 'w', newline='') as dst:
+            writer = csv.DictWriter(dst, fieldnames=CSV_FIELDS)
+            writer.writerows(iter_csv_rows(iter_messages(rehydrate_lines(src, input_file), decode), state))
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+    if verbose:
+        print_stats(input_file, output_file)
+
+def checkpoint_path(output_file):
+    """Sidecar checkpoint stored next to the CSV"""
+    return f"{output_file}.checkpoint.json"
+
+def load_checkpoint(output_file):
+    """Load the incremental checkpoint for output_file, or None if missing/corrupt"""
+    try:
+        with open(checkpoint_path(output_file), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(output_file, checkpoint):
+    """Atomically write the incremental checkpoint for output_file"""
+    path = checkpoint_path(output_file)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(f"{path}.tmp", path)
 
-    # Write CSV
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['type', 'timestamp', 'description'])
-        for row in csv_rows:
-            writer.writerow(row)
+def iter_complete_lines(src, state):
+    """Yield newline-terminated lines, advancing state['offset'] past each one
 
-    # Print stats
+    A trailing line without a newline is still being written by Claude Code,
+    so it is left for the next run.
+    """
+    for line in src:
+        if not line.endswith(b'\n'):
+            break
+        state['offset'] += len(line)
+        yield line
+
+def can_resume(checkpoint, input_stat, src, output_file):
+    """Check that input only grew and the CSV is untouched since the checkpoint"""
+    if not checkpoint or not os.path.exists(output_file):
+        return False
+    offset = checkpoint.get('offset', 0)
+    if (checkpoint.get('inode') != input_stat.st_ino or
+            offset > input_stat.st_size or
+            checkpoint.get('csv_size') != os.path.getsize(output_file)):
+        return False
+
+    # Same inode and size can still hide a rewrite, so compare the bytes before the offset
+    tail = bytes.fromhex(checkpoint.get('tail', ''))
+    src.seek(offset - len(tail))
+    return src.read(len(tail)) == tail
+
+def process_jsonl_incremental(input_file, output_file, verbose=True, decode=None):
+    """Append rows for lines added since the last run, rebuilding if the input was rewritten
+
+    The checkpoint records the byte offset already converted, the input
+    inode/size fingerprint and the pending Read state, so a growing
+    transcript costs only the newly appended lines on each run.
+    """
+    input_stat = os.stat(input_file)
+    checkpoint = load_checkpoint(output_file)
+
+    with open(input_file, 'rb') as src:
+        resume = can_resume(checkpoint, input_stat, src, output_file)
+        if resume:
+            state = {'offset': checkpoint['offset'],
+                     'pending_read_count': checkpoint['pending_read_count']}
+            dst_file, mode = output_file, 'a'
+        else:
+            state = {'offset': 0, 'pending_read_count': 0}
+            dst_file, mode = f"{output_file}.tmp", 'w'
+        src.seek(state['offset'])
+        start_offset = state['offset']
+
+        try:
+            with open(dst_file, mode, newline='') as dst:
+                writer = csv.DictWriter(dst, fieldnames=CSV_FIELDS)
+                lines = rehydrate_lines(iter_complete_lines(src, state), input_file)
+                writer.writerows(iter_csv_rows(iter_messages(lines, decode), state))
+            if not resume:
+                os.replace(dst_file, output_file)
+        except BaseException:
+            if not resume and os.path.exists(dst_file):
+                os.remove(dst_file)
+            raise
+
+        tail_start = max(0, state['offset'] - CHECKPOINT_TAIL_BYTES)
+        src.seek(tail_start)
+        tail = src.read(state['offset'] - tail_start)
+
+    save_checkpoint(output_file, {
+        'offset': state['offset'],
+        'inode': input_stat.st_ino,
+        'size': input_stat.st_size,
+        'pending_read_count': state['pending_read_count'],
+        'csv_size': os.path.getsize(output_file),
+        'tail': tail.hex()
+    })
+
+    if verbose:
+        if resume:
+            print(f"➕ Appended {state['offset'] - start_offset} new bytes of input")
+        else:
+            print("🔁 Full rebuild (no valid checkpoint)")
+        print_stats(input_file, output_file)
+    return resume
+
+def process_jsonl_selection(input_file, output_file, start=None, stop=None, since_ms=None,
+                            verbose=True, decode=None, raw=False):
+    """Convert only messages start..stop - 1 (Python slice numbering) at or after since_ms
+
+    The transcript's line index (line_index.py) locates the first selected
+    message by binary search and slices lines from a memory map, so nothing
+    before it is read. The index also holds the pending Read state before
+    the selection, and it is tracked through messages dropped by since_ms,
+    so rows are trimmed exactly as in a full conversion. With raw, the selected JSONL lines are
+    copied instead (output_file None means stdout), in one zero-copy write
+    unless lines must be filtered or hold content store references.
+    """
+    decode = decode or get_decoder()
+    with line_index.open_index(input_file) as index:
+        start, stop = index.select(start, stop, since_ms)
+        lines = index.lines(start, stop, since_ms)
+        if raw:
+            dst = open(output_file, 'wb') if output_file else sys.stdout.buffer
+            try:
+                if since_ms is None and not index.contains(content_store.MARKER, start, stop):
+                    dst.write(index.raw(start, stop))
+                else:
+                    for line in rehydrate_lines(map(bytes, lines), input_file):
+                        dst.write(line)
+            finally:
+                if output_file:
+                    dst.close()
+                else:
+                    dst.flush()
+            return start, stop
+
+        state = {'pending_read_count': index.pending_reads(start)}
+        # Out-of-order messages that since_ms drops still update the Read state
+        kept = [since_ms is None or index.timestamp(n) is None or index.timestamp(n) >= since_ms
+                for n in range(start, stop)]
+        tmp_file = f"{output_file}.tmp"
+        try:
+            with open(tmp_file, 'w', newline='') as dst:
+                writer = csv.DictWriter(dst, fieldnames=CSV_FIELDS)
+                lines = rehydrate_lines(map(bytes, index.lines(start, stop)), input_file)
+                rows = iter_csv_rows(iter_messages(lines, decode), state)
+                writer.writerows(row for row, keep in zip(rows, kept) if keep)
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        total = len(index)
+
+    if verbose:
+        print(f"✅ Converted messages {start}:{stop} of {total}")
+        print(f"   Output: {output_file}")
+    return start, stop
+
+def parse_range(value):
+    """START:END message numbers (either may be empty or negative) → (start, stop)"""
+    start, sep, stop = value.partition(':')
+    try:
+        if not sep:
+            raise ValueError
+        return (int(start) if start else None, int(stop) if stop else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid range '{value}', expected START:END like 50000:50100")
+
+def parse_since(value):
+    ms = parse_timestamp_ms(value)
+    if ms is None:
+        raise argparse.ArgumentTypeError(f"invalid timestamp '{value}', expected ISO 8601 (UTC unless an offset is given)")
+    return ms
+
+def format_size(size):
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024.0:
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.0f}{unit}"
+        size /= 1024.0
+    return f"{size:.0f}GB"
+
+def print_stats(input_file, output_file):
+    """Print input/output sizes and compression"""
     input_size = os.path.getsize(input_file)
     output_size = os.path.getsize(output_file)
 
-    def format_size(size):
-        for unit in ['B', 'KB', 'MB']:
-            if size < 1024.0:
-                return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.0f}{unit}"
-            size /= 1024.0
-        return f"{size:.0f}GB"
-
     print(f"✅ Conversion complete!")
     print(f"   Original: {format_size(input_size)}")
     print(f"   CSV: {format_size(output_size)}")
@@ -156,22 +469,739 @@ def process_jsonl(input_file, output_file):
     compression = (1 - output_size/input_size) * 100
     print(f"   Compression: {compression:.0f}%")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python jsonl-to-csv.py /path/to/input.jsonl [/path/to/output.csv]")
-        print("Converts Claude Code JSONL conversation files to compact CSV format")
-        print("Smart trimming: Read file responses → 150 chars, other content → 500 chars")
+def add_decoder_arguments(parser):
+    parser.add_argument("--decoder", choices=['auto'] + available_decoders(), default='auto',
+                        help="JSON decoder backend (default: orjson when installed, else json)")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Decode every line in full instead of cutting huge tool results first")
+
+def discover_jsonl_files(base_dir):
+    """Find <base_dir>/<project>/*.jsonl in a single scandir pass
+
+    Returns (jsonl_path, csv_path, size, needs_conversion) tuples. A file is
+    skipped when its CSV in csv-minified/ already exists and is newer.
+    """
+    found = []
+    with os.scandir(base_dir) as projects:
+        for project in projects:
+            if not project.is_dir() or project.name == 'csv-minified':
+                continue
+            csv_mtimes = {}
+            try:
+                with os.scandir(os.path.join(project.path, 'csv-minified')) as csvs:
+                    for entry in csvs:
+                        if entry.name.endswith('.csv'):
+                            csv_mtimes[entry.name] = entry.stat().st_mtime
+            except OSError:
+                pass
+            with os.scandir(project.path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.jsonl') or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    csv_name = entry.name[:-len('.jsonl')] + '.csv'
+                    csv_path = os.path.join(project.path, 'csv-minified', csv_name)
+                    needs_conversion = csv_mtimes.get(csv_name, -1) <= st.st_mtime
+                    found.append((entry.path, csv_path, st.st_size, needs_conversion))
+    return found
+
+def convert_for_batch(jsonl_path, csv_path, decoder='auto', prefilter=True):
+    """Worker: convert one file, returning (jsonl_path, csv_size, error)"""
+    try:
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        process_jsonl(jsonl_path, csv_path, verbose=False, decode=get_decoder(decoder, prefilter))
+        return jsonl_path, os.path.getsize(csv_path), None
+    except Exception as e:
+        return jsonl_path, 0, str(e)
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py batch",
+        description="Convert every <project>/*.jsonl under a base directory to <project>/csv-minified/*.csv")
+    parser.add_argument("base_dir", nargs="?", default=os.path.expanduser("~/.claude/projects"),
+                        help="Base directory (default: ~/.claude/projects)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    add_decoder_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.base_dir):
+        print(f"Error: Base directory '{args.base_dir}' not found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    print(f"🚀 Starting batch conversion of JSONL files")
+    print(f"Base directory: {args.base_dir}")
+    workers = max(1, args.workers)
+    print(f"Workers: {workers}")
+    print("")
+
+    files = discover_jsonl_files(args.base_dir)
+    todo = [f for f in files if f[3]]
+    skipped = len(files) - len(todo)
+    sizes = {jsonl_path: size for jsonl_path, _, size, _ in files}
+    print(f"🔍 Found {len(files)} JSONL files ({len(todo)} to convert, {skipped} up to date)")
+
+    converted = failed = 0
+    original_total = csv_total = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Largest files first so one huge transcript doesn't finish last alone
+        futures = [pool.submit(convert_for_batch, jsonl_path, csv_path, args.decoder, not args.no_prefilter)
+                   for jsonl_path, csv_path, _, _ in sorted(todo, key=lambda f: -f[2])]
+        for future in as_completed(futures):
+            jsonl_path, csv_size, error = future.result()
+            name = os.path.basename(jsonl_path)
+            if error:
+                failed += 1
+                print(f"   ❌ Failed: {name}: {error}")
+                continue
+            converted += 1
+            original_size = sizes[jsonl_path]
+            original_total += original_size
+            csv_total += csv_size
+            reduction = (1 - csv_size / original_size) * 100 if original_size else 0
+            print(f"   ✅ {name}: {format_size(original_size)} → {format_size(csv_size)} ({reduction:.0f}% reduction)")
+
+    duration = time.perf_counter() - start
+    print("")
+    print(f"📊 Final Statistics:")
+    print(f"   Converted: {converted}, Skipped: {skipped}, Failed: {failed}")
+    if converted:
+        print(f"   Original: {format_size(original_total)} → CSV: {format_size(csv_total)}")
+        print(f"   Compression: {(1 - csv_total / original_total) * 100 if original_total else 0:.0f}%")
+    print(f"   Processing time: {duration:.2f}s")
+    print(f"   Throughput: {original_total / 1024 / 1024 / duration:.1f} MB/s, {converted / duration:.1f} files/s")
+
+    if failed:
         sys.exit(1)
 
-    input_file = sys.argv[1]
+def csv_path_for(jsonl_path):
+    """<dir>/<name>.jsonl → <dir>/csv-minified/<name>.csv"""
+    directory, name = os.path.split(jsonl_path)
+    return os.path.join(directory, 'csv-minified', name[:-len('.jsonl')] + '.csv')
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def changed_since_checkpoint(jsonl_path, size):
+    """Whether jsonl_path has an incremental checkpoint that no longer matches its size"""
+    checkpoint = load_checkpoint(csv_path_for(jsonl_path))
+    return checkpoint is not None and checkpoint.get('size') != size
+
+def watch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py watch",
+        description="Watch a directory tree and incrementally convert changed JSONL files to csv-minified/*.csv")
+    parser.add_argument("watch_dir", nargs="?", default=".", help="Directory to watch (default: current directory)")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="Seconds a file must be quiet before converting (default: 0.5)")
+    parser.add_argument("--max-delay", type=float, default=5.0,
+                        help="Convert at least this often during continuous writes (default: 5)")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Scan interval when inotify is unavailable (default: 2)")
+    parser.add_argument("--poll", action="store_true", help="Force the polling fallback")
+    parser.add_argument("--stats-interval", type=float, default=300,
+                        help="Seconds between latency/CPU reports, 0 to report only on exit (default: 300)")
+    args = parser.parse_args(argv)
+
+    import file_watch
+
+    watch_dir = os.path.abspath(args.watch_dir)
+    watcher = file_watch.open_watcher(watch_dir, args.poll_interval, args.poll)
+    print(f"📁 Watching directory: {watch_dir}")
+    print(f"🔄 Backend: {watcher.name}, debounce: {args.debounce}s")
+    print(f"✅ Ready! Monitoring for JSONL file changes...")
+    print(f"Press Ctrl+C to stop")
+    print("")
+
+    # path -> (first change seen, last change seen). Like the old polling loop, files are only
+    # converted when they change; the exception is a checkpointed transcript that grew while the
+    # watcher was not running, which is caught up (incrementally) at startup.
+    now = time.monotonic()
+    pending = {path: (now, now - args.debounce) for path, (_, size) in file_watch.scan_jsonl(watch_dir).items()
+               if changed_since_checkpoint(path, size)}
+    latencies = []
+    started = time.time()
+    stats_wall, stats_cpu = time.monotonic(), time.process_time()
+    next_stats = stats_wall + args.stats_interval if args.stats_interval else None
+
+    def report_stats():
+        nonlocal stats_wall, stats_cpu
+        wall, cpu = time.monotonic(), time.process_time()
+        cpu_pct = (cpu - stats_cpu) / (wall - stats_wall) * 100 if wall > stats_wall else 0
+        line = f"📊 CPU: {cpu_pct:.2f}% over {wall - stats_wall:.0f}s, conversions: {len(latencies)}"
+        if latencies:
+            line += (f", write→CSV latency p50 {percentile(latencies, 50) * 1000:.0f}ms"
+                     f" / p99 {percentile(latencies, 99) * 1000:.0f}ms")
+        print(line, flush=True)
+        latencies.clear()
+        stats_wall, stats_cpu = wall, cpu
+
+    try:
+        while True:
+            now = time.monotonic()
+            due = [path for path, (first, last) in pending.items()
+                   if now - last >= args.debounce or now - first >= args.max_delay]
+            for path in due:
+                del pending[path]
+                if not os.path.exists(path):
+                    continue
+                output_file = csv_path_for(path)
+                try:
+                    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                    resumed = process_jsonl_incremental(path, output_file, verbose=False)
+                    mtime = os.path.getmtime(path)
+                    if mtime >= started:
+                        # Only writes seen by the watcher count, not the startup catch-up
+                        latencies.append(max(0.0, time.time() - mtime))
+                    mode = "appended" if resumed else "rebuilt"
+                    print(f"✅ {os.path.relpath(path, watch_dir)} ({mode})", flush=True)
+                except Exception as e:
+                    print(f"❌ Failed to convert {os.path.relpath(path, watch_dir)}: {e}", flush=True)
+
+            if next_stats is not None and now >= next_stats:
+                report_stats()
+                next_stats = now + args.stats_interval
+
+            # Sleep until the next debounce deadline or stats report; block indefinitely when idle
+            deadlines = [min(last + args.debounce, first + args.max_delay) for first, last in pending.values()]
+            if next_stats is not None:
+                deadlines.append(next_stats)
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+            for path in watcher.read_changes(timeout):
+                now = time.monotonic()
+                first, _ = pending.get(path, (now, now))
+                pending[path] = (first, now)
+    except KeyboardInterrupt:
+        print("")
+        report_stats()
+    finally:
+        watcher.close()
+
+def text_length(value):
+    """Characters of text in message content: strings, tool inputs and results, not keys or ids"""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, list):
+        return sum(text_length(v) for v in value)
+    if isinstance(value, dict):
+        return sum(text_length(v) for k, v in value.items() if k not in ('type', 'id', 'tool_use_id'))
+    return 0
+
+def message_content(msg):
+    if msg.get('type') == 'system':
+        return msg.get('content')
+    message = msg.get('message')
+    return message.get('content') if isinstance(message, dict) else None
+
+def message_tool_name(content, tool_names):
+    """Tool of the first tool_use in content, or of the call its tool_result answers
+
+    tool_names maps tool_use ids seen so far in the transcript to tool names.
+    """
+    if not isinstance(content, list):
+        return None
+    name = None
+    for item in content:
+        if not isinstance(item, dict):
+            continue
+        if item.get('type') == 'tool_use' and item.get('name'):
+            if item.get('id'):
+                tool_names[item['id']] = item['name']
+            name = name or item['name']
+        elif item.get('type') == 'tool_result' and name is None:
+            name = tool_names.get(item.get('tool_use_id'))
+    return name
+
+def export_columns(jsonl_path, decoder='auto'):
+    """Worker: typed columns for one transcript, returning (jsonl_path, columns, error)
+
+    Lines are decoded in full (no prefilter) so size and token estimates count
+    whole tool results. Descriptions are trimmed exactly like the CSV, and a
+    final line without a newline is left out as still being written.
+    """
+    import columnar_export
+    columns = {name: [] for name, _ in columnar_export.COLUMNS}
+    project = os.path.basename(os.path.dirname(jsonl_path))
+    file_session = os.path.basename(jsonl_path)[:-len('.jsonl')]
+    state = {'pending_read_count': 0}
+    tool_names = {}
+    decode = get_decoder(decoder, False)
+    try:
+        with open(jsonl_path, 'rb') as src:
+            for line in rehydrate_lines(iter_complete_lines(src, {'offset': 0}), jsonl_path):
+                if not line.strip():
+                    continue
+                msg = decode(line)
+                is_read_response = track_read_response(msg, state)
+                content = message_content(msg)
+                chars = text_length(content)
+                columns['project'].append(project)
+                columns['session_id'].append(msg.get('sessionId') or file_session)
+                columns['type'].append(msg.get('type', ''))
+                columns['timestamp'].append(parse_timestamp_ms(msg.get('timestamp')))
+                columns['tool_name'].append(message_tool_name(content, tool_names))
+                columns['description'].append(extract_description(msg, is_read_response))
+                columns['content_chars'].append(chars)
+                # ~4 characters per token for English text and code
+                columns['tokens_est'].append((chars + 3) // 4)
+                columns['line_bytes'].append(len(line))
+    except Exception as e:
+        return jsonl_path, None, str(e)
+    return jsonl_path, columns, None
+
+def collect_jsonl_paths(inputs):
+    """Sorted .jsonl paths from projects directories and/or files, exiting on anything else"""
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(jsonl_path for jsonl_path, _, _, _ in discover_jsonl_files(path))
+        elif path.endswith('.jsonl') and os.path.isfile(path):
+            paths.append(path)
+        else:
+            print(f"Error: '{path}' is neither a directory nor a .jsonl file")
+            sys.exit(1)
+    return sorted(paths)
+
+def export_main(argv):
+    import columnar_export
+
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py export",
+        description="Export conversations to one typed, compressed columnar archive: Parquet when pyarrow "
+                    "is installed, otherwise framed columns compressed with zstd (or gzip)")
+    parser.add_argument("inputs", nargs="*", default=[os.path.expanduser("~/.claude/projects")],
+                        help="Projects directories and/or .jsonl files (default: ~/.claude/projects)")
+    parser.add_argument("-o", "--output",
+                        help="Archive path (default: conversations.parquet/.ccol in the first directory)")
+    parser.add_argument("--format", choices=['auto'] + columnar_export.available_formats(), default='auto',
+                        help="Archive format (default: parquet when pyarrow is installed, else framed)")
+    parser.add_argument("--codec", choices=columnar_export.available_codecs(),
+                        help="Compression codec (default: zstd when available, else gzip)")
+    parser.add_argument("--row-group-size", type=int, default=columnar_export.ROW_GROUP_SIZE,
+                        help=f"Rows per row group (default: {columnar_export.ROW_GROUP_SIZE})")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--decoder", choices=['auto'] + available_decoders(), default='auto',
+                        help="JSON decoder backend (default: orjson when installed, else json)")
+    args = parser.parse_args(argv)
+
+    paths = collect_jsonl_paths(args.inputs)
+
+    fmt = columnar_export.available_formats()[0] if args.format == 'auto' else args.format
+    output = args.output
+    if not output:
+        base = args.inputs[0] if os.path.isdir(args.inputs[0]) else os.path.dirname(os.path.abspath(args.inputs[0]))
+        output = os.path.join(base, 'conversations' + columnar_export.default_suffix(fmt))
+
+    start = time.perf_counter()
+    input_total = sum(os.path.getsize(path) for path in paths)
+    failed = 0
+    with columnar_export.ArchiveWriter(output, fmt, args.codec, args.row_group_size) as writer:
+        print(f"📦 Exporting {len(paths)} JSONL files ({format_size(input_total)}) to {output}")
+        print(f"Format: {writer.format} ({writer.codec}), row groups of {writer.row_group_size} rows")
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            # map keeps input order, so the archive is deterministic
+            for jsonl_path, columns, error in pool.map(export_columns, paths, [args.decoder] * len(paths)):
+                if error:
+                    failed += 1
+                    print(f"   ❌ Failed: {os.path.basename(jsonl_path)}: {error}")
+                    continue
+                writer.append_rows(columns)
+
+    duration = time.perf_counter() - start
+    output_size = os.path.getsize(output)
+    print("")
+    print(f"📊 Exported {writer.rows} rows in {writer.row_groups} row groups from {len(paths) - failed} files"
+          f"{f', {failed} failed' if failed else ''}")
+    print(f"   Original: {format_size(input_total)} → {writer.format}: {format_size(output_size)}"
+          f" ({(1 - output_size / input_total) * 100 if input_total else 0:.0f}% reduction)")
+    print(f"   Processing time: {duration:.2f}s ({input_total / 1024 / 1024 / duration:.1f} MB/s)")
+    if failed:
+        sys.exit(1)
+
+def analytics_columns(jsonl_path, decoder='auto'):
+    """Worker: one row per tool call and per session, returning (jsonl_path, calls, sessions, error)
+
+    Each tool_use is paired with the tool_result carrying its id; latency is
+    the difference of the two messages' timestamps. String-content transcripts
+    have no ids, so there each Read call found by is_read_tool_call is
+    answered by the response track_read_response finds, as in the CSV.
+    Lines are decoded in full so result sizes count whole tool results, and a
+    final line without a newline is left out as still being written.
+    """
+    calls = {'tool': [], 'latency_ms': [], 'result_chars': [], 'error': []}
+    call_times = []
+    pending = {}  # tool_use id -> call index
+    pending_reads = deque()  # Read calls without ids, oldest first
+    sessions = {}  # session id -> [first ms, last ms, messages, tool calls]
+    file_session = os.path.basename(jsonl_path)[:-len('.jsonl')]
+    state = {'pending_read_count': 0}
+    decode = get_decoder(decoder, False)
+
+    def add_call(name, timestamp, session):
+        calls['tool'].append(name)
+        calls['latency_ms'].append(float('nan'))
+        calls['result_chars'].append(-1)
+        calls['error'].append(0)
+        call_times.append(timestamp)
+        session[3] += 1
+        return len(call_times) - 1
+
+    def answer(index, timestamp, chars, is_error):
+        if timestamp is not None and call_times[index] is not None:
+            calls['latency_ms'][index] = float(timestamp - call_times[index])
+        calls['result_chars'][index] = chars
+        calls['error'][index] = 1 if is_error else 0
+
+    try:
+        with open(jsonl_path, 'rb') as src:
+            lines = rehydrate_lines(iter_complete_lines(src, {'offset': 0}), jsonl_path)
+            for msg in iter_messages(lines, decode):
+                timestamp = parse_timestamp_ms(msg.get('timestamp'))
+                session = sessions.setdefault(msg.get('sessionId') or file_session, [None, None, 0, 0])
+                if timestamp is not None:
+                    if session[0] is None or timestamp < session[0]:
+                        session[0] = timestamp
+                    if session[1] is None or timestamp > session[1]:
+                        session[1] = timestamp
+                session[2] += 1
+
+                is_read_response = track_read_response(msg, state)
+                content = message_content(msg)
+                answered = False
+                if isinstance(content, list):
+                    for item in content:
+                        if not isinstance(item, dict):
+                            continue
+                        if item.get('type') == 'tool_use' and item.get('name'):
+                            index = add_call(item['name'], timestamp, session)
+                            if item.get('id'):
+                                pending[item['id']] = index
+                        elif item.get('type') == 'tool_result':
+                            index = pending.pop(item.get('tool_use_id'), None)
+                            if index is not None:
+                                answer(index, timestamp, text_length(item.get('content')), item.get('is_error'))
+                                answered = True
+                elif isinstance(content, str) and is_read_tool_call(msg):
+                    pending_reads.append(add_call('Read', timestamp, session))
+                if is_read_response and not answered and pending_reads:
+                    answer(pending_reads.popleft(), timestamp, text_length(content), False)
+    except Exception as e:
+        return jsonl_path, None, None, str(e)
+    return jsonl_path, calls, [(sid, *values) for sid, values in sessions.items()], None
+
+def print_analytics(report, top):
+    import session_analytics
+    fmt_d, fmt_n = session_analytics.format_duration, session_analytics.format_count
+
+    print(f"{'Tool':<24} {'calls':>7} {'errors':>7} {'no result':>9}   "
+          f"{'latency p50':>11} {'p90':>7} {'p99':>7} {'max':>7}   {'result p50':>10} {'p90':>6} {'max':>6}")
+    for row in report['tools'][:top]:
+        latency = row['latency_s'] or {}
+        size = row['result_chars'] or {}
+        print(f"{row['tool'][:24]:<24} {row['calls']:>7} {row['errors']:>7} {row['no_result']:>9}   "
+              f"{fmt_d(latency.get('p50')):>11} {fmt_d(latency.get('p90')):>7} "
+              f"{fmt_d(latency.get('p99')):>7} {fmt_d(latency.get('max')):>7}   "
+              f"{fmt_n(size.get('p50')):>10} {fmt_n(size.get('p90')):>6} {fmt_n(size.get('max')):>6}")
+    if len(report['tools']) > top:
+        print(f"... {len(report['tools']) - top} more tools (--top)")
+    print("")
+
+    read = report['read']
+    if read:
+        print(f"📖 Read responses: {read['count']}, {fmt_n(read['sum'])} chars (~{fmt_n(read['sum'] / 4)} tokens), "
+              f"p50 {fmt_n(read['p50'])} / p90 {fmt_n(read['p90'])} / p99 {fmt_n(read['p99'])} / "
+              f"max {fmt_n(read['max'])} chars")
+    sessions = report['sessions']
+    if sessions:
+        print(f"⏱️  Sessions: {sessions['count']} with timestamps, {fmt_d(sessions['sum'])} in total, "
+              f"duration p50 {fmt_d(sessions['p50'])} / p90 {fmt_d(sessions['p90'])} / "
+              f"p99 {fmt_d(sessions['p99'])} / max {fmt_d(sessions['max'])}")
+    print("")
+
+    print(f"{'Project':<40} {'sessions':>8} {'messages':>9} {'tool calls':>10} {'time':>7}")
+    for row in report['projects'][:top]:
+        print(f"{row['project'][-40:]:<40} {row['sessions']:>8} {row['messages']:>9} "
+              f"{row['tool_calls']:>10} {fmt_d(row['session_s']):>7}")
+    if len(report['projects']) > top:
+        print(f"... {len(report['projects']) - top} more projects (--top)")
+
+def analytics_main(argv):
+    import session_analytics
+
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py analytics",
+        description="Tool call counts, call→result latency, Read response sizes and session durations "
+                    "aggregated across projects")
+    parser.add_argument("inputs", nargs="*", default=[os.path.expanduser("~/.claude/projects")],
+                        help="Projects directories and/or .jsonl files (default: ~/.claude/projects)")
+    parser.add_argument("--top", type=int, default=20, help="Tools and projects to list (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--backend", choices=['auto'] + session_analytics.available_backends(), default='auto',
+                        help="Aggregation backend (default: numpy when installed, else python)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--decoder", choices=['auto'] + available_decoders(), default='auto',
+                        help="JSON decoder backend (default: orjson when installed, else json)")
+    args = parser.parse_args(argv)
+
+    paths = collect_jsonl_paths(args.inputs)
+    input_total = sum(os.path.getsize(path) for path in paths)
+    columns = session_analytics.Columns()
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        for jsonl_path, calls, sessions, error in pool.map(analytics_columns, paths, [args.decoder] * len(paths)):
+            if error:
+                failed += 1
+                print(f"❌ Failed: {os.path.basename(jsonl_path)}: {error}", file=sys.stderr)
+                continue
+            columns.add(os.path.basename(os.path.dirname(jsonl_path)), calls, sessions)
+    parsed = time.perf_counter()
+    report = session_analytics.summarize(columns, args.backend)
+    aggregated = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        totals = report['totals']
+        print(f"📈 {totals['sessions']} sessions in {totals['projects']} projects: {totals['messages']} messages, "
+              f"{totals['tool_calls']} tool calls ({totals['errors']} errors)")
+        print(f"   Parsed {len(paths) - failed} files ({format_size(input_total)}) in {parsed - start:.2f}s, "
+              f"aggregated in {(aggregated - parsed) * 1000:.0f}ms ({report['backend']})")
+        print("")
+        print_analytics(report, args.top)
+    if failed:
+        sys.exit(1)
+
+def archive_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py archive",
+        description="Move large strings (Read results, tool output) of old transcripts into a deduplicating, "
+                    "content-addressed store (<projects>/.content-store.sqlite), leaving references behind. "
+                    "The converter, export, analytics and search read archived transcripts transparently; "
+                    "run restore before resuming one with claude --resume.")
+    parser.add_argument("inputs", nargs="*", default=[os.path.expanduser("~/.claude/projects")],
+                        help="Projects directories and/or .jsonl files (default: ~/.claude/projects)")
+    parser.add_argument("--min-bytes", type=int, default=content_store.MIN_BYTES,
+                        help=f"Archive strings of at least this many bytes (default: {content_store.MIN_BYTES})")
+    parser.add_argument("--min-age-days", type=float, default=7,
+                        help="Skip transcripts modified more recently, they may still be resumed (default: 7)")
+    args = parser.parse_args(argv)
+
+    paths = collect_jsonl_paths(args.inputs)
+    cutoff = time.time() - args.min_age_days * 86400
+    todo = [path for path in paths if os.path.getmtime(path) < cutoff]
+    print(f"🗜️  Archiving {len(todo)} of {len(paths)} JSONL files "
+          f"(strings ≥ {args.min_bytes} bytes, untouched for {args.min_age_days:g} days)")
+
+    stores = {}
+    archived = unchanged = failed = 0
+    scanned = before = after = 0
+    start = time.perf_counter()
+    for path in todo:
+        store_path = content_store.store_path_for(path)
+        if store_path not in stores:
+            size = os.path.getsize(store_path) if os.path.exists(store_path) else 0
+            stores[store_path] = (content_store.ContentStore(store_path), size)
+        store = stores[store_path][0]
+        scanned += os.path.getsize(path)
+        try:
+            sizes = content_store.archive_file(store, path, args.min_bytes)
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ Failed: {os.path.basename(path)}: {e}")
+            continue
+        if sizes is None:
+            unchanged += 1
+            continue
+        archived += 1
+        before += sizes[0]
+        after += sizes[1]
+    duration = time.perf_counter() - start
+
+    totals = {key: sum(store.stats[key] for store, _ in stores.values())
+              for key in ('blobs', 'blob_hits', 'chunks', 'chunk_hits', 'logical_bytes', 'unique_bytes', 'stored_bytes')}
+    store_growth = 0
+    for store, size in stores.values():
+        store.close()
+        store_growth += os.path.getsize(store.path) - size
+    print("")
+    print(f"📊 Archived {archived} files, {unchanged} without new large strings, {failed} failed")
+    if archived:
+        print(f"   Transcripts: {format_size(before)} → {format_size(after)}, "
+              f"store grew by {format_size(store_growth)} "
+              f"({(1 - (after + store_growth) / before) * 100:.0f}% disk saved)")
+    if totals['blobs']:
+        print(f"   Strings: {totals['blobs']} ({totals['blob_hits']} already stored), "
+              f"chunks: {totals['chunks']} ({totals['chunk_hits']} deduplicated)")
+        if totals['unique_bytes']:
+            print(f"   Dedup ratio: {totals['logical_bytes'] / totals['unique_bytes']:.1f}x "
+                  f"({format_size(totals['logical_bytes'])} of strings → {format_size(totals['unique_bytes'])} "
+                  f"new unique, {format_size(totals['stored_bytes'])} compressed)")
+        else:
+            print(f"   Dedup ratio: all {format_size(totals['logical_bytes'])} of strings were already stored")
+    if duration:
+        print(f"   Processing time: {duration:.2f}s ({scanned / 1024 / 1024 / duration:.1f} MB/s)")
+    if failed:
+        sys.exit(1)
+
+def restore_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py restore",
+        description="Rewrite archived transcripts with their content store references expanded, "
+                    "byte for byte as they were before archive")
+    parser.add_argument("inputs", nargs="*", default=[os.path.expanduser("~/.claude/projects")],
+                        help="Projects directories and/or .jsonl files (default: ~/.claude/projects)")
+    args = parser.parse_args(argv)
+
+    restored = failed = 0
+    restored_bytes = 0
+    start = time.perf_counter()
+    for path in collect_jsonl_paths(args.inputs):
+        try:
+            sizes = content_store.restore_file(path)
+        except Exception as e:
+            failed += 1
+            print(f"   ❌ Failed: {os.path.basename(path)}: {e}")
+            continue
+        if sizes is not None:
+            restored += 1
+            restored_bytes += sizes[1]
+    duration = time.perf_counter() - start
+    print(f"♻️  Restored {restored} transcripts ({format_size(restored_bytes)}) in {duration:.2f}s"
+          f" ({restored_bytes / 1024 / 1024 / duration if duration else 0:.1f} MB/s)"
+          f"{f', {failed} failed' if failed else ''}")
+    if failed:
+        sys.exit(1)
+
+def open_search_index(args):
+    import conversation_search
+    index_path = args.index or os.path.join(args.base_dir, conversation_search.INDEX_FILE)
+    return conversation_search.SearchIndex(index_path)
+
+def print_index_stats(stats):
+    print(f"📚 Indexed {stats['messages']} messages from {stats['updated_files']}/{stats['files']} files "
+          f"({format_size(stats['bytes'])}) in {stats['seconds']:.2f}s")
+
+def index_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py index",
+        description="Build or update the full-text search index of all conversations")
+    add_search_arguments(parser)
+    args = parser.parse_args(argv)
+
+    index = open_search_index(args)
+    print_index_stats(index.update(args.base_dir, get_decoder(), extract_search_text))
+    print(f"   Index: {index.db_path} ({format_size(os.path.getsize(index.db_path))})")
+    index.close()
+
+def search_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="jsonl-to-csv.py search",
+        description="Ranked full-text search over user/assistant text and tool calls of all conversations")
+    parser.add_argument("query", help="Words to search for (all must match; last word is a prefix)")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="Number of sessions to show (default: 10)")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to SQLite FTS5 unchanged (AND/OR/NEAR, quotes)")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index without updating it first")
+    add_search_arguments(parser)
+    args = parser.parse_args(argv)
+
+    index = open_search_index(args)
+    if not args.no_refresh:
+        stats = index.update(args.base_dir, get_decoder(), extract_search_text)
+        if stats['updated_files']:
+            print_index_stats(stats)
+
+    start = time.perf_counter()
+    results = index.search(args.query, args.limit, args.raw)
+    elapsed = time.perf_counter() - start
+    index.close()
+
+    print(f"🔍 {len(results)} sessions matching '{args.query}' ({elapsed * 1000:.1f}ms)")
+    print("")
+    for n, hit in enumerate(results, 1):
+        print(f"{n}. Conversation: {hit['session']}")
+        print(f"   Project: {hit['project']}")
+        print(f"   When: {hit['started'] or 'Unknown'} → {hit['ended'] or 'Unknown'}")
+        print(f"   Score: {hit['score']:.2f} ({hit['hits']} top-ranked chunks)")
+        print(f"   Match: {hit['snippet'].replace(chr(10), ' ')}")
+        print("")
+
+def add_search_arguments(parser):
+    parser.add_argument("--base-dir", default=os.path.expanduser("~/.claude/projects"),
+                        help="Projects directory to index (default: ~/.claude/projects)")
+    parser.add_argument("--index", help="Index database path (default: <base-dir>/.conversation-search.sqlite)")
+
+COMMANDS = {
+    'analytics': analytics_main,
+    'archive': archive_main,
+    'batch': batch_main,
+    'export': export_main,
+    'watch': watch_main,
+    'index': index_main,
+    'restore': restore_main,
+    'search': search_main,
+}
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Converts Claude Code JSONL conversation files to compact CSV format. "
+                    "Smart trimming: Read file responses → 150 chars, other content → 500 chars",
+        epilog="Subcommands: batch [base_dir] converts a whole ~/.claude/projects tree, "
+               "export [inputs] writes one typed, compressed columnar archive (Parquet or zstd/gzip), "
+               "archive / restore [inputs] move large tool results of old transcripts into a deduplicating "
+               "content store and back, "
+               "analytics [inputs] reports tool usage, tool latency and session statistics, "
+               "watch [dir] converts changed files as they are written, "
+               "index / search QUERY maintain and query a full-text index of all conversations")
+    parser.add_argument("input_file", help="Path to the input .jsonl file")
+    parser.add_argument("output_file", nargs="?", help="Path to the output .csv file (default: input with .csv suffix)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only convert lines appended since the last run (checkpoint stored next to the CSV)")
+    parser.add_argument("--range", type=parse_range, metavar="START:END",
+                        help="Only messages START to END-1, numbered from 0 like CSV rows (e.g. 50000:50100, or --range=-100: for the last 100)")
+    parser.add_argument("--since", type=parse_since, metavar="TIMESTAMP",
+                        help="Only messages at or after this ISO 8601 time (e.g. 2025-08-31T10:00:00Z)")
+    parser.add_argument("--raw", action="store_true",
+                        help="With --range/--since, copy the selected JSONL lines unchanged (to stdout by default)")
+    add_decoder_arguments(parser)
+    # Intermixed: output_file may follow the options (input.jsonl --range 0:100 --raw out.jsonl)
+    args = parser.parse_intermixed_args()
+    selecting = args.range is not None or args.since is not None
+    if args.incremental and selecting:
+        parser.error("--incremental cannot be combined with --range/--since")
+    if args.raw and not selecting:
+        parser.error("--raw requires --range or --since")
+
+    input_file = args.input_file
 
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' not found")
         sys.exit(1)
 
+    if args.raw:
+        try:
+            process_jsonl_selection(input_file, args.output_file, *(args.range or (None, None)), args.since, raw=True)
+        except BrokenPipeError:
+            # Output piped into head & co: stop quietly, as cat does
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        except Exception as e:
+            print(f"❌ Extraction failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     # Determine output file
-    if len(sys.argv) > 2:
-        output_file = sys.argv[2]
+    if args.output_file:
+        output_file = args.output_file
     else:
         input_path = Path(input_file)
         output_file = str(input_path.with_suffix('.csv'))
@@ -180,10 +1210,17 @@ def main():
     print("Read file responses → 150 chars, other content → 500 chars")
 
     try:
-        process_jsonl(input_file, output_file)
+        decode = get_decoder(args.decoder, not args.no_prefilter)
+        if selecting:
+            process_jsonl_selection(input_file, output_file, *(args.range or (None, None)), args.since,
+                                    decode=decode)
+        elif args.incremental:
+            process_jsonl_incremental(input_file, output_file, decode=decode)
+        else:
+            process_jsonl(input_file, output_file, decode=decode)
     except Exception as e:
         print(f"❌ Conversion failed: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
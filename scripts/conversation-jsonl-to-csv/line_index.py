@@ -0,0 +1,429 @@
+"""
+Seek index for Claude Code JSONL transcripts.
+One mmap scan records the byte range and timestamp of every message line in a
+sidecar file (<transcript>.idx), so a message number or timestamp is found by
+binary search and raw lines are sliced from a memory map without parsing
+anything before them. It also records the converter's pending Read state after
+each message, so a selection trims Read results exactly like a full conversion.
+The sidecar is extended in place as the transcript grows.
+Standard library only: the conversation-historian agent imports it too.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from datetime import datetime, timezone
+
+import content_store
+
+SIDECAR_SUFFIX = '.idx'
+MAGIC = b'CCLIDX2' + (b'L' if sys.byteorder == 'little' else b'B')
+# magic, transcript inode, bytes indexed, message count, tail length, tail bytes
+HEADER = struct.Struct('=8sQQQI64s')
+HEADER_SIZE = 128
+# Per message: start offset, end offset (after the newline), timestamp, running max timestamp,
+# pending Read calls after the message
+FIELDS = 5
+RUNNING = 3
+PENDING = 4
+RECORD_SIZE = 8 * FIELDS
+TAIL_BYTES = 64
+NO_TIMESTAMP = -2 ** 63
+TIMESTAMP_KEY = b'"timestamp":'
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# The top-level "type" of a JSON line, matched only across the scalar-valued keys before it
+# (Claude Code writes parentUuid, cwd, sessionId... first), so it cannot be a nested one
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+TOP_LEVEL_TYPE = re.compile(
+    rb'\s*\{(?:\s*' + _STRING + rb'\s*:\s*(?:' + _STRING + rb'|true|false|null|-?[0-9][0-9.eE+-]*)\s*,)*?'
+    rb'\s*"type"\s*:\s*"([a-z_]*)"\s*[,}]')
+
+
+def parse_timestamp_ms(value):
+    """ISO 8601 timestamp → milliseconds since the epoch (naive times taken as UTC), or None"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def is_read_tool_call(msg):
+    """Check if a message is a Read tool call"""
+    if msg.get('type') != 'assistant':
+        return False
+
+    content = msg.get('message', {}).get('content')
+    if not content:
+        return False
+
+    # Handle string content
+    if isinstance(content, str):
+        return 'Tool: Read file_path=' in content
+
+    # Handle array content
+    if isinstance(content, list) and len(content) > 0:
+        first_item = content[0]
+        return (first_item.get('type') == 'tool_use' and
+                first_item.get('name') == 'Read')
+
+    return False
+
+
+def track_read_response(msg, state):
+    """Whether msg answers a pending Read call, updating state['pending_read_count']"""
+    # Check if this is a Read tool call
+    if is_read_tool_call(msg):
+        state['pending_read_count'] += 1
+
+    # Check if this is a Read response
+    is_read_response = (msg.get('type') == 'user' and state['pending_read_count'] > 0)
+
+    # If it's a Read response, decrement the counter
+    if is_read_response:
+        state['pending_read_count'] -= 1
+    return is_read_response
+
+
+def pending_reads_after(data, start, end, pending, rehydrate=None):
+    """Pending Read count after the JSON line data[start:end], given the count before it
+
+    The top-level type is matched at the start of the line, so only
+    assistant lines mentioning Read are decoded. When it cannot be matched,
+    lines are decoded if they may be a Read call or, while a Read is
+    pending, a user message. Those lines are first expanded with rehydrate
+    if they hold content store references.
+    """
+    match = TOP_LEVEL_TYPE.match(data, start, end)
+    kind = match.group(1) if match else None
+    if kind == b'user':
+        # Read calls are assistant messages, so a user message only answers one
+        return pending - 1 if pending else 0
+    if kind is not None and kind != b'assistant':
+        return pending
+    if rehydrate is not None and data.find(content_store.MARKER, start, end) >= 0:
+        data = rehydrate(bytes(data[start:end]))
+        start, end = 0, len(data)
+    if kind is not None:
+        if data.find(b'Read', start, end) < 0:
+            return pending
+    elif not (data.find(b'Read', start, end) >= 0 and data.find(b'"assistant"', start, end) >= 0 or
+              pending and data.find(b'"user"', start, end) >= 0):
+        return pending
+    try:
+        msg = json.loads(data[start:end])
+    except ValueError:
+        return pending
+    if not isinstance(msg, dict):
+        return pending
+    state = {'pending_read_count': pending}
+    track_read_response(msg, state)
+    return state['pending_read_count']
+
+
+def sidecar_path(path):
+    return f"{path}{SIDECAR_SUFFIX}"
+
+
+def line_timestamp(data, start, end):
+    """Timestamp in ms of the JSON line data[start:end], or NO_TIMESTAMP
+
+    The "timestamp" key is located without decoding the line. A quote inside
+    a JSON string is always escaped, so only real keys match; lines where the
+    key occurs more than once (a nested object has one too) are decoded.
+    """
+    key = data.find(TIMESTAMP_KEY, start, end)
+    if key < 0:
+        return NO_TIMESTAMP
+    value = None
+    if data.find(TIMESTAMP_KEY, key + 1, end) >= 0:
+        try:
+            msg = json.loads(data[start:end])
+        except ValueError:
+            return NO_TIMESTAMP
+        if isinstance(msg, dict):
+            value = msg.get('timestamp')
+    else:
+        quote = data.find(b'"', key + len(TIMESTAMP_KEY), end)
+        if quote >= 0 and not data[key + len(TIMESTAMP_KEY):quote].strip():
+            close = data.find(b'"', quote + 1, end)
+            if close >= 0:
+                value = data[quote + 1:close].decode('ascii', 'replace')
+    ms = parse_timestamp_ms(value)
+    return NO_TIMESTAMP if ms is None else ms
+
+
+def scan(data, start, end, running=NO_TIMESTAMP, pending=0, rehydrate=None):
+    """Records of the complete, non-blank lines in data[start:end]
+
+    Returns (records, offset after the last newline). running and pending
+    are the running max timestamp and pending Read count after the lines
+    before start.
+    """
+    records = array('q')
+    find = data.find
+    pos = start
+    while True:
+        newline = find(b'\n', pos, end)
+        if newline < 0:
+            return records, pos
+        # Every real message starts with '{', so the full strip only runs on blank lines
+        if data[pos:min(newline, pos + 64)].strip() or data[pos:newline].strip():
+            timestamp = line_timestamp(data, pos, newline)
+            if timestamp > running:
+                running = timestamp
+            pending = pending_reads_after(data, pos, newline, pending, rehydrate)
+            records.extend((pos, newline + 1, timestamp, running, pending))
+        pos = newline + 1
+
+
+def parse_header(raw, size):
+    """(inode, indexed bytes, count, tail) from the start of a sidecar of size bytes,
+    or None if it is truncated or was written on a machine of the other byte order"""
+    if len(raw) < HEADER.size:
+        return None
+    magic, inode, indexed, count, tail_len, tail = HEADER.unpack_from(raw)
+    if magic != MAGIC or size < HEADER_SIZE + count * RECORD_SIZE:
+        return None
+    return inode, indexed, count, tail[:tail_len]
+
+
+def read_header(path):
+    try:
+        with open(path, 'rb') as f:
+            return parse_header(f.read(HEADER.size), os.fstat(f.fileno()).st_size)
+    except OSError:
+        return None
+
+
+def _rehydrator(path):
+    """Expands the content store references of one archived line of transcript path"""
+    return lambda line: next(content_store.rehydrate_lines([line], path))
+
+
+def _header(inode, indexed, count, data):
+    tail = bytes(data[max(0, indexed - TAIL_BYTES):indexed]) if indexed else b''
+    return HEADER.pack(MAGIC, inode, indexed, count, len(tail), tail).ljust(HEADER_SIZE, b'\0')
+
+
+def _last_record(path, count):
+    with open(path, 'rb') as f:
+        f.seek(HEADER_SIZE + (count - 1) * RECORD_SIZE)
+        return struct.unpack(f'={FIELDS}q', f.read(RECORD_SIZE))
+
+
+def update(path):
+    """Create or extend the sidecar of transcript path; returns the number of lines scanned
+
+    Like the converter's checkpoints, the sidecar remembers the transcript's
+    inode and the bytes before the indexed offset. A transcript that only
+    grew has just its new lines scanned and appended; anything else is
+    indexed from scratch into a temporary file that replaces the sidecar.
+    """
+    sidecar = sidecar_path(path)
+    header = read_header(sidecar)
+    rehydrate = _rehydrator(path)
+    with open(path, 'rb') as src:
+        st = os.fstat(src.fileno())
+        data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b''
+        try:
+            if header is not None:
+                inode, indexed, count, tail = header
+                if (inode == st.st_ino and indexed <= st.st_size and
+                        data[indexed - len(tail):indexed] == tail):
+                    if indexed == st.st_size:
+                        return 0
+                    last = _last_record(sidecar, count) if count else None
+                    running, pending = (last[RUNNING], last[PENDING]) if last else (NO_TIMESTAMP, 0)
+                    records, covered = scan(data, indexed, st.st_size, running, pending, rehydrate)
+                    if covered == indexed:
+                        return 0
+                    added = len(records) // FIELDS
+                    # Records first, header last: a crash in between leaves the old header valid
+                    with open(sidecar, 'r+b') as f:
+                        f.seek(HEADER_SIZE + count * RECORD_SIZE)
+                        records.tofile(f)
+                        f.truncate()
+                        f.seek(0)
+                        f.write(_header(st.st_ino, covered, count + added, data))
+                    return added
+
+            records, covered = scan(data, 0, st.st_size, rehydrate=rehydrate)
+            tmp = f"{sidecar}.tmp"
+            try:
+                with open(tmp, 'wb') as f:
+                    f.write(_header(st.st_ino, covered, len(records) // FIELDS, data))
+                    records.tofile(f)
+                os.replace(tmp, sidecar)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+            return len(records) // FIELDS
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+class LineIndex:
+    """Message byte ranges and timestamps of one transcript
+
+    Records are read straight from the memory-mapped sidecar, or held in
+    memory when the sidecar could not be written. Message numbers count
+    non-blank lines from 0, like the rows of the CSV.
+    """
+
+    def __init__(self, path, records=None):
+        self.path = path
+        self._maps = []
+        if records is None:
+            with open(sidecar_path(path), 'rb') as f:
+                sidecar = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(sidecar)
+            header = parse_header(sidecar, len(sidecar))
+            if header is None:
+                sidecar.close()
+                raise ValueError(f"{sidecar_path(path)} is not a line index")
+            _, self.indexed, self.count, _ = header
+            view = memoryview(sidecar)[HEADER_SIZE:HEADER_SIZE + self.count * RECORD_SIZE]
+        else:
+            self.count = len(records) // FIELDS
+            self.indexed = records[1 - FIELDS] if self.count else 0
+            view = memoryview(records)
+        self._records = view.cast('q') if view.format != 'q' else view
+        # Strided view of the running maxima: non-decreasing, so bisect works on it
+        self._running = self._records[RUNNING::FIELDS]
+        self._data = None
+
+    def __len__(self):
+        return self.count
+
+    def start(self, n):
+        return self._records[n * FIELDS]
+
+    def end(self, n):
+        return self._records[n * FIELDS + 1]
+
+    def timestamp(self, n):
+        """Timestamp of message n in ms, or None"""
+        value = self._records[n * FIELDS + 2]
+        return None if value == NO_TIMESTAMP else value
+
+    def pending_reads(self, n):
+        """Pending Read count before message n, as the converter tracks it from the first line"""
+        return self._records[(n - 1) * FIELDS + PENDING] if n > 0 else 0
+
+    @property
+    def first_timestamp(self):
+        """Timestamp of the first message that has one"""
+        n = bisect.bisect_right(self._running, NO_TIMESTAMP)
+        return self.timestamp(n) if n < self.count else None
+
+    @property
+    def last_timestamp(self):
+        """Latest timestamp of any message"""
+        if not self.count or self._running[-1] == NO_TIMESTAMP:
+            return None
+        return self._running[-1]
+
+    def seek_time(self, ms):
+        """First message n such that every message before it is older than ms"""
+        return bisect.bisect_left(self._running, ms)
+
+    def select(self, start=None, stop=None, since_ms=None):
+        """(start, stop) message numbers for a Python-style slice, moved forward to since_ms"""
+        selected = range(self.count)[start:stop]
+        start, stop = selected.start, max(selected.start, selected.stop)
+        if since_ms is not None:
+            start = min(stop, max(start, self.seek_time(since_ms)))
+        return start, stop
+
+    def data(self):
+        """Memory map of the indexed part of the transcript"""
+        if self._data is None:
+            if not self.indexed:
+                return b''
+            with open(self.path, 'rb') as f:
+                transcript = mmap.mmap(f.fileno(), self.indexed, access=mmap.ACCESS_READ)
+            self._maps.append(transcript)
+            self._transcript = transcript
+            self._data = memoryview(transcript)
+        return self._data
+
+    def contains(self, sub, start, stop):
+        """Whether the bytes of messages start..stop - 1 contain sub, searched in place"""
+        if start >= stop:
+            return False
+        self.data()
+        return self._transcript.find(sub, self.start(start), self.end(stop - 1)) >= 0
+
+    def raw(self, start, stop):
+        """Zero-copy view of the bytes from message start through message stop - 1"""
+        if start >= stop:
+            return memoryview(b'')
+        return self.data()[self.start(start):self.end(stop - 1)]
+
+    def lines(self, start=0, stop=None, since_ms=None):
+        """Zero-copy views of messages start..stop - 1, skipping those older than since_ms
+
+        With since_ms, messages after the seek point that carry an older
+        timestamp (logged out of order) are dropped; messages without one
+        are kept.
+        """
+        start, stop = self.select(start, stop)
+        data = self.data()
+        records = self._records
+        for n in range(start, stop):
+            base = n * FIELDS
+            timestamp = records[base + 2]
+            if since_ms is not None and timestamp != NO_TIMESTAMP and timestamp < since_ms:
+                continue
+            yield data[records[base]:records[base + 1]]
+
+    def close(self):
+        self._running.release()
+        self._records.release()
+        if self._data is not None:
+            self._data.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller still holds a view; the map is freed with it
+                pass
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_index(path):
+    """Bring the sidecar of path up to date and map it
+
+    When the sidecar cannot be written (read-only directory), the index is
+    built in memory instead.
+    """
+    try:
+        update(path)
+    except PermissionError:
+        with open(path, 'rb') as src:
+            size = os.fstat(src.fileno()).st_size
+            if not size:
+                return LineIndex(path, array('q'))
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                records, _ = scan(data, 0, size, rehydrate=_rehydrator(path))
+        return LineIndex(path, records)
+    return LineIndex(path)
@@ -0,0 +1,265 @@
+"""
+Tool-usage, latency and session statistics over Claude Code transcripts.
+jsonl-to-csv.py analytics extracts one row per tool call and one per session;
+the aggregations here run over those columns with NumPy when it is installed
+(one sort and a few bincounts, however many groups) and fall back to plain
+Python otherwise. Both backends use nearest-rank percentiles, so they report
+the same values.
+"""
+
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PERCENTILES = (50, 90, 99)
+NAN = float('nan')
+
+
+def available_backends():
+    return ['numpy', 'python'] if numpy is not None else ['python']
+
+
+class Columns:
+    """Per-call and per-session columns accumulated across transcripts
+
+    Tool and project names are dictionary-encoded into int codes. Missing
+    latencies and session timestamps are NaN, calls without a result have
+    result_chars -1.
+    """
+
+    def __init__(self):
+        self.tools = {}
+        self.projects = {}
+        self.call_tool = array('i')
+        self.latency_ms = array('d')
+        self.result_chars = array('q')
+        self.error = array('q')
+        self.session_project = array('i')
+        self.session_start = array('d')
+        self.session_end = array('d')
+        self.session_messages = array('q')
+        self.session_calls = array('q')
+
+    @staticmethod
+    def _code(names, name):
+        code = names.get(name)
+        if code is None:
+            code = names[name] = len(names)
+        return code
+
+    def add(self, project, calls, sessions):
+        """Append one transcript: calls is a dict of equal-length lists (tool,
+        latency_ms, result_chars, error), sessions a list of (session_id,
+        start_ms, end_ms, messages, tool_calls) tuples"""
+        project_code = self._code(self.projects, project)
+        tools = self.tools
+        self.call_tool.extend(self._code(tools, name) for name in calls['tool'])
+        self.latency_ms.extend(calls['latency_ms'])
+        self.result_chars.extend(calls['result_chars'])
+        self.error.extend(calls['error'])
+        for _, start, end, messages, tool_calls in sessions:
+            self.session_project.append(project_code)
+            self.session_start.append(NAN if start is None else start)
+            self.session_end.append(NAN if end is None else end)
+            self.session_messages.append(messages)
+            self.session_calls.append(tool_calls)
+
+
+def _stats_rows(count, total, maximum, percentiles, groups):
+    rows = []
+    for g in range(groups):
+        n = int(count[g])
+        if not n:
+            rows.append(None)
+            continue
+        row = {'count': n, 'sum': float(total[g]), 'mean': float(total[g]) / n, 'max': float(maximum[g])}
+        for pct in PERCENTILES:
+            row[f'p{pct}'] = float(percentiles[pct][g])
+        rows.append(row)
+    return rows
+
+
+def _group_stats_numpy(codes, values, groups):
+    codes = numpy.asarray(codes, dtype=numpy.int64)
+    values = numpy.asarray(values, dtype=numpy.float64)
+    # Sort by value, then stably by group: each group becomes a sorted run starting at its
+    # cumulative count. Sorting small codes as uint16 uses radix sort, several times faster
+    # than numpy.lexsort on both keys.
+    order = numpy.argsort(values)
+    keys = codes[order]
+    if groups <= 1 << 16:
+        keys = keys.astype(numpy.uint16)
+    order = order[numpy.argsort(keys, kind='stable')]
+    codes, values = codes[order], values[order]
+    count = numpy.bincount(codes, minlength=groups)
+    total = numpy.bincount(codes, weights=values, minlength=groups)
+    ends = numpy.cumsum(count)
+    starts = ends - count
+    present = count > 0
+    last = max(0, len(values) - 1)
+
+    def pick(index):
+        picked = numpy.full(groups, numpy.nan)
+        picked[present] = values[numpy.clip(index, 0, last)][present]
+        return picked
+
+    maximum = pick(ends - 1)
+    percentiles = {pct: pick(starts + numpy.minimum(count - 1, count * pct // 100)) for pct in PERCENTILES}
+    return _stats_rows(count, total, maximum, percentiles, groups)
+
+
+def _group_stats_python(codes, values, groups):
+    grouped = [[] for _ in range(groups)]
+    for code, value in zip(codes, values):
+        grouped[code].append(value)
+    count, total, maximum = [0] * groups, [0.0] * groups, [NAN] * groups
+    percentiles = {pct: [NAN] * groups for pct in PERCENTILES}
+    for g, group in enumerate(grouped):
+        if not group:
+            continue
+        group.sort()
+        count[g] = len(group)
+        total[g] = math.fsum(group)
+        maximum[g] = group[-1]
+        for pct in PERCENTILES:
+            # Same nearest rank as jsonl-to-csv.py's percentile()
+            percentiles[pct][g] = group[min(len(group) - 1, len(group) * pct // 100)]
+    return _stats_rows(count, total, maximum, percentiles, groups)
+
+
+def group_stats(codes, values, groups, backend):
+    """count/sum/mean/max and nearest-rank percentiles of values per group code,
+    None for groups without values"""
+    if backend == 'numpy':
+        return _group_stats_numpy(codes, values, groups)
+    return _group_stats_python(codes, values, groups)
+
+
+def _valid(codes, values, keep, backend):
+    """(codes, values) where keep(values) holds, as arrays for the chosen backend"""
+    if backend == 'numpy':
+        codes, values = numpy.asarray(codes), numpy.asarray(values)
+        mask = keep(values)
+        return codes[mask], values[mask]
+    pairs = [(c, v) for c, v in zip(codes, values) if keep(v)]
+    return [c for c, _ in pairs], [v for _, v in pairs]
+
+
+def _counts(codes, groups, backend, weights=None):
+    if backend == 'numpy':
+        counts = numpy.bincount(numpy.asarray(codes, dtype=numpy.int64), minlength=groups,
+                                weights=None if weights is None else numpy.asarray(weights))
+        return [int(n) for n in counts]
+    counts = [0] * groups
+    for i, code in enumerate(codes):
+        counts[code] += 1 if weights is None else weights[i]
+    return counts
+
+
+def _seconds(row):
+    """Millisecond stats → second stats"""
+    if row is None:
+        return None
+    return {key: value if key == 'count' else value / 1000 for key, value in row.items()}
+
+
+def summarize(columns, backend='auto'):
+    """Aggregate Columns into a JSON-serializable report
+
+    tools: calls, errors, calls without a result, call→result latency and
+    result size per tool, most used first. read: Read response sizes.
+    sessions: duration of sessions with timestamps. projects: per-project
+    sessions, messages, tool calls and session time, most tool calls first.
+    """
+    if backend == 'auto':
+        backend = available_backends()[0]
+    if backend == 'numpy' and numpy is None:
+        raise ValueError("numpy backend requested but numpy is not installed")
+    tools = list(columns.tools)
+    projects = list(columns.projects)
+    n_tools, n_projects = len(tools), len(projects)
+
+    answered = lambda v: v >= 0
+    if backend == 'numpy':
+        timed = lambda v: ~numpy.isnan(v)
+        durations = numpy.asarray(columns.session_end) - numpy.asarray(columns.session_start)
+    else:
+        timed = lambda v: v == v
+        durations = [end - start for start, end in zip(columns.session_start, columns.session_end)]
+
+    calls = _counts(columns.call_tool, n_tools, backend)
+    errors = _counts(columns.call_tool, n_tools, backend, columns.error)
+    latency = group_stats(*_valid(columns.call_tool, columns.latency_ms, timed, backend), n_tools, backend)
+    sizes = group_stats(*_valid(columns.call_tool, columns.result_chars, answered, backend), n_tools, backend)
+
+    tool_rows = []
+    for code, name in enumerate(tools):
+        tool_rows.append({
+            'tool': name,
+            'calls': calls[code],
+            'errors': errors[code],
+            'no_result': calls[code] - (sizes[code]['count'] if sizes[code] else 0),
+            'latency_s': _seconds(latency[code]),
+            'result_chars': sizes[code],
+        })
+    tool_rows.sort(key=lambda row: (-row['calls'], row['tool']))
+
+    session_codes, session_durations = _valid(columns.session_project, durations, timed, backend)
+    per_project = group_stats(session_codes, session_durations, n_projects, backend)
+    overall = group_stats([0] * len(session_durations), session_durations, 1, backend)[0]
+    sessions = _counts(columns.session_project, n_projects, backend)
+    messages = _counts(columns.session_project, n_projects, backend, columns.session_messages)
+    tool_calls = _counts(columns.session_project, n_projects, backend, columns.session_calls)
+
+    project_rows = []
+    for code, name in enumerate(projects):
+        project_rows.append({
+            'project': name,
+            'sessions': sessions[code],
+            'messages': messages[code],
+            'tool_calls': tool_calls[code],
+            'session_s': per_project[code]['sum'] / 1000 if per_project[code] else 0.0,
+        })
+    project_rows.sort(key=lambda row: (-row['tool_calls'], row['project']))
+
+    read = next((row['result_chars'] for row in tool_rows if row['tool'] == 'Read'), None)
+    return {
+        'backend': backend,
+        'totals': {
+            'projects': n_projects,
+            'sessions': len(columns.session_project),
+            'messages': sum(messages),
+            'tool_calls': len(columns.call_tool),
+            'errors': sum(errors),
+        },
+        'tools': tool_rows,
+        'read': read,
+        'sessions': _seconds(overall),
+        'projects': project_rows,
+    }
+
+
+def format_duration(seconds):
+    if seconds is None or seconds != seconds:
+        return '-'
+    if seconds < 1:
+        return f"{seconds * 1000:.0f}ms"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def format_count(value):
+    if value is None:
+        return '-'
+    for unit in ('', 'K', 'M'):
+        if abs(value) < 1000:
+            return f"{value:.0f}{unit}"
+        value /= 1000
+    return f"{value:.0f}G"
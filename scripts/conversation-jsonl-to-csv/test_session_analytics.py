@@ -0,0 +1,98 @@
+"""
+Tests for jsonl-to-csv.py analytics_columns and session_analytics.summarize.
+Run with: python -m pytest scripts/conversation-jsonl-to-csv
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import session_analytics
+
+
+@pytest.fixture(scope="module")
+def converter():
+    """jsonl-to-csv.py, imported by path because of the dashes"""
+    spec = importlib.util.spec_from_file_location("jsonl_to_csv", SCRIPT_DIR / "jsonl-to-csv.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def message(kind, timestamp, content):
+    return json.dumps({
+        'type': kind,
+        'sessionId': 'session-1',
+        'timestamp': timestamp,
+        'message': {'role': kind, 'content': content},
+    })
+
+
+COMPLETE_LINES = [
+    message('user', '2025-08-31T10:00:00.000Z', 'Read the config'),
+    message('assistant', '2025-08-31T10:00:01.000Z', [
+        {'type': 'tool_use', 'id': 'toolu_1', 'name': 'Read', 'input': {'file_path': 'config.py'}},
+    ]),
+    message('user', '2025-08-31T10:00:01.250Z', [
+        {'type': 'tool_result', 'tool_use_id': 'toolu_1', 'content': 'x = 1\n'},
+    ]),
+]
+
+
+def write_transcript(tmp_path, text):
+    path = tmp_path / 'project' / 'session-1.jsonl'
+    path.parent.mkdir()
+    path.write_text(text)
+    return str(path)
+
+
+def test_analytics_columns_pairs_tool_calls(tmp_path, converter):
+    path = write_transcript(tmp_path, '\n'.join(COMPLETE_LINES) + '\n')
+    _, calls, sessions, error = converter.analytics_columns(path, 'json')
+    assert error is None
+    assert calls == {'tool': ['Read'], 'latency_ms': [250.0], 'result_chars': [6], 'error': [0]}
+    assert sessions == [('session-1', 1756634400000, 1756634401250, 3, 1)]
+
+
+def test_analytics_columns_skips_partial_final_line(tmp_path, converter):
+    """A transcript Claude Code is still writing ends mid-line, without a newline"""
+    partial = message('assistant', '2025-08-31T10:00:02.000Z', [
+        {'type': 'tool_use', 'id': 'toolu_2', 'name': 'Bash', 'input': {'command': 'ls'}},
+    ])[:40]
+    complete = write_transcript(tmp_path, '\n'.join(COMPLETE_LINES) + '\n')
+    expected = converter.analytics_columns(complete, 'json')[1:]
+
+    growing = tmp_path / 'growing'
+    growing.mkdir()
+    path = write_transcript(growing, '\n'.join(COMPLETE_LINES) + '\n' + partial)
+    assert converter.analytics_columns(path, 'json')[1:] == expected
+
+
+def test_analytics_columns_no_trailing_newline(tmp_path, converter):
+    """The last complete-looking line counts only once its newline is written"""
+    path = write_transcript(tmp_path, '\n'.join(COMPLETE_LINES))
+    _, calls, sessions, error = converter.analytics_columns(path, 'json')
+    assert error is None
+    assert calls['tool'] == ['Read']
+    assert calls['result_chars'] == [-1]
+    assert sessions == [('session-1', 1756634400000, 1756634401000, 2, 1)]
+
+
+def test_summarize_backends_agree(tmp_path, converter):
+    path = write_transcript(tmp_path, '\n'.join(COMPLETE_LINES) + '\n')
+    _, calls, sessions, _ = converter.analytics_columns(path, 'json')
+    columns = session_analytics.Columns()
+    columns.add('project', calls, sessions)
+    reports = [session_analytics.summarize(columns, backend)
+               for backend in session_analytics.available_backends()]
+    for report in reports:
+        report.pop('backend')
+        assert report == reports[0]
+    assert reports[0]['totals']['tool_calls'] == 1
+    assert reports[0]['tools'][0]['latency_s']['p50'] == 0.25